@@ -1,7 +1,6 @@
 from django.apps import AppConfig
-from django.conf import settings
 
-from . import snowflake
+from . import leasing
 
 
 class CoreConfig(AppConfig):
@@ -9,5 +8,4 @@ class CoreConfig(AppConfig):
     name = "apps.core"
 
     def ready(self) -> None:
-        machine_id = getattr(settings, "SNOWFLAKE_MACHINE_ID", 1)
-        snowflake.generator = snowflake.SnowflakeGenerator(machine_id=machine_id)
+        leasing.install_generator()
@@ -0,0 +1,79 @@
+import inspect
+import json
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.authtoken.models import Token
+from rest_framework.renderers import JSONRenderer
+
+from apps.users.authentication import token_cache
+
+
+class AsyncAPIView(View):
+    """
+    Async counterpart of a DRF view for hot endpoints served under ASGI.
+
+    Authenticates DRF tokens through the async ORM. Anything it does not handle
+    (other methods, session auth, query parameters it does not understand) is
+    handed to `fallback`, the regular sync DRF view, so behaviour stays identical.
+    """
+
+    fallback = None
+    requires_auth = True
+    # Query parameters the async handlers understand; anything else goes to the fallback
+    handled_params: tuple[str, ...] = ()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # Token-authenticated API, exempt from CSRF like DRF's APIView
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        handler = getattr(self, request.method.lower(), None)
+        if not inspect.iscoroutinefunction(handler) or any(param not in self.handled_params for param in request.GET):
+            return await self.delegate(request, *args, **kwargs)
+
+        if self.requires_auth:
+            user = await self.authenticate(request)
+            if user is None:
+                return await self.delegate(request, *args, **kwargs)
+            request.user = user
+
+        return await handler(request, *args, **kwargs)
+
+    async def delegate(self, request, *args, **kwargs):
+        return await sync_to_async(self.fallback)(request, *args, **kwargs)
+
+    async def authenticate(self, request):
+        """`Authorization: Token <key>` -> active user, or None to let the fallback decide."""
+        parts = request.headers.get("Authorization", "").split()
+        if len(parts) != 2 or parts[0].lower() != "token":
+            return None
+
+        key = parts[1]
+        token = token_cache.get_local(key) or await sync_to_async(token_cache.get)(key)
+        if token is None:
+            token = await Token.objects.select_related("user").filter(key=key).afirst()
+            if token is None or not token.user.is_active:
+                return None
+            await sync_to_async(token_cache.set)(key, token)
+
+        if not token.user.is_active:
+            return None
+        return token.user
+
+    def parse_body(self, request) -> dict | None:
+        """JSON object from the body, or None for anything the fallback should parse instead."""
+        if request.content_type != "application/json":
+            return None
+        try:
+            data = json.loads(request.body or b"{}")
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    def render(self, data, status_code: int = status.HTTP_200_OK) -> HttpResponse:
+        return HttpResponse(JSONRenderer().render(data), status=status_code, content_type="application/json")
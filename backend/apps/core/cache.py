@@ -0,0 +1,4 @@
+import redis
+
+# Cache outages must never fail a request, only make it slower
+CACHE_ERRORS = (redis.RedisError, OSError)
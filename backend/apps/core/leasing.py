@@ -0,0 +1,237 @@
+import atexit
+import logging
+import os
+import random
+import socket
+import threading
+import time
+import uuid
+from collections.abc import Callable
+
+import redis
+from django.conf import settings
+
+from . import snowflake
+
+logger = logging.getLogger(__name__)
+
+# Refresh the TTL only if we still own the key
+RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Delete the key only if we still own it
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class MachineIdLease:
+    """
+    Claims a free Snowflake machine id as a Redis key with a TTL
+    and keeps it alive from a background heartbeat thread.
+
+    The id is only safe to use until the key may have expired: `ttl` seconds after
+    the last successful claim or renewal. Past that (Redis unreachable for longer
+    than the TTL) is_valid() turns False and the generator refuses to make IDs,
+    as another process may have leased the same id by then.
+    """
+
+    KEY_PREFIX = "snowflake:machine:"
+
+    def __init__(
+        self,
+        client,
+        ttl: int = 30,
+        max_machine_id: int = 1023,
+        on_change: Callable[[int], None] | None = None,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.max_machine_id = max_machine_id
+        self.on_change = on_change
+        self.token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+        self.pid = os.getpid()
+        self.machine_id: int | None = None
+        self.clock = time.monotonic
+        # Monotonic time after which the key may have expired in Redis
+        self.valid_until = 0.0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _key(self, machine_id: int) -> str:
+        return f"{self.KEY_PREFIX}{machine_id}"
+
+    def acquire(self) -> int | None:
+        """Claim the first free id, scanning from a random offset. None if all 1024 are taken."""
+        size = self.max_machine_id + 1
+        offset = random.randrange(size)
+
+        for i in range(size):
+            machine_id = (offset + i) % size
+            sent_at = self.clock()
+            if self.client.set(self._key(machine_id), self.token, nx=True, ex=self.ttl):
+                self.machine_id = machine_id
+                self.valid_until = sent_at + self.ttl
+                return machine_id
+        return None
+
+    def renew(self) -> bool:
+        if self.machine_id is None:
+            return False
+        sent_at = self.clock()
+        if self.client.eval(RENEW_SCRIPT, 1, self._key(self.machine_id), self.token, self.ttl):
+            self.valid_until = sent_at + self.ttl
+            return True
+        return False
+
+    def is_valid(self) -> bool:
+        """Whether our machine id is still certainly ours (checked by the generator on every call)."""
+        return self.clock() < self.valid_until
+
+    def release(self) -> None:
+        self._stop.set()
+        # Forked children inherit atexit hooks, but the lease belongs to the parent
+        if self.machine_id is None or os.getpid() != self.pid:
+            return
+        try:
+            self.client.eval(RELEASE_SCRIPT, 1, self._key(self.machine_id), self.token)
+        except redis.RedisError as e:
+            logger.warning(f"Failed to release Snowflake machine id {self.machine_id}: {e}")
+        self.machine_id = None
+
+    def heartbeat(self) -> None:
+        """One heartbeat tick. Re-leases a new id if ours expired and got taken."""
+        try:
+            if self.renew():
+                return
+            lost = self.machine_id
+            sent_at = self.clock()
+            if self.client.set(self._key(lost), self.token, nx=True, ex=self.ttl):
+                self.valid_until = sent_at + self.ttl
+                logger.warning(f"Re-claimed expired Snowflake machine id {lost}")
+                return
+            machine_id = self.acquire()
+        except redis.RedisError as e:
+            if self.is_valid():
+                logger.warning(f"Snowflake lease heartbeat failed: {e}")
+            else:
+                logger.critical(f"Snowflake lease expired, refusing to generate IDs until Redis is back: {e}")
+            return
+
+        if machine_id is None:
+            logger.critical(f"Lost Snowflake machine id {lost} and no free id is available")
+            return
+
+        logger.error(f"Lost Snowflake machine id {lost}, switched to {machine_id}")
+        if self.on_change:
+            self.on_change(machine_id)
+
+    def start_heartbeat(self) -> None:
+        def run():
+            while not self._stop.wait(self.ttl / 3):
+                self.heartbeat()
+
+        self._thread = threading.Thread(target=run, name="snowflake-lease", daemon=True)
+        self._thread.start()
+
+
+_lease: MachineIdLease | None = None
+_lease_lock = threading.Lock()
+
+
+class PendingLease:
+    """
+    snowflake.generator of a process that should lease a machine id but has none yet:
+    Redis was unreachable at startup, or the process was just forked. The first ID
+    request leases one and installs the real generator. Until that succeeds, requests
+    raise MachineIdUnavailableError: a static fallback id would be shared by every
+    such process, and their IDs would collide.
+    """
+
+    def next_id(self) -> int:
+        return _lease_generator().next_id()
+
+    def next_ids(self, count: int) -> list[int]:
+        return _lease_generator().next_ids(count)
+
+    def reserve(self, count: int):
+        return _lease_generator().reserve(count)
+
+
+def _set_generator(machine_id: int) -> None:
+    snowflake.generator = snowflake.SnowflakeGenerator(
+        machine_id=machine_id,
+        wait_strategy=getattr(settings, "SNOWFLAKE_WAIT_STRATEGY", snowflake.WAIT_SLEEP),
+        max_backward_ms=getattr(settings, "SNOWFLAKE_MAX_BACKWARD_MS", 50),
+        is_valid=_lease.is_valid if _lease is not None else None,
+    )
+
+
+def _lease_generator() -> snowflake.SnowflakeGenerator:
+    """Lease a machine id for this process and install its generator (once; later calls return it)."""
+    global _lease
+
+    with _lease_lock:
+        if not isinstance(snowflake.generator, PendingLease):
+            return snowflake.generator
+
+        lease = MachineIdLease(
+            redis.Redis.from_url(settings.SNOWFLAKE_LEASE_REDIS_URL, socket_timeout=2, socket_connect_timeout=2),
+            ttl=getattr(settings, "SNOWFLAKE_LEASE_TTL", 30),
+            on_change=_set_generator,
+        )
+        try:
+            machine_id = lease.acquire()
+        except redis.RedisError as e:
+            raise snowflake.MachineIdUnavailableError(f"Snowflake lease unavailable: {e}") from e
+        if machine_id is None:
+            raise snowflake.MachineIdUnavailableError("No free Snowflake machine id to lease")
+
+        lease.start_heartbeat()
+        atexit.register(lease.release)
+        _lease = lease
+        _set_generator(machine_id)
+        logger.info(f"Leased Snowflake machine id {machine_id}")
+        return snowflake.generator
+
+
+def install_generator() -> None:
+    """
+    Build the process-wide generator.
+    Leases a machine id from Redis when SNOWFLAKE_LEASE_REDIS_URL is set (retried on
+    the first ID request if Redis is unavailable now), otherwise uses the static
+    SNOWFLAKE_MACHINE_ID.
+    """
+    global _lease
+
+    _lease = None
+    if not getattr(settings, "SNOWFLAKE_LEASE_REDIS_URL", ""):
+        _set_generator(getattr(settings, "SNOWFLAKE_MACHINE_ID", 1))
+        return
+
+    snowflake.generator = PendingLease()
+    try:
+        _lease_generator()
+    except snowflake.MachineIdUnavailableError as e:
+        logger.warning(f"{e}, leasing again on the first ID request")
+
+
+def _release_after_fork() -> None:
+    # Prefork workers (gunicorn, celery) must not share the parent's machine id. No Redis
+    # calls here: the child leases its own id on its first ID request (PendingLease).
+    global _lease, _lease_lock
+
+    _lease_lock = threading.Lock()
+    if _lease is not None:
+        _lease = None
+        snowflake.generator = PendingLease()
+
+
+os.register_at_fork(after_in_child=_release_after_fork)
@@ -1,19 +1,114 @@
+import threading
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+
 from django.db import models
 
 from . import snowflake
 
+RESERVE_BLOCK_SIZE = 1000
+
+_reserved = threading.local()
+
+
+def _get_generator() -> snowflake.SnowflakeGenerator:
+    if snowflake.generator is None:
+        return snowflake.SnowflakeGenerator(1)
+    return snowflake.generator
+
 
 def next_snowflake_id() -> int:
     """Wrapper for default callable"""
-    if snowflake.generator is None:
-        return snowflake.SnowflakeGenerator(1).next_id()
-    return snowflake.generator.next_id()
+    block = getattr(_reserved, "block", None)
+    if block is not None:
+        if not block.ids:
+            block.ids.extend(_get_generator().next_ids(block.size))
+        return block.ids.popleft()
+    return _get_generator().next_id()
+
+
+class _ReservedBlock:
+    def __init__(self, size: int):
+        self.size = size
+        self.ids: deque[int] = deque()
+
+
+@contextmanager
+def reserved_snowflake_ids(count: int = RESERVE_BLOCK_SIZE) -> Iterator[None]:
+    """
+    Models instantiated inside this block take their IDs from
+    pre-reserved runs of `count` IDs instead of one generator call each.
+    Unused IDs are dropped on exit (gaps are harmless for Snowflake).
+    """
+    previous = getattr(_reserved, "block", None)
+    _reserved.block = _ReservedBlock(max(count, 1))
+    try:
+        yield
+    finally:
+        _reserved.block = previous
+
+
+class SnowflakeField(models.BigIntegerField):
+    """
+    BigIntegerField whose Snowflake default is drawn when the row is saved, not when
+    the instance is built, so bulk_create() can take a whole batch's IDs from one
+    reservation. Unsaved instances read None until then.
+    Migrations see a plain BigIntegerField with its default.
+    """
+
+    def get_default(self):
+        return None
+
+    def get_pk_value_on_save(self, instance):
+        return self._get_default()
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.attname)
+        if value is None and add:
+            value = self._get_default()
+            setattr(model_instance, self.attname, value)
+        return value
+
+    def deconstruct(self):
+        name, _, args, kwargs = super().deconstruct()
+        return name, "django.db.models.BigIntegerField", args, kwargs
+
+
+class SnowflakeQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        The batch's Snowflake fields (primary key, change ids) are filled from one
+        reservation of `len(objs)` IDs per field instead of one generator call each.
+        """
+        objs = list(objs)
+        fields = sum(isinstance(field, SnowflakeField) for field in self.model._meta.concrete_fields)
+        with reserved_snowflake_ids(len(objs) * fields):
+            return super().bulk_create(objs, *args, **kwargs)
+
+    def created_between(self, start=None, end=None):
+        """
+        Filter by creation time (inclusive) as a primary-key range scan.
+        Either bound may be omitted.
+        """
+        queryset = self
+        if start is not None:
+            queryset = queryset.filter(pk__gte=snowflake.min_id_for(start))
+        if end is not None:
+            queryset = queryset.filter(pk__lte=snowflake.max_id_for(end))
+        return queryset
+
+
+class SnowflakeManager(models.Manager.from_queryset(SnowflakeQuerySet)):
+    pass
 
 
 class SnowflakeModel(models.Model):
-    id = models.BigIntegerField(primary_key=True, default=next_snowflake_id, editable=False)
+    id = SnowflakeField(primary_key=True, default=next_snowflake_id, editable=False)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = SnowflakeManager()
+
     class Meta:
         abstract = True
@@ -0,0 +1,35 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
+
+
+class SnowflakeCursorPagination(CursorPagination):
+    """
+    Keyset pagination over time-sortable Snowflake ids (newest first).
+    The cursor is opaque, stable under inserts and costs O(page) at any depth.
+
+    Opt-in: pages are only served when the client sends `cursor` or `page_size`,
+    so existing clients keep receiving the plain list.
+    """
+
+    ordering = "-id"
+    page_size = 50
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def is_requested(self, request) -> bool:
+        params = request.query_params
+        return self.cursor_query_param in params or self.page_size_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def first_page(self, queryset, request, url: str):
+        """
+        First page of `queryset` for embedding in another resource: always paginated,
+        with `next` pointing at `url` (the collection's own endpoint) and the same page size.
+        """
+        page = super().paginate_queryset(queryset, request)
+        self.base_url = replace_query_param(url, self.page_size_query_param, self.page_size)
+        return page
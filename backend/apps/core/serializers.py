@@ -0,0 +1,77 @@
+from collections.abc import Sequence
+
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = "fields"
+OMIT_PARAM = "omit"
+
+
+def _split(value: str) -> list[str]:
+    return [name.strip() for name in value.split(",") if name.strip()]
+
+
+def requested_fields(request, available: Sequence[str]) -> list[str] | None:
+    """
+    Sparse fieldset of a read request: `?fields=a,b` keeps only those, `?omit=c` drops some.
+    Returns the selected names in declaration order, or None when neither parameter is given.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return None
+    params = request.query_params
+    if FIELDS_PARAM not in params and OMIT_PARAM not in params:
+        return None
+
+    fields = _split(params[FIELDS_PARAM]) if FIELDS_PARAM in params else list(available)
+    omit = _split(params.get(OMIT_PARAM, ""))
+
+    unknown = sorted({name for name in fields + omit if name not in available})
+    if unknown:
+        raise serializers.ValidationError({FIELDS_PARAM: [f"Unknown field(s): {', '.join(unknown)}."]})
+
+    return [name for name in available if name in fields and name not in omit]
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin: drops output fields not selected by `?fields=` / `?omit=`
+    on GET requests. Use `only_fields()` to defer the unselected columns too.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if request is None:
+            return
+        selected = requested_fields(request, self.readable_field_names())
+        if selected is not None:
+            for name in self.readable_field_names():
+                if name not in selected:
+                    self.fields.pop(name)
+
+    @classmethod
+    def readable_field_names(cls) -> list[str]:
+        if "_readable_field_names" not in cls.__dict__:
+            cls._readable_field_names = [name for name, field in cls().fields.items() if not field.write_only]
+        return cls._readable_field_names
+
+    @classmethod
+    def only_fields(cls, queryset, selected: Sequence[str] | None):
+        """Load just the columns behind `selected` (plus the pk), joining relations they go through."""
+        if selected is None:
+            return queryset
+
+        fields = cls().fields
+        columns = [queryset.model._meta.pk.name]
+        related = set()
+        for name in selected:
+            source = fields[name].source
+            if source == "*":
+                return queryset
+            columns.append(source.replace(".", "__"))
+            if "." in source:
+                related.add(source.rsplit(".", 1)[0].replace(".", "__"))
+
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
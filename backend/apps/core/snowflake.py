@@ -1,21 +1,74 @@
+import logging
 import time
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
 from threading import Lock
 
+logger = logging.getLogger(__name__)
+
+WAIT_SLEEP = "sleep"
+WAIT_SPIN = "spin"
+
+# Log the contention counters every N IDs per generator
+STATS_LOG_EVERY = 10_000
+
+
+class ClockMovedBackwardsError(Exception):
+    """Wall clock stepped back further than the generator is allowed to ride out."""
+
+
+class MachineIdExpiredError(Exception):
+    """The leased machine id may have been handed to another process (see apps.core.leasing)."""
+
+
+class MachineIdUnavailableError(Exception):
+    """No machine id could be leased: Redis is unreachable or every id is taken (see apps.core.leasing)."""
+
 
 class SnowflakeGenerator:
     """
     Thread-safe Snowflake ID generator.
     Format (64 bits): [1 unused] [41 timestamp] [10 machine_id] [12 sequence]
+
+    When a millisecond's sequence is exhausted the generator sleeps until the
+    next millisecond (or busy-waits with wait_strategy="spin").
+    Backward wall-clock steps up to `max_backward_ms` are ridden out by
+    projecting time forward from the monotonic clock.
+    With `is_valid` (a leased machine id) no ID is made while it returns False.
+    The contention counters (stats()) are logged every STATS_LOG_EVERY IDs.
     """
 
     EPOCH = 1735689600000  # 2025-01-01 00:00:00 UTC
 
-    def __init__(self, machine_id: int):
+    def __init__(
+        self,
+        machine_id: int,
+        wait_strategy: str = WAIT_SLEEP,
+        max_backward_ms: int = 50,
+        is_valid: Callable[[], bool] | None = None,
+    ):
         self.machine_id = machine_id
+        self.is_valid = is_valid
         self.sequence = 0
         self.last_timestamp = -1
         self.lock = Lock()
 
+        if wait_strategy not in (WAIT_SLEEP, WAIT_SPIN):
+            raise ValueError(f"Unknown wait strategy: {wait_strategy}")
+        self.wait_strategy = wait_strategy
+        self.max_backward_ms = max_backward_ms
+
+        # wall ms - monotonic ms, taken at the last reading where the wall clock was sane
+        self._mono_offset: int | None = None
+        self._regressed = False
+
+        # contention counters
+        self.issued = 0
+        self.rollovers = 0
+        self.waits = 0
+        self.wait_ns = 0
+        self.clock_regressions = 0
+
         # bit config
         self.timestamp_bits = 41
         self.machine_id_bits = 10
@@ -31,30 +84,181 @@ class SnowflakeGenerator:
             raise ValueError(f"Machine ID must be between 0 and {self.max_machine_id}")
 
     def _current_timestamp(self) -> int:
-        return int(time.time() * 1000)
+        return time.time_ns() // 1_000_000
+
+    def _monotonic_ms(self) -> int:
+        return time.monotonic_ns() // 1_000_000
+
+    def _timestamp(self) -> int:
+        """
+        Wall-clock ms, never lower than last_timestamp.
+        While the wall clock is behind, time is projected from the monotonic clock.
+        """
+        wall = self._current_timestamp()
+
+        if wall == self.last_timestamp:
+            return wall
+        if wall > self.last_timestamp:
+            # refreshed once per millisecond to keep the hot path cheap
+            self._mono_offset = wall - self._monotonic_ms()
+            self._regressed = False
+            return wall
+
+        drift = self.last_timestamp - wall
+        if drift > self.max_backward_ms:
+            raise ClockMovedBackwardsError(f"Clock moved backwards! Refusing to generate IDs for {drift} ms")
+
+        if not self._regressed:
+            self._regressed = True
+            self.clock_regressions += 1
+
+        if self._mono_offset is None:
+            return self.last_timestamp
+        return max(self.last_timestamp, self._monotonic_ms() + self._mono_offset)
+
+    def _wait_next_millis(self, last_timestamp: int) -> int:
+        """Block until the clock passes `last_timestamp`. Called with the lock held."""
+        self.waits += 1
+        started = time.perf_counter_ns()
+
+        timestamp = self._timestamp()
+        while timestamp <= last_timestamp:
+            if self.wait_strategy == WAIT_SLEEP:
+                if self._mono_offset is None:
+                    remaining_ns = 100_000
+                else:
+                    remaining_ns = (last_timestamp + 1 - self._mono_offset) * 1_000_000 - time.monotonic_ns()
+                time.sleep(min(max(remaining_ns, 0), 1_000_000) / 1e9)
+            timestamp = self._timestamp()
+
+        self.wait_ns += time.perf_counter_ns() - started
+        return timestamp
+
+    def stats(self) -> dict[str, int]:
+        """Counters for spotting contention: sequence rollovers, waits and clock regressions."""
+        return {
+            "machine_id": self.machine_id,
+            "issued": self.issued,
+            "rollovers": self.rollovers,
+            "waits": self.waits,
+            "wait_ms": self.wait_ns // 1_000_000,
+            "clock_regressions": self.clock_regressions,
+        }
+
+    def _count(self, issued: int) -> bool:
+        """Add `issued` IDs to the counter. Called with the lock held; True when a summary is due."""
+        before = self.issued
+        self.issued += issued
+        return before // STATS_LOG_EVERY != self.issued // STATS_LOG_EVERY
+
+    def _log_stats(self) -> None:
+        logger.info(f"Snowflake generator: {self.stats()}")
+
+    def _check_machine_id(self) -> None:
+        if self.is_valid is not None and not self.is_valid():
+            raise MachineIdExpiredError(f"Lease on machine id {self.machine_id} expired, refusing to generate IDs")
 
     def next_id(self) -> int:
+        self._check_machine_id()
         with self.lock:
-            timestamp = self._current_timestamp()
-
-            if timestamp < self.last_timestamp:
-                raise Exception("Clock moved backwards!")
+            timestamp = self._timestamp()
 
             if timestamp == self.last_timestamp:
                 self.sequence = (self.sequence + 1) & self.max_sequence
                 if self.sequence == 0:
-                    while timestamp <= self.last_timestamp:
-                        timestamp = self._current_timestamp()
+                    self.rollovers += 1
+                    timestamp = self._wait_next_millis(self.last_timestamp)
             else:
                 self.sequence = 0
 
             self.last_timestamp = timestamp
-
-            return (
+            log = self._count(1)
+            snowflake_id = (
                 ((timestamp - self.EPOCH) << self.timestamp_shift)
                 | (self.machine_id << self.machine_id_shift)
                 | self.sequence
             )
 
+        if log:
+            self._log_stats()
+        return snowflake_id
+
+    def next_ids(self, count: int) -> list[int]:
+        """
+        Reserves `count` IDs under a single lock acquisition.
+        Sequence numbers are handed out in contiguous runs; a run only
+        spills into the next millisecond when the current one is exhausted.
+        """
+        if count < 0:
+            raise ValueError("count must be non-negative")
+
+        ids: list[int] = []
+        if count == 0:
+            return ids
+        self._check_machine_id()
+
+        with self.lock:
+            timestamp = self._timestamp()
+
+            if timestamp == self.last_timestamp:
+                start = self.sequence + 1
+            else:
+                start = 0
+
+            while True:
+                if start > self.max_sequence:
+                    self.rollovers += 1
+                    timestamp = self._wait_next_millis(self.last_timestamp)
+                    start = 0
+
+                end = min(start + count - len(ids), self.max_sequence + 1)
+                prefix = ((timestamp - self.EPOCH) << self.timestamp_shift) | (self.machine_id << self.machine_id_shift)
+                ids.extend(range(prefix + start, prefix + end))
+
+                self.sequence = end - 1
+                self.last_timestamp = timestamp
+
+                if len(ids) == count:
+                    log = self._count(count)
+                    break
+
+                start = end
+
+        if log:
+            self._log_stats()
+        return ids
+
+    def reserve(self, count: int) -> Iterator[int]:
+        """Iterator over a block of `count` IDs reserved up front."""
+        return iter(self.next_ids(count))
+
 
 generator: SnowflakeGenerator | None = None
+
+
+# Decoding helpers (IDs embed their creation time)
+
+TIMESTAMP_SHIFT = 22
+LOW_BITS_MASK = (1 << TIMESTAMP_SHIFT) - 1
+
+
+def _to_epoch_ms(dt: datetime) -> int:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return max(int(dt.timestamp() * 1000) - SnowflakeGenerator.EPOCH, 0)
+
+
+def id_to_datetime(snowflake_id: int) -> datetime:
+    """Creation time (UTC, ms precision) encoded in a Snowflake ID."""
+    ms = (snowflake_id >> TIMESTAMP_SHIFT) + SnowflakeGenerator.EPOCH
+    return datetime.fromtimestamp(ms / 1000, tz=UTC)
+
+
+def min_id_for(dt: datetime) -> int:
+    """Smallest ID that could have been generated at `dt`. Naive datetimes are treated as UTC."""
+    return _to_epoch_ms(dt) << TIMESTAMP_SHIFT
+
+
+def max_id_for(dt: datetime) -> int:
+    """Largest ID that could have been generated at `dt`. Naive datetimes are treated as UTC."""
+    return (_to_epoch_ms(dt) << TIMESTAMP_SHIFT) | LOW_BITS_MASK
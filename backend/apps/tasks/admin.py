@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from apps.tasks.models import Category, Task
+from apps.tasks.models import Category, Notification, Task
 
 try:
     admin.site.unregister(Task)
@@ -19,7 +19,24 @@ class TaskAdmin(admin.ModelAdmin):
     list_filter = ("is_completed", "created_at")
     search_fields = ("title", "id")
 
+    def get_search_results(self, request, queryset, search_term):
+        """Title/description search through Task.objects.search() (GIN-indexed on PostgreSQL), or an exact id."""
+        term = search_term.strip()
+        if not term:
+            return queryset, False
+        matches = queryset.search(term)
+        if term.isascii() and term.isdigit() and int(term) < 2**63:
+            matches |= queryset.filter(pk=int(term))
+        return matches, False
+
 
 @admin.register(Category)
 class CategoryAdmin(admin.ModelAdmin):
     list_display = ("id", "name", "user")
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("id", "task_id", "kind", "status", "attempts", "next_attempt_at", "delivered_at")
+    list_filter = ("status", "kind")
+    raw_id_fields = ("task",)
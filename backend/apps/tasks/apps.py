@@ -5,3 +5,6 @@ class TasksConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.tasks"
     verbose_name = "Tasks"
+
+    def ready(self):
+        from apps.tasks import signals  # noqa: F401
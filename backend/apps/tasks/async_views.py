@@ -0,0 +1,64 @@
+from asgiref.sync import sync_to_async
+from django.utils.cache import get_conditional_response
+from rest_framework import status
+
+from apps.core.async_views import AsyncAPIView
+from apps.tasks.cache import cached_list
+from apps.tasks.models import Task
+from apps.tasks.serializers import TaskListSerializer, TaskSerializer
+from apps.tasks.views import collection_validators, set_validators
+
+NOT_FOUND = {"detail": "No Task matches the given query."}
+
+
+async def conditional(request, handler, *args, **kwargs):
+    """Async counterpart of ConditionalGetMixin.conditional."""
+    validators = await sync_to_async(collection_validators)(request, request.user.id)
+    if validators is None:
+        return await handler(request, *args, **kwargs)
+
+    etag, last_modified = validators
+    not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if not_modified is not None:
+        return set_validators(not_modified, etag, last_modified)
+
+    response = await handler(request, *args, **kwargs)
+    if response.status_code == 200:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+class TaskListAsyncView(AsyncAPIView):
+    """
+    Async list for /tasks/.
+    Creation and paginated requests (cursor/page_size) go to TaskViewSet.
+    """
+
+    async def get(self, request):
+        return await conditional(request, self.list)
+
+    async def list(self, request):
+        def build():
+            queryset = TaskListSerializer.rows(Task.objects.filter(user=request.user))
+            return list(TaskListSerializer(queryset, many=True).data)
+
+        payload, hit = await sync_to_async(cached_list)(request.user.id, "tasks", build)
+        response = self.render(payload)
+        response["X-Cache"] = "HIT" if hit else "MISS"
+        return response
+
+
+class TaskDetailAsyncView(AsyncAPIView):
+    """
+    Async retrieve for /tasks/<id>/.
+    Updates and deletes go to TaskViewSet.
+    """
+
+    async def get(self, request, pk):
+        return await conditional(request, self.retrieve, pk)
+
+    async def retrieve(self, request, pk):
+        task = await Task.objects.filter(user=request.user, pk=pk).select_related("category").afirst()
+        if task is None:
+            return self.render(NOT_FOUND, status.HTTP_404_NOT_FOUND)
+        return self.render(TaskSerializer(task).data)
@@ -0,0 +1,146 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from django.conf import settings
+from django.core.cache import cache
+
+from apps.core.cache import CACHE_ERRORS
+
+logger = logging.getLogger(__name__)
+
+# Log a metrics summary every N lookups per process
+STATS_LOG_EVERY = 1000
+
+_VERSION_KEY = "tasks:lists:ver:{user_id}"
+_MODIFIED_KEY = "tasks:lists:modified:{user_id}"
+_LIST_KEY = "tasks:lists:{kind}:{user_id}:{version}"
+
+
+class _Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.hit_ms = 0.0
+        self.miss_ms = 0.0
+
+    def record(self, outcome: str, elapsed_ms: float) -> None:
+        with self._lock:
+            if outcome == "hit":
+                self.hits += 1
+                self.hit_ms += elapsed_ms
+            else:
+                self.misses += 1
+                self.miss_ms += elapsed_ms
+                if outcome == "error":
+                    self.errors += 1
+            lookups = self.hits + self.misses
+
+        if lookups % STATS_LOG_EVERY == 0:
+            logger.info(f"Task list cache: {stats()}")
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.errors = 0
+            self.hit_ms = self.miss_ms = 0.0
+
+
+_stats = _Stats()
+
+
+def stats() -> dict:
+    """Per-process hit rate and mean latency of cached vs. rebuilt list responses."""
+    lookups = _stats.hits + _stats.misses
+    return {
+        "hits": _stats.hits,
+        "misses": _stats.misses,
+        "errors": _stats.errors,
+        "hit_rate": _stats.hits / lookups if lookups else 0.0,
+        "hit_ms": _stats.hit_ms / _stats.hits if _stats.hits else 0.0,
+        "miss_ms": _stats.miss_ms / _stats.misses if _stats.misses else 0.0,
+    }
+
+
+def reset_stats() -> None:
+    _stats.reset()
+
+
+def _version(user_id: int) -> int | None:
+    """The user's list version, or None when the cache does not keep it (no shared cache configured)."""
+    key = _VERSION_KEY.format(user_id=user_id)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so a version key lost to eviction never resurrects old payloads
+        cache.add(key, time.time_ns(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def invalidate_user_lists(user_id: int) -> None:
+    """
+    Make every cached list of this user unreachable.
+    Writes that bypass model signals (queryset.update(), bulk_create()) must call this themselves.
+    """
+    key = _VERSION_KEY.format(user_id=user_id)
+    try:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+        cache.set(_MODIFIED_KEY.format(user_id=user_id), time.time(), timeout=None)
+    except CACHE_ERRORS as e:
+        logger.warning(f"Failed to invalidate cached lists for user {user_id}: {e}")
+
+
+def collection_state(user_id: int) -> tuple[int, float | None] | None:
+    """
+    (version, last modification unix time) of the user's tasks and categories,
+    for HTTP validators. None when the cache is unavailable or not configured.
+    """
+    version_key = _VERSION_KEY.format(user_id=user_id)
+    modified_key = _MODIFIED_KEY.format(user_id=user_id)
+    try:
+        values = cache.get_many([version_key, modified_key])
+        version = values.get(version_key)
+        if version is None:
+            version = _version(user_id)
+    except CACHE_ERRORS as e:
+        logger.warning(f"Task list cache unavailable, skipping validators: {e}")
+        return None
+    if version is None:
+        return None
+    return version, values.get(modified_key)
+
+
+def cached_list(user_id: int, kind: str, build: Callable[[], list]) -> tuple[list, bool]:
+    """
+    Read-through cache for a user's serialized list (`kind` is "tasks" or "categories").
+    Returns (payload, hit). Falls back to `build()` when the cache is unavailable.
+    """
+    start = time.perf_counter()
+    try:
+        version = _version(user_id)
+        # No version kept (no shared cache configured): nothing to read or store
+        key = None if version is None else _LIST_KEY.format(kind=kind, user_id=user_id, version=version)
+        payload = None if key is None else cache.get(key)
+    except CACHE_ERRORS as e:
+        logger.warning(f"Task list cache unavailable, reading from the database: {e}")
+        payload = build()
+        _stats.record("error", (time.perf_counter() - start) * 1000)
+        return payload, False
+
+    if payload is not None:
+        _stats.record("hit", (time.perf_counter() - start) * 1000)
+        return payload, True
+
+    payload = build()
+    if key is not None:
+        try:
+            cache.set(key, payload, timeout=settings.TASK_LIST_CACHE_TTL)
+        except CACHE_ERRORS as e:
+            logger.warning(f"Failed to store cached list {key}: {e}")
+    _stats.record("miss", (time.perf_counter() - start) * 1000)
+    return payload, False
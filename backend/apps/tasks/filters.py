@@ -0,0 +1,44 @@
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.filters import BaseFilterBackend
+
+from apps.tasks.serializers import TaskFilterSerializer
+
+TASK_FILTER_PARAMS = tuple(TaskFilterSerializer().fields)
+# Filters compared against the current time: their results change without any write
+TIME_DEPENDENT_FILTER_PARAMS = ("overdue",)
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    ?category=<id>, ?is_completed=, ?deadline_after= / ?deadline_before= (half-open window)
+    and ?overdue= (open and past its deadline). Filters combine with AND.
+
+    Each one has a matching (user, ...) index on Task, see Task.Meta.indexes.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not any(name in request.query_params for name in TASK_FILTER_PARAMS):
+            return queryset
+
+        # A plain dict: as form data, absent boolean params would read as False
+        params = TaskFilterSerializer(data=request.query_params.dict())
+        params.is_valid(raise_exception=True)
+        filters = params.validated_data
+
+        if "category" in filters:
+            queryset = queryset.filter(category_id=filters["category"])
+        if "is_completed" in filters:
+            queryset = queryset.filter(is_completed=filters["is_completed"])
+        if "deadline_after" in filters:
+            queryset = queryset.filter(deadline__gte=filters["deadline_after"])
+        if "deadline_before" in filters:
+            queryset = queryset.filter(deadline__lt=filters["deadline_before"])
+        if "overdue" in filters:
+            now = timezone.now()
+            if filters["overdue"]:
+                queryset = queryset.filter(is_completed=False, deadline__lt=now)
+            else:
+                # Not NOT(...), which no index matches: a union of scans on the done and deadline indexes
+                queryset = queryset.filter(Q(is_completed=True) | Q(deadline__isnull=True) | Q(deadline__gte=now))
+        return queryset
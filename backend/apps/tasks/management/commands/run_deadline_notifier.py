@@ -0,0 +1,43 @@
+import signal
+import time
+
+import redis
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DatabaseError
+
+from apps.tasks.notifier import DeadlineEvents, DeadlineNotifier
+
+
+class Command(BaseCommand):
+    help = "Sends deadline reminders from in-memory timers kept up to date by task change events"
+
+    def handle(self, *args, **kwargs):
+        if not settings.DEADLINE_EVENTS_REDIS_URL:
+            raise CommandError("DEADLINE_EVENTS_REDIS_URL is not set")
+
+        stopping = False
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        client = redis.Redis.from_url(settings.DEADLINE_EVENTS_REDIS_URL, health_check_interval=30)
+        notifier = DeadlineNotifier()
+        self.stdout.write(self.style.SUCCESS("⏰ Deadline notifier started"))
+
+        while not stopping:
+            pubsub = client.pubsub()
+            try:
+                # Subscribe before the initial reconciliation so no change falls in between
+                pubsub.subscribe(DeadlineEvents.CHANNEL)
+                notifier.run(pubsub, should_stop=lambda: stopping, max_wait=1)
+            except (redis.RedisError, DatabaseError) as e:
+                # Events may have been lost: run() starts over with a full reconciliation
+                self.stderr.write(self.style.WARNING(f"⚠️ Deadline notifier interrupted: {e}"))
+                time.sleep(1)
+            finally:
+                pubsub.close()
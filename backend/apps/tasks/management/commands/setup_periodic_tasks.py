@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.core.management.base import BaseCommand
 from django_celery_beat.models import CrontabSchedule, IntervalSchedule, PeriodicTask
 
@@ -7,10 +8,12 @@ class Command(BaseCommand):
 
     def handle(self, *args, **kwargs):
         self.setup_interval_task()
+        self.setup_notification_retry_task()
         self.setup_crontab_task()
+        self.setup_tombstone_purge_task()
 
     def setup_interval_task(self):
-        """Setting up a deadline check task (every 10 seconds)"""
+        """Setting up a deadline check task (every 10 seconds), unless run_deadline_notifier replaces it"""
         try:
             schedule, created = IntervalSchedule.objects.get_or_create(
                 every=10,
@@ -29,6 +32,18 @@ class Command(BaseCommand):
         task_name = "Check Deadlines (Every 10s)"
         task_func = "apps.tasks.tasks.check_deadlines"
 
+        enabled = not settings.DEADLINE_EVENTS_REDIS_URL
+        self._create_or_update_task(task_name, task_func, interval=schedule, enabled=enabled)
+
+    def setup_notification_retry_task(self):
+        """Setting up outbox delivery retries (every 30 seconds)"""
+        schedule = IntervalSchedule.objects.filter(every=30, period=IntervalSchedule.SECONDS).order_by("id").first()
+        if schedule is None:
+            schedule = IntervalSchedule.objects.create(every=30, period=IntervalSchedule.SECONDS)
+
+        task_name = "Deliver Notifications (Every 30s)"
+        task_func = "apps.tasks.tasks.deliver_notifications"
+
         self._create_or_update_task(task_name, task_func, interval=schedule)
 
     def setup_crontab_task(self):
@@ -53,11 +68,32 @@ class Command(BaseCommand):
 
         self._create_or_update_task(task_name, task_func, crontab=schedule)
 
-    def _create_or_update_task(self, name, func, interval=None, crontab=None):
+    def setup_tombstone_purge_task(self):
+        """Setting up the deleted-task marker cleanup (every day at 3:30)"""
+        schedule = (
+            CrontabSchedule.objects.filter(
+                minute="30",
+                hour="3",
+                day_of_week="*",
+                day_of_month="*",
+                month_of_year="*",
+            )
+            .order_by("id")
+            .first()
+        )
+        if schedule is None:
+            schedule = CrontabSchedule.objects.create(minute="30", hour="3")
+
+        task_name = "Purge Task Tombstones (3:30 AM)"
+        task_func = "apps.tasks.tasks.purge_task_tombstones"
+
+        self._create_or_update_task(task_name, task_func, crontab=schedule)
+
+    def _create_or_update_task(self, name, func, interval=None, crontab=None, enabled=True):
         """A generic method for creating/updating a task"""
         defaults = {
             "task": func,
-            "enabled": True,
+            "enabled": enabled,
         }
         if interval:
             defaults["interval"] = interval
@@ -75,7 +111,7 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f'✅ Task "{name}" created!'))
         else:
             task.task = func
-            task.enabled = True
+            task.enabled = enabled
             if interval:
                 task.interval = interval
                 task.crontab = None
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:10
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0004_task_created_at_no_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False), ('is_pre_notified', False)), fields=['deadline'], name='task_warning_due_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False), ('is_notified', False)), fields=['deadline'], name='task_deadline_due_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:11
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0005_task_deadline_scan_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='category',
+            options={'ordering': ['name'], 'verbose_name': 'Category', 'verbose_name_plural': 'Categories'},
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='category',
+            index=models.Index(fields=['user', 'name'], name='category_user_name_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(fields=['user', '-id'], name='task_user_id_desc_idx'),
+        ),
+    ]
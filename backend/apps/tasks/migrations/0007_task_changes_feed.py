@@ -0,0 +1,49 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:38
+
+import apps.core.models
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrentlyIfSupported
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0006_user_listing_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskTombstone',
+            fields=[
+                ('task_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('change_id', models.BigIntegerField(default=apps.core.models.next_snowflake_id)),
+            ],
+            options={
+                'verbose_name': 'Deleted task',
+                'verbose_name_plural': 'Deleted tasks',
+            },
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='change_id',
+            field=models.BigIntegerField(default=apps.core.models.next_snowflake_id, editable=False),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(fields=['user', 'change_id', 'id'], name='task_user_change_idx'),
+        ),
+        migrations.AddField(
+            model_name='tasktombstone',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='tasktombstone',
+            index=models.Index(fields=['user', 'change_id', 'task_id'], name='tombstone_user_change_idx'),
+        ),
+    ]
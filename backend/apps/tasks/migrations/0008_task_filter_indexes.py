@@ -0,0 +1,39 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:45
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.core.operations import AddIndexConcurrentlyIfSupported
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0007_task_changes_feed'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(fields=['user', 'category', '-id'], name='task_user_category_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['user', '-id'], name='task_user_open_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', True)), fields=['user', '-id'], name='task_user_done_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(fields=['user', 'deadline'], name='task_user_deadline_idx'),
+        ),
+        AddIndexConcurrentlyIfSupported(
+            model_name='task',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['user', 'deadline'], name='task_user_open_deadline_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.9 on 2026-10-18 03:47
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+from apps.core.operations import AddPostgresIndexConcurrently, RunPostgresSQL
+
+# Title (A) and description (B); keep the config in sync with apps.tasks.models.SEARCH_CONFIG
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('russian', coalesce({row}title, '')), 'A')"
+    " || setweight(to_tsvector('russian', coalesce({row}description, '')), 'B')"
+)
+
+CREATE_TRIGGER_SQL = [
+    f"""
+    CREATE FUNCTION tasks_task_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {SEARCH_VECTOR_SQL.format(row="NEW.")};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER tasks_task_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description ON tasks_task
+        FOR EACH ROW EXECUTE FUNCTION tasks_task_search_vector_update()
+    """,
+    # Existing rows are backfilled in batches by 0011_task_search_backfill
+]
+
+DROP_TRIGGER_SQL = [
+    "DROP TRIGGER IF EXISTS tasks_task_search_vector_trigger ON tasks_task",
+    "DROP FUNCTION IF EXISTS tasks_task_search_vector_update()",
+]
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0008_task_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='task',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        RunPostgresSQL(CREATE_TRIGGER_SQL, DROP_TRIGGER_SQL),
+        AddPostgresIndexConcurrently(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='task_search_vector_idx'),
+        ),
+        AddPostgresIndexConcurrently(
+            model_name='task',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['title'], name='task_title_trgm_idx', opclasses=['gin_trgm_ops']),
+        ),
+    ]
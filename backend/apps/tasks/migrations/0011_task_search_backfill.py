@@ -0,0 +1,42 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def backfill_search_vectors(apps, schema_editor):
+    """
+    Fill search_vector of the tasks created before 0009, one primary-key range per
+    statement. The migration is not atomic, so every batch commits on its own and
+    holds its row locks only briefly. Rewriting the title fires the search trigger.
+    """
+    if schema_editor.connection.vendor != "postgresql":
+        return
+
+    last_id = 0
+    with schema_editor.connection.cursor() as cursor:
+        while True:
+            cursor.execute(
+                "SELECT max(id) FROM (SELECT id FROM tasks_task WHERE id > %s ORDER BY id LIMIT %s) AS batch",
+                [last_id, BATCH_SIZE],
+            )
+            (upper_id,) = cursor.fetchone()
+            if upper_id is None:
+                return
+            cursor.execute(
+                "UPDATE tasks_task SET title = title WHERE id > %s AND id <= %s AND search_vector IS NULL",
+                [last_id, upper_id],
+            )
+            last_id = upper_id
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('tasks', '0010_notification_outbox'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_search_vectors, migrations.RunPython.noop, atomic=False, elidable=True),
+    ]
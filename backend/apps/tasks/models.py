@@ -1,7 +1,20 @@
+from datetime import datetime
+
 from django.conf import settings
-from django.db import models
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField, TrigramWordSimilarity
+from django.db import connections, models
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.core.models import SnowflakeField, SnowflakeModel, SnowflakeQuerySet, next_snowflake_id
+
+# Notifier bookkeeping that never shows up in API payloads
+NOTIFICATION_FIELDS = frozenset({"is_notified", "is_pre_notified"})
 
-from apps.core.models import SnowflakeModel
+# Text search configuration of Task.search_vector (the trigger in migration 0009 uses it too).
+# PostgreSQL's "russian" stems Cyrillic words with the Russian and Latin ones with the English stemmer.
+SEARCH_CONFIG = "russian"
 
 
 class Category(SnowflakeModel):
@@ -14,12 +27,106 @@ class Category(SnowflakeModel):
         verbose_name = "Category"
         verbose_name_plural = "Categories"
         unique_together = [("name", "user")]
+        ordering = ["name"]
+        indexes = [
+            # A user's categories by name in one index range scan
+            models.Index(fields=["user", "name"], name="category_user_name_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
 
+class ChangeFeedQuerySet(models.QuerySet):
+    def changed_after(self, change_id: int, pk: int):
+        """Rows after the (change_id, pk) position, in changes-feed order."""
+        return self.filter(
+            Q(change_id__gt=change_id) | Q(change_id=change_id, pk__gt=pk),
+        ).order_by("change_id", "pk")
+
+
+class TaskQuerySet(ChangeFeedQuerySet, SnowflakeQuerySet):
+    def due_for_warning(self, now, lead):
+        """Open tasks due within `lead` that have not had their pre-deadline warning."""
+        return self.filter(
+            deadline__gt=now,
+            deadline__lte=now + lead,
+            is_completed=False,
+            is_pre_notified=False,
+        ).order_by("deadline")
+
+    def due_for_deadline(self, now):
+        """Open tasks past their deadline that have not had the deadline notification."""
+        return self.filter(deadline__lte=now, is_completed=False, is_notified=False).order_by("deadline")
+
+    def claim(self, flag: str) -> list[tuple[int, str, datetime, int | None]]:
+        """
+        Set the `flag` notification field on the rows of this queryset in a single
+        UPDATE ... RETURNING, skipping rows that a concurrent scanner has already claimed.
+        Returns (id, title, deadline, owner's telegram_id) of the rows claimed here, by deadline.
+        """
+        assert flag in NOTIFICATION_FIELDS
+        connection = connections[self.db]
+        qn = connection.ops.quote_name
+        task_table = qn(self.model._meta.db_table)
+        user_model = self.model._meta.get_field("user").related_model
+        column = qn(self.model._meta.get_field(flag).column)
+        owner_telegram_id = (
+            f"(SELECT {qn('telegram_id')} FROM {qn(user_model._meta.db_table)} "
+            f"WHERE {qn(user_model._meta.pk.column)} = {task_table}.{qn('user_id')})"
+        )
+        selected, params = self.order_by().values("pk").query.sql_with_params()
+        sql = (
+            f"UPDATE {task_table} SET {column} = %s WHERE {qn('id')} IN ({selected}) AND NOT {column} "
+            f"RETURNING {qn('id')}, {qn('title')}, {qn('deadline')}, {owner_telegram_id}"
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, (True, *params))
+            rows = cursor.fetchall()
+
+        # Raw rows skip the model layer, so convert deadlines the way the ORM would (SQLite returns text)
+        deadline = self.model._meta.get_field("deadline")
+        converters = connection.ops.get_db_converters(deadline.cached_col) + deadline.get_db_converters(connection)
+        claimed = []
+        for task_id, title, value, telegram_id in rows:
+            for converter in converters:
+                value = converter(value, deadline.cached_col, connection)
+            claimed.append((task_id, title, value, telegram_id))
+        return sorted(claimed, key=lambda row: row[2])
+
+    def awaiting_notification(self, until):
+        """Open tasks due by `until` that still owe the warning or the deadline notification."""
+        return self.filter(
+            Q(is_pre_notified=False) | Q(is_notified=False),
+            deadline__lte=until,
+            is_completed=False,
+        )
+
+    def search(self, text: str):
+        """
+        Tasks matching `text`, best match first.
+        On PostgreSQL: full-text match on search_vector (websearch syntax) or trigram word
+        similarity on the title for typos and prefixes, both served by GIN indexes.
+        Other backends fall back to a substring scan in newest-first order.
+        """
+        if connections[self.db].vendor != "postgresql":
+            return self.filter(Q(title__icontains=text) | Q(description__icontains=text))
+
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type="websearch")
+        rank = SearchRank(F("search_vector"), query) + TrigramWordSimilarity(text, "title")
+        return self.filter(Q(search_vector=query) | Q(title__trigram_word_similar=text)).order_by(rank.desc(), "-id")
+
+    def touch(self, **values) -> int:
+        """queryset.update() that also moves the rows forward in the changes feed."""
+        return self.update(change_id=next_snowflake_id(), **values)
+
+
 class Task(SnowflakeModel):
+    # The id already encodes creation time: range queries go through
+    # Task.objects.created_between() and ordering uses the primary key,
+    # so this table skips the created_at index.
+    created_at = models.DateTimeField(auto_now_add=True)
+
     title = models.CharField(verbose_name="Title", max_length=255)
     description = models.TextField(verbose_name="Description", blank=True)
     deadline = models.DateTimeField(verbose_name="Deadline", null=True, blank=True)
@@ -31,10 +138,131 @@ class Task(SnowflakeModel):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="tasks")
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True, related_name="tasks")
 
+    # Position in the changes feed: a fresh Snowflake id on every visible change
+    change_id = SnowflakeField(default=next_snowflake_id, editable=False)
+
+    # Weighted title (A) + description (B) tsvector, kept up to date by a PostgreSQL trigger.
+    # Always NULL on other backends.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = models.Manager.from_queryset(TaskQuerySet)()
+
     class Meta:
         verbose_name = "Task"
         verbose_name_plural = "Tasks"
-        ordering = ["-created_at"]
+        ordering = ["-id"]
+        indexes = [
+            # A user's task list (newest first) in one index range scan
+            models.Index(fields=["user", "-id"], name="task_user_id_desc_idx"),
+            # Partial indexes matching the check_deadlines scanner predicates exactly
+            models.Index(
+                fields=["deadline"],
+                condition=Q(is_completed=False, is_pre_notified=False),
+                name="task_warning_due_idx",
+            ),
+            models.Index(
+                fields=["deadline"],
+                condition=Q(is_completed=False, is_notified=False),
+                name="task_deadline_due_idx",
+            ),
+            # List filters (apps.tasks.filters), each a range scan within the user's rows.
+            # Boolean filters compile to `[NOT] is_completed`, which only partial indexes match.
+            models.Index(fields=["user", "category", "-id"], name="task_user_category_idx"),
+            models.Index(fields=["user", "-id"], condition=Q(is_completed=False), name="task_user_open_idx"),
+            models.Index(fields=["user", "-id"], condition=Q(is_completed=True), name="task_user_done_idx"),
+            models.Index(fields=["user", "deadline"], name="task_user_deadline_idx"),
+            models.Index(
+                fields=["user", "deadline"], condition=Q(is_completed=False), name="task_user_open_deadline_idx"
+            ),
+            # Changes feed: a user's rows after a (change_id, id) cursor
+            models.Index(fields=["user", "change_id", "id"], name="task_user_change_idx"),
+            # Task.objects.search(), PostgreSQL only
+            GinIndex(fields=["search_vector"], name="task_search_vector_idx"),
+            GinIndex(fields=["title"], opclasses=["gin_trgm_ops"], name="task_title_trgm_idx"),
+        ]
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or not NOTIFICATION_FIELDS.issuperset(update_fields):
+            self.change_id = next_snowflake_id()
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "change_id"}
+        super().save(*args, **kwargs)
 
     def __str__(self) -> str:
         return self.title
+
+
+class NotificationQuerySet(models.QuerySet):
+    def due(self, now):
+        """Pending notifications whose next attempt is due, oldest first."""
+        return self.filter(status=Notification.Status.PENDING, next_attempt_at__lte=now).order_by("next_attempt_at")
+
+
+class Notification(models.Model):
+    """
+    Outbox row of a deadline notification (apps.tasks.outbox), written in the
+    transaction that sets the task's is_pre_notified / is_notified flag.
+    """
+
+    class Kind(models.TextChoices):
+        WARNING = "warning", "10-min warning"
+        DEADLINE = "deadline", "Deadline reached"
+
+    class Status(models.TextChoices):
+        PENDING = "pending", "Pending"
+        DELIVERED = "delivered", "Delivered"
+        DEAD = "dead", "Dead"
+        SKIPPED = "skipped", "Skipped"
+
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name="notifications")
+    kind = models.CharField(max_length=16, choices=Kind.choices)
+    chat_id = models.BigIntegerField()
+    text = models.TextField()
+
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+    delivered_at = models.DateTimeField(null=True, blank=True)
+
+    objects = NotificationQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Notification"
+        verbose_name_plural = "Notifications"
+        constraints = [
+            # Idempotency key: a task's reminder of each kind is queued once, whoever claims it
+            models.UniqueConstraint(fields=["task", "kind"], name="notification_task_kind_uniq"),
+        ]
+        indexes = [
+            # The delivery worker's scan: only pending rows, by due time
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=Q(status="pending"),
+                name="notification_pending_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()} for task {self.task_id}"
+
+
+class TaskTombstone(models.Model):
+    """Marker for a deleted task, so the changes feed can report deletions."""
+
+    task_id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    change_id = SnowflakeField(default=next_snowflake_id)
+
+    objects = ChangeFeedQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Deleted task"
+        verbose_name_plural = "Deleted tasks"
+        indexes = [
+            models.Index(fields=["user", "change_id", "task_id"], name="tombstone_user_change_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Deleted task {self.task_id}"
@@ -0,0 +1,244 @@
+"""
+Deadline notifier: reminders fired from in-memory timers instead of a polling scan.
+
+Writers publish the ids of changed tasks (DeadlineEvents); the notifier process
+(manage.py run_deadline_notifier) reloads those rows and adds, moves or cancels
+their timers. A reconciliation scan rebuilds all timers within the horizon every
+few minutes, which also covers lost events and deadlines entering the horizon.
+"""
+
+import heapq
+import json
+import logging
+import statistics
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+import redis
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from . import outbox
+from .models import Notification, Task
+from .outbox import deadline_text, warning_text
+from .tasks import WARNING_LEAD
+
+logger = logging.getLogger(__name__)
+
+WARNING = Notification.Kind.WARNING
+DEADLINE = Notification.Kind.DEADLINE
+
+NOTIFIED_FIELD = {WARNING: "is_pre_notified", DEADLINE: "is_notified"}
+
+
+class DeadlineEvents:
+    """Publishes ids of created, changed or deleted tasks to the notifier over Redis pub/sub."""
+
+    CHANNEL = "tasks:deadlines"
+
+    def __init__(self, url: str = ""):
+        self.client = redis.Redis.from_url(url, socket_timeout=2, socket_connect_timeout=2) if url else None
+
+    def publish(self, task_ids) -> None:
+        if self.client is None:
+            return
+        try:
+            self.client.publish(self.CHANNEL, json.dumps(list(task_ids)))
+        except redis.RedisError as e:
+            # The next reconciliation scan picks the change up
+            logger.warning(f"Failed to publish deadline event: {e}")
+
+    def publish_on_commit(self, task_ids) -> None:
+        if self.client is None:
+            return
+        task_ids = list(task_ids)
+        transaction.on_commit(lambda: self.publish(task_ids))
+
+
+deadline_events = DeadlineEvents(settings.DEADLINE_EVENTS_REDIS_URL)
+
+
+def parse_event(data) -> list[int]:
+    try:
+        ids = json.loads(data)
+    except ValueError:
+        ids = None
+    if not isinstance(ids, list) or not all(isinstance(task_id, int) for task_id in ids):
+        logger.warning(f"Ignoring malformed deadline event: {data!r}")
+        return []
+    return ids
+
+
+@dataclass
+class Timers:
+    """Pending notifications of one task."""
+
+    deadline: datetime
+    title: str
+    chat_id: int
+    pending: set[str] = field(default_factory=set)
+
+
+class DeadlineNotifier:
+    """
+    Min-heap of (fire_at, task_id, kind, deadline) entries over the tasks due within the horizon.
+
+    Moving or cancelling a timer only updates `self.tasks`; heap entries that no
+    longer match it are skipped when they reach the top. Every notification is
+    claimed with a conditional UPDATE and queued in the outbox in one transaction,
+    so neither a stale timer, a second notifier nor the check_deadlines poller can
+    deliver it twice, and a failed send is retried by the outbox.
+    """
+
+    def __init__(
+        self,
+        horizon: timedelta = timedelta(seconds=settings.DEADLINE_NOTIFIER_HORIZON),
+        reconcile_every: timedelta = timedelta(seconds=settings.DEADLINE_NOTIFIER_RECONCILE_SECONDS),
+        deliver_many=None,
+    ):
+        self.horizon = horizon
+        self.reconcile_every = reconcile_every
+        self.deliver_many = deliver_many
+        self.tasks: dict[int, Timers] = {}
+        self.heap: list[tuple[datetime, int, str, datetime]] = []
+        self.next_reconcile: datetime | None = None
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        self.stats = {"sent": 0, "queries": 0, "events": 0}
+        self.lags: list[float] = []
+
+    def report(self) -> str:
+        lags = sorted(self.lags)
+        p50 = statistics.median(lags) if lags else 0.0
+        p99 = lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+        return (
+            f"timers {len(self.tasks)}, sent {self.stats['sent']}, events {self.stats['events']}, "
+            f"queries {self.stats['queries']}, lag p50 {p50:.0f} ms p99 {p99:.0f} ms"
+        )
+
+    def _rows(self, queryset):
+        self.stats["queries"] += 1
+        return queryset.values_list("id", "deadline", "title", "user__telegram_id", "is_pre_notified", "is_notified")
+
+    def _schedule(self, row, now: datetime) -> None:
+        task_id, deadline, title, chat_id, is_pre_notified, is_notified = row
+        pending = set()
+        # Once the deadline has passed only the deadline message is due, as with the poller
+        if not is_pre_notified and deadline > now:
+            pending.add(WARNING)
+        if not is_notified:
+            pending.add(DEADLINE)
+        if not pending:
+            self.tasks.pop(task_id, None)
+            return
+
+        current = self.tasks.get(task_id)
+        self.tasks[task_id] = Timers(deadline, title, chat_id, pending)
+        for kind in pending:
+            if current is None or current.deadline != deadline or kind not in current.pending:
+                fire_at = deadline - WARNING_LEAD if kind == WARNING else deadline
+                heapq.heappush(self.heap, (fire_at, task_id, kind, deadline))
+
+    def reconcile(self, now: datetime) -> None:
+        """Rebuild every timer from the database (one query over the partial deadline indexes)."""
+        self.tasks = {}
+        self.heap = []
+        for row in self._rows(Task.objects.awaiting_notification(now + self.horizon + WARNING_LEAD)):
+            self._schedule(row, now)
+        self.next_reconcile = now + self.reconcile_every
+
+    def refresh(self, task_ids, now: datetime) -> None:
+        """Re-read the given tasks after a change event: add, move or cancel their timers."""
+        self.stats["events"] += 1
+        rows = self._rows(Task.objects.awaiting_notification(now + self.horizon + WARNING_LEAD).filter(pk__in=task_ids))
+        found = set()
+        for row in rows:
+            found.add(row[0])
+            self._schedule(row, now)
+        for task_id in set(task_ids) - found:
+            self.tasks.pop(task_id, None)
+
+    def next_wakeup(self) -> datetime | None:
+        """When fire_due() or reconcile() next has work to do."""
+        wakeups = [self.next_reconcile] if self.next_reconcile else []
+        while self.heap and not self._is_current(self.heap[0]):
+            heapq.heappop(self.heap)
+        if self.heap:
+            wakeups.append(self.heap[0][0])
+        return min(wakeups, default=None)
+
+    def _is_current(self, entry) -> bool:
+        _, task_id, kind, deadline = entry
+        timers = self.tasks.get(task_id)
+        return timers is not None and timers.deadline == deadline and kind in timers.pending
+
+    def fire_due(self, now: datetime) -> int:
+        """Deliver every notification whose time has come. Returns how many were sent."""
+        queued = []
+        while self.heap and self.heap[0][0] <= now:
+            entry = heapq.heappop(self.heap)
+            if not self._is_current(entry):
+                continue
+            fire_at, task_id, kind, deadline = entry
+            timers = self.tasks[task_id]
+            timers.pending.discard(kind)
+            if not timers.pending:
+                del self.tasks[task_id]
+            if kind == WARNING and deadline <= now:
+                continue
+
+            self.stats["queries"] += 1
+            with transaction.atomic():
+                claimed = Task.objects.filter(
+                    pk=task_id, deadline=deadline, is_completed=False, **{NOTIFIED_FIELD[kind]: False}
+                ).update(**{NOTIFIED_FIELD[kind]: True})
+                # Claimed even without a chat to send to, so the task stops being rescanned
+                if not claimed or timers.chat_id is None:
+                    continue
+                text = (
+                    warning_text(timers.title, deadline, now)
+                    if kind == WARNING
+                    else deadline_text(timers.title, deadline)
+                )
+                notification = (task_id, kind, timers.chat_id, text)
+                outbox.enqueue([notification], now)
+            queued.append(notification)
+            self.lags.append((now - fire_at).total_seconds() * 1000)
+
+        if not queued:
+            return 0
+        # One outbox insert each, then the re-read that renders them and the outcome update
+        self.stats["queries"] += len(queued) + 2
+        sent = outbox.send(queued, now, deliver_many=self.deliver_many)
+        self.stats["sent"] += sent
+        return sent
+
+    def run(self, pubsub, clock=None, should_stop=lambda: False, max_wait: float = 60) -> None:
+        """
+        Serve until should_stop(): fire timers on time, apply change events from
+        `pubsub` (already subscribed to DeadlineEvents.CHANNEL) and reconcile.
+        """
+        clock = clock or timezone.now
+        self.reconcile(clock())
+        while not should_stop():
+            now = clock()
+            wakeup = self.next_wakeup()
+            timeout = min(max((wakeup - now).total_seconds(), 0), max_wait) if wakeup else max_wait
+
+            task_ids = []
+            message = pubsub.get_message(ignore_subscribe_messages=True, timeout=timeout)
+            while message is not None:
+                task_ids.extend(parse_event(message["data"]))
+                message = pubsub.get_message(ignore_subscribe_messages=True, timeout=0)
+
+            close_old_connections()
+            now = clock()
+            if self.next_reconcile is None or now >= self.next_reconcile:
+                logger.info(f"Deadline notifier: {self.report()}")
+                self.reset_stats()
+                self.reconcile(now)
+            elif task_ids:
+                self.refresh(task_ids, now)
+            self.fire_due(now)
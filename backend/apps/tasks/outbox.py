@@ -0,0 +1,171 @@
+"""
+Notification outbox: deadline reminders are queued in the Notification table by
+the transaction that claims them (sets is_pre_notified / is_notified), then
+delivered from there, so a failed send is retried instead of lost.
+
+The unique (task, kind) key makes queueing idempotent: however many scanners and
+notifiers claim in parallel, a reminder is queued once. Every row is leased to one
+sender at a time by pushing next_attempt_at past the send: new rows to their
+claimer, which sends them right after commit (claim, insert, one SELECT of the
+tasks and one UPDATE per outcome), and failed ones to the retry worker, which
+takes due rows under SKIP LOCKED. Only a sender dying between Telegram's answer
+and recording it can repeat a message, once its lease runs out.
+
+Messages are rendered when they are sent, from the task as it is then: a retry
+may go out long after the claim. Reminders that no longer apply (warnings past
+their deadline, tasks completed or rescheduled since) are skipped.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Notification, Task
+from .sender import DELIVERED, REJECTED, get_sender
+
+logger = logging.getLogger(__name__)
+
+WARNING = Notification.Kind.WARNING
+
+
+def warning_text(title, deadline, now):
+    minutes_left = int((deadline - now).total_seconds() / 60)
+    return f"⏳ <b>Reminder!</b>\n\nTask: <b>{title}</b>\nDue in: <b>{minutes_left} min</b>"
+
+
+def deadline_text(title, deadline):
+    return f"🔥 <b>DEADLINE REACHED!</b>\n\nTask: <b>{title}</b>\nTime: {deadline.strftime('%H:%M')}"
+
+
+def enqueue(notifications: list[tuple[int, str, int, str]], now: datetime) -> None:
+    """
+    Queue (task_id, kind, chat_id, text) notifications in the transaction that claims them.
+    The rows start out leased to the caller, who send()s them once that transaction has
+    committed; if it never does, deliver_due() picks them up when the lease runs out.
+    A notification already queued is left as it is.
+    """
+    lease_until = now + timedelta(seconds=settings.NOTIFICATION_LEASE_SECONDS)
+    rows = [
+        Notification(task_id=task_id, kind=kind, chat_id=chat_id, text=text, attempts=1, next_attempt_at=lease_until)
+        for task_id, kind, chat_id, text in notifications
+    ]
+    if rows:
+        Notification.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+def send(notifications: list[tuple[int, str, int, str]], now: datetime, deliver_many=None) -> int:
+    """First attempt at notifications just queued by enqueue(). Returns how many were delivered."""
+    deliver_many = deliver_many or _default_deliver_many()
+    if deliver_many is None or not notifications:
+        return 0
+    return _deliver([(*notification, 1) for notification in notifications], deliver_many, now)
+
+
+def deliver_due(now: datetime | None = None, deliver_many=None) -> int:
+    """
+    Retry every pending notification due by `now`, batch by batch. Returns how many were delivered.
+    `deliver_many` takes (chat_id, text) pairs and returns their outcomes (TelegramSender.deliver_many).
+    """
+    deliver_many = deliver_many or _default_deliver_many()
+    if deliver_many is None:
+        return 0
+
+    now = now or timezone.now()
+    delivered = 0
+    while True:
+        batch = _lease(now, settings.NOTIFICATION_BATCH_SIZE)
+        if batch:
+            delivered += _deliver(batch, deliver_many, now)
+        if len(batch) < settings.NOTIFICATION_BATCH_SIZE:
+            return delivered
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff after the `attempts`-th failed attempt."""
+    seconds = settings.NOTIFICATION_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.NOTIFICATION_RETRY_MAX_SECONDS))
+
+
+def _default_deliver_many():
+    if not settings.BOT_TOKEN:
+        logger.warning("❌ BOT_TOKEN not found in settings")
+        return None
+    return get_sender().deliver_many
+
+
+def _lease(now: datetime, limit: int) -> list[tuple[int, str, int, str, int]]:
+    """Take up to `limit` due rows away from other workers: (task_id, kind, chat_id, text, attempts)."""
+    with transaction.atomic():
+        batch = list(
+            Notification.objects.due(now)
+            .select_for_update(skip_locked=True)
+            .values_list("pk", "task_id", "kind", "chat_id", "text", "attempts")[:limit]
+        )
+        if batch:
+            Notification.objects.filter(pk__in=[row[0] for row in batch]).update(
+                attempts=F("attempts") + 1,
+                next_attempt_at=now + timedelta(seconds=settings.NOTIFICATION_LEASE_SECONDS),
+            )
+    return [(task_id, kind, chat_id, text, attempts + 1) for _, task_id, kind, chat_id, text, attempts in batch]
+
+
+def _render(batch, now: datetime) -> tuple[list, list]:
+    """
+    Re-render (task_id, kind, chat_id, text, attempt) rows from their tasks' current state.
+    Returns (rows to send, rows to skip): a warning once the deadline has passed (the
+    deadline notification takes over), a deadline notification whose deadline has moved
+    into the future, and either kind for a task completed or without a deadline since.
+    """
+    tasks = {
+        pk: (title, deadline, is_completed)
+        for pk, title, deadline, is_completed in Task.objects.filter(pk__in={row[0] for row in batch}).values_list(
+            "pk", "title", "deadline", "is_completed"
+        )
+    }
+    fresh, stale = [], []
+    for row in batch:
+        task_id, kind, chat_id, _, attempt = row
+        title, deadline, is_completed = tasks.get(task_id, (None, None, True))
+        if is_completed or deadline is None or (deadline <= now if kind == WARNING else deadline > now):
+            stale.append(row)
+            continue
+        text = warning_text(title, deadline, now) if kind == WARNING else deadline_text(title, deadline)
+        fresh.append((task_id, kind, chat_id, text, attempt))
+    return fresh, stale
+
+
+def _deliver(batch, deliver_many, now: datetime) -> int:
+    """Send (task_id, kind, chat_id, text, attempt) rows, rendered anew, and record the outcomes."""
+    batch, stale = _render(batch, now)
+    outcomes = deliver_many([(chat_id, text) for _, _, chat_id, text, _ in batch]) if batch else []
+
+    # (kind, outcome, attempt) -> task ids: one UPDATE per group over the (task, kind) key, not one per row
+    groups = defaultdict(list)
+    for task_id, kind, _, _, _ in stale:
+        groups[kind, Notification.Status.SKIPPED, None].append(task_id)
+    for (task_id, kind, _, _, attempt), outcome in zip(batch, outcomes, strict=True):
+        if outcome == DELIVERED:
+            attempt = None
+        elif outcome == REJECTED or attempt >= settings.NOTIFICATION_MAX_ATTEMPTS:
+            outcome = Notification.Status.DEAD
+        groups[kind, outcome, attempt].append(task_id)
+
+    delivered = 0
+    for (kind, outcome, attempt), task_ids in groups.items():
+        rows = Notification.objects.filter(kind=kind, task_id__in=task_ids)
+        if outcome == DELIVERED:
+            rows.update(status=Notification.Status.DELIVERED, delivered_at=now)
+            delivered += len(task_ids)
+        elif outcome == Notification.Status.SKIPPED:
+            rows.update(status=Notification.Status.SKIPPED)
+        elif outcome == Notification.Status.DEAD:
+            rows.update(status=Notification.Status.DEAD)
+            logger.warning(f"Gave up on {kind} notifications of tasks {task_ids} (attempt {attempt})")
+        else:
+            rows.update(next_attempt_at=now + retry_delay(attempt))
+    return delivered
@@ -0,0 +1,7 @@
+from apps.core.pagination import SnowflakeCursorPagination
+
+
+class CategoryCursorPagination(SnowflakeCursorPagination):
+    """Categories page by name (unique per user), matching the (user, name) index."""
+
+    ordering = "name"
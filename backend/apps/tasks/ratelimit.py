@@ -0,0 +1,187 @@
+"""
+Telegram flood limits shared by every sender: the Celery tasks and the deadline
+notifier (TelegramRateLimiter), and the bot (AsyncTelegramRateLimiter, applied by
+bot/utils/ratelimit.py). Both draw from the same Redis keys through one script.
+
+Two token buckets are taken together for each message: one global (Telegram
+allows ~30 msgs/s per bot) and one per chat (~1 msg/s). A 429 from Telegram
+pauses the chat for its retry_after in the same store.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+
+import redis
+import redis.asyncio
+
+logger = logging.getLogger(__name__)
+
+# KEYS: global bucket, chat bucket, chat pause. ARGV: global rate, global burst, chat rate, chat burst.
+# Takes a token from both buckets and returns 0, or returns the milliseconds to wait and takes nothing.
+ACQUIRE_SCRIPT = """
+local t = redis.call('TIME')
+local now = t[1] * 1000 + t[2] / 1000
+
+local wait = redis.call('PTTL', KEYS[3])
+if wait < 0 then wait = 0 end
+
+local function level(key, rate, burst)
+    local state = redis.call('HMGET', key, 'tokens', 'ts')
+    local tokens = tonumber(state[1])
+    if tokens == nil then return burst end
+    return math.min(burst, tokens + (now - tonumber(state[2])) * rate / 1000)
+end
+
+local buckets = {{KEYS[1], tonumber(ARGV[1]), tonumber(ARGV[2])}, {KEYS[2], tonumber(ARGV[3]), tonumber(ARGV[4])}}
+for _, bucket in ipairs(buckets) do
+    bucket[4] = level(bucket[1], bucket[2], bucket[3])
+    if bucket[4] < 1 then wait = math.max(wait, (1 - bucket[4]) * 1000 / bucket[2]) end
+end
+if wait > 0 then return math.ceil(wait) end
+
+for _, bucket in ipairs(buckets) do
+    redis.call('HSET', bucket[1], 'tokens', bucket[4] - 1, 'ts', now)
+    redis.call('PEXPIRE', bucket[1], math.ceil(bucket[3] * 1000 / bucket[2]) + 1000)
+end
+return 0
+"""
+
+
+KEY_PREFIX = "telegram:ratelimit:"
+
+
+class _TokenBuckets:
+    """Bucket settings, Redis keys and the in-process fallback shared by the sync and async limiters."""
+
+    KEY_PREFIX = KEY_PREFIX
+
+    def __init__(
+        self,
+        client: redis.Redis | redis.asyncio.Redis | None = None,
+        global_rate: float = 30,
+        global_burst: float = 30,
+        chat_rate: float = 1,
+        chat_burst: float = 3,
+    ):
+        self.client = client
+        self.global_rate = global_rate
+        self.global_burst = global_burst
+        self.chat_rate = chat_rate
+        self.chat_burst = chat_burst
+        self.clock = time.monotonic
+        self._script = client.register_script(ACQUIRE_SCRIPT) if client is not None else None
+        # key -> (tokens, updated_at) / chat_id -> paused until
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._paused: dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def _script_keys(self, chat_id) -> list[str]:
+        return [f"{self.KEY_PREFIX}global", f"{self.KEY_PREFIX}chat:{chat_id}", self._pause_key(chat_id)]
+
+    def _script_args(self) -> list[float]:
+        return [self.global_rate, self.global_burst, self.chat_rate, self.chat_burst]
+
+    def _pause_key(self, chat_id) -> str:
+        return f"{self.KEY_PREFIX}pause:{chat_id}"
+
+    def _pause_local(self, chat_id, seconds: float) -> None:
+        with self._lock:
+            self._paused[chat_id] = self.clock() + seconds
+
+    def _try_acquire_local(self, chat_id) -> float:
+        with self._lock:
+            now = self.clock()
+            wait = max(self._paused.get(chat_id, now) - now, 0)
+            if not wait:
+                self._paused.pop(chat_id, None)
+
+            buckets = [("global", self.global_rate, self.global_burst), (chat_id, self.chat_rate, self.chat_burst)]
+            levels = []
+            for key, rate, burst in buckets:
+                tokens, updated_at = self._buckets.get(key, (burst, now))
+                tokens = min(burst, tokens + (now - updated_at) * rate)
+                levels.append(tokens)
+                if tokens < 1:
+                    wait = max(wait, (1 - tokens) / rate)
+            if wait:
+                return wait
+
+            for (key, _, _), tokens in zip(buckets, levels, strict=True):
+                self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > 10_000:
+                self._forget_idle_chats(now)
+            return 0
+
+    def _forget_idle_chats(self, now: float) -> None:
+        # A chat whose bucket has refilled is indistinguishable from one never seen
+        idle = [
+            key
+            for key, (tokens, updated_at) in self._buckets.items()
+            if key != "global" and tokens + (now - updated_at) * self.chat_rate >= self.chat_burst
+        ]
+        for key in idle:
+            del self._buckets[key]
+
+
+class TelegramRateLimiter(_TokenBuckets):
+    """
+    Global + per-chat token buckets in Redis, or in this process when no client is given.
+    A Redis outage falls back to the in-process buckets: sends keep going, limited per process.
+    """
+
+    sleep = staticmethod(time.sleep)
+
+    def try_acquire(self, chat_id) -> float:
+        """Take a token for a message to `chat_id`: 0 on success, else seconds to wait before retrying."""
+        if self._script is not None:
+            try:
+                return self._script(keys=self._script_keys(chat_id), args=self._script_args()) / 1000
+            except redis.RedisError as e:
+                logger.warning(f"Telegram rate limiter unavailable, limiting per process: {e}")
+        return self._try_acquire_local(chat_id)
+
+    def acquire(self, chat_id) -> None:
+        """Block until a message to `chat_id` may be sent."""
+        while wait := self.try_acquire(chat_id):
+            self.sleep(wait)
+
+    def pause(self, chat_id, seconds: float) -> None:
+        """Hold every sender back from `chat_id` for `seconds` (Telegram's retry_after)."""
+        if self.client is not None:
+            try:
+                self.client.set(self._pause_key(chat_id), 1, px=max(int(seconds * 1000), 1))
+                return
+            except redis.RedisError as e:
+                logger.warning(f"Telegram rate limiter unavailable, pausing chat in this process only: {e}")
+        self._pause_local(chat_id, seconds)
+
+
+class AsyncTelegramRateLimiter(_TokenBuckets):
+    """TelegramRateLimiter for asyncio senders (the bot), on a redis.asyncio client."""
+
+    sleep = staticmethod(asyncio.sleep)
+
+    async def try_acquire(self, chat_id) -> float:
+        """Take a token for a message to `chat_id`: 0 on success, else seconds to wait before retrying."""
+        if self._script is not None:
+            try:
+                return await self._script(keys=self._script_keys(chat_id), args=self._script_args()) / 1000
+            except redis.RedisError as e:
+                logger.warning(f"Telegram rate limiter unavailable, limiting per process: {e}")
+        return self._try_acquire_local(chat_id)
+
+    async def acquire(self, chat_id) -> None:
+        while wait := await self.try_acquire(chat_id):
+            await self.sleep(wait)
+
+    async def pause(self, chat_id, seconds: float) -> None:
+        """Hold every sender back from `chat_id` for `seconds` (Telegram's retry_after)."""
+        if self.client is not None:
+            try:
+                await self.client.set(self._pause_key(chat_id), 1, px=max(int(seconds * 1000), 1))
+                return
+            except redis.RedisError as e:
+                logger.warning(f"Telegram rate limiter unavailable, pausing chat in this process only: {e}")
+        self._pause_local(chat_id, seconds)
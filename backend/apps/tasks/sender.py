@@ -0,0 +1,150 @@
+"""
+Outgoing Telegram Bot API messages for the Celery tasks and the deadline notifier.
+
+One keep-alive connection pool per process (no TCP + TLS handshake per message)
+and a bounded thread pool for batches, so a morning briefing to many users costs
+about `messages / concurrency` round trips instead of one per message, within
+Telegram's flood limits (apps.tasks.ratelimit).
+"""
+
+import logging
+import os
+import threading
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import redis
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+from .ratelimit import TelegramRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Outcomes of TelegramSender.deliver()
+DELIVERED = "delivered"
+# Worth trying again later: network errors, 5xx, flood control outlasting our attempts
+FAILED = "failed"
+# Refused for good: the user blocked the bot, the chat is gone or the message is malformed
+REJECTED = "rejected"
+
+
+class TelegramSender:
+    """
+    sendMessage over a pooled requests.Session, with `concurrency` requests in flight at most.
+    Every attempt first takes a token from `limiter`; a 429 pauses the chat for its
+    retry_after and the message is tried again, up to `attempts` times.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        base_url: str = "https://api.telegram.org",
+        concurrency: int = 16,
+        timeout=5,
+        limiter: TelegramRateLimiter | None = None,
+        attempts: int = 3,
+    ):
+        self.url = f"{base_url.rstrip('/')}/bot{token}/sendMessage"
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.limiter = limiter or TelegramRateLimiter()
+        self.attempts = attempts
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def send(self, chat_id, text: str) -> bool:
+        """Send one message. Returns whether Telegram accepted it; failures are logged, never raised."""
+        return self.deliver(chat_id, text) == DELIVERED
+
+    def deliver(self, chat_id, text: str) -> str:
+        """Send one message. Returns DELIVERED, FAILED or REJECTED; failures are logged, never raised."""
+        payload = {"chat_id": chat_id, "text": text, "parse_mode": "HTML"}
+        for attempt in range(1, self.attempts + 1):
+            self.limiter.acquire(chat_id)
+            try:
+                response = self.session.post(self.url, json=payload, timeout=self.timeout)
+            except requests.RequestException as e:
+                logger.error(f"❌ Failed to send notification: {e}")
+                return FAILED
+            if response.status_code == 429:
+                retry_after = retry_after_of(response)
+                # Every sender backs off this chat, not just this attempt
+                self.limiter.pause(chat_id, retry_after)
+                if attempt < self.attempts:
+                    logger.warning(f"Telegram flood control on chat {chat_id}: retrying in {retry_after} s")
+                    continue
+            if response.status_code != 200:
+                logger.error(f"❌ Telegram rejected notification: {response.status_code} {response.text[:200]}")
+                return REJECTED if response.status_code in (400, 403) else FAILED
+            return DELIVERED
+        return FAILED
+
+    def deliver_many(self, messages: list[tuple[int, str]]) -> list[str]:
+        """deliver() each (chat_id, text) pair concurrently. Returns the outcomes in message order."""
+        return list(self._get_executor().map(lambda message: self.deliver(*message), messages))
+
+    def send_many(self, messages: Iterable[tuple[int, str]]) -> int:
+        """Send (chat_id, text) pairs concurrently. Returns how many were delivered."""
+        executor = self._get_executor()
+        delivered = 0
+        in_flight = set()
+        for chat_id, text in messages:
+            # Bounded backlog: a 50k-user briefing never queues 50k futures at once
+            if len(in_flight) >= self.concurrency * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                delivered += sum(future.result() for future in done)
+            in_flight.add(executor.submit(self.send, chat_id, text))
+        delivered += sum(future.result() for future in wait(in_flight).done)
+        return delivered
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="telegram-send")
+            return self._executor
+
+    def close(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+        self.session.close()
+
+
+def retry_after_of(response) -> float:
+    """Seconds Telegram asks to wait in a 429 response (parameters.retry_after)."""
+    try:
+        return float(response.json()["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        return 1.0
+
+
+_sender: TelegramSender | None = None
+_sender_pid: int | None = None
+
+
+def get_sender() -> TelegramSender:
+    """The process-wide sender. Rebuilt after fork: pooled sockets must not be shared with the parent."""
+    global _sender, _sender_pid
+    if _sender is None or _sender_pid != os.getpid():
+        url = settings.TELEGRAM_RATE_LIMIT_REDIS_URL
+        _sender = TelegramSender(
+            settings.BOT_TOKEN,
+            base_url=settings.TELEGRAM_API_URL,
+            concurrency=settings.TELEGRAM_SEND_CONCURRENCY,
+            limiter=TelegramRateLimiter(
+                redis.Redis.from_url(url, socket_timeout=2, socket_connect_timeout=2) if url else None,
+                global_rate=settings.TELEGRAM_RATE_GLOBAL,
+                global_burst=settings.TELEGRAM_RATE_GLOBAL,
+                chat_rate=settings.TELEGRAM_RATE_PER_CHAT,
+                chat_burst=settings.TELEGRAM_RATE_PER_CHAT_BURST,
+            ),
+        )
+        _sender_pid = os.getpid()
+    return _sender
@@ -1,9 +1,13 @@
+import re
+
+from django.db.models import F
 from rest_framework import serializers
 
+from apps.core.serializers import SparseFieldsetMixin, requested_fields
 from apps.tasks.models import Category, Task
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Task Categories.
     """
@@ -14,7 +18,7 @@ class CategorySerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at"]
 
 
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """
     Serializer for Tasks.
     Includes category details for read operations.
@@ -59,3 +63,191 @@ class TaskSerializer(serializers.ModelSerializer):
             validated_data["category"] = category
 
         return super().create(validated_data)
+
+
+class TaskListSerializer(serializers.BaseSerializer):
+    """
+    Read-only fast path for task lists, producing the same output as TaskSerializer.
+
+    Serializes plain rows from `TaskListSerializer.rows(queryset)` (values() with
+    the category name joined in SQL) instead of model instances, skipping model
+    construction, per-field introspection and the category N+1.
+    Honours `?fields=` / `?omit=` like TaskSerializer.
+    """
+
+    # Output order of TaskSerializer
+    OUTPUT_FIELDS = (
+        "id",
+        "title",
+        "description",
+        "deadline",
+        "is_completed",
+        "category_name",
+        "created_at",
+        "updated_at",
+    )
+    DATETIME_FIELDS = frozenset({"deadline", "created_at", "updated_at"})
+
+    _datetime = serializers.DateTimeField()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.selected = requested_fields(self.context.get("request"), self.OUTPUT_FIELDS)
+
+    @classmethod
+    def readable_field_names(cls) -> list[str]:
+        return list(cls.OUTPUT_FIELDS)
+
+    @classmethod
+    def rows(cls, queryset, selected=None):
+        """
+        values() rows for `selected` fields (all by default). `id` is always
+        fetched since cursor pagination needs it.
+        """
+        selected = cls.OUTPUT_FIELDS if selected is None else selected
+        columns = ["id", *(name for name in selected if name not in ("id", "category_name"))]
+        if "category_name" in selected:
+            return queryset.values(*columns, category_name=F("category__name"))
+        return queryset.values(*columns)
+
+    def to_representation(self, row):
+        if self.selected is not None:
+            return self._sparse_representation(row)
+
+        datetime = self._datetime.to_representation
+        data = {
+            "id": row["id"],
+            "title": row["title"],
+            "description": row["description"],
+            "deadline": datetime(row["deadline"]),
+            "is_completed": row["is_completed"],
+        }
+        # TaskSerializer leaves category_name out entirely for tasks without a category
+        if row["category_name"] is not None:
+            data["category_name"] = row["category_name"]
+        data["created_at"] = datetime(row["created_at"])
+        data["updated_at"] = datetime(row["updated_at"])
+        return data
+
+    def _sparse_representation(self, row):
+        data = {}
+        for name in self.selected:
+            value = row[name]
+            if name in self.DATETIME_FIELDS:
+                value = self._datetime.to_representation(value)
+            elif name == "category_name" and value is None:
+                continue
+            data[name] = value
+        return data
+
+
+class TaskFilterSerializer(serializers.Serializer):
+    """Query parameters of the task list filters (see apps.tasks.filters)."""
+
+    category = serializers.IntegerField(required=False)
+    is_completed = serializers.BooleanField(required=False)
+    deadline_after = serializers.DateTimeField(required=False)
+    deadline_before = serializers.DateTimeField(required=False)
+    overdue = serializers.BooleanField(required=False)
+
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_PAGE_SIZE = 100
+
+
+class TaskSearchSerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    limit = serializers.IntegerField(min_value=1, max_value=SEARCH_MAX_PAGE_SIZE, default=SEARCH_PAGE_SIZE)
+
+
+BULK_MAX_ITEMS = 500
+
+CATEGORY_FIELDS = ("category_id", "category_name")
+
+
+def resolve_categories(user, rows):
+    """
+    Batched equivalent of TaskSerializer's per-row category handling for bulk writes.
+
+    Returns (categories, errors): per row, the Category to assign (None to clear,
+    or the sentinel `...` when the row does not mention a category) and an errors dict.
+    One query validates all `category_id`s; `category_name`s are validated like a
+    CharField, then fetched or created in bulk.
+    """
+    field = TaskSerializer().fields["category_id"]
+    errors: list[dict] = [{} for _ in rows]
+    categories: list = [... for _ in rows]
+
+    pks = {}
+    for i, row in enumerate(rows):
+        if "category_id" not in row:
+            continue
+        pk = row["category_id"]
+        if pk is None or pk == "":
+            categories[i] = None
+            continue
+        try:
+            if isinstance(pk, bool):
+                raise TypeError
+            pks[i] = int(pk)
+        except (TypeError, ValueError):
+            errors[i]["category_id"] = [field.error_messages["incorrect_type"].format(data_type=type(pk).__name__)]
+
+    found = {c.pk: c for c in Category.objects.filter(pk__in=set(pks.values()))}
+    for i, pk in pks.items():
+        category = found.get(pk)
+        if category is None:
+            errors[i]["category_id"] = [field.error_messages["does_not_exist"].format(pk_value=rows[i]["category_id"])]
+        elif category.user_id != user.id:
+            errors[i]["category_id"] = ["You cannot use a category that does not belong to you."]
+        else:
+            categories[i] = category
+
+    name_field = serializers.CharField(max_length=Category._meta.get_field("name").max_length)
+    row_names = {}
+    for i, row in enumerate(rows):
+        if row.get("category_name") in (None, ""):
+            continue
+        try:
+            row_names[i] = name_field.run_validation(row["category_name"])
+        except serializers.ValidationError as exc:
+            errors[i]["category_name"] = exc.detail
+
+    names = set(row_names.values())
+    if names:
+        by_name = {c.name: c for c in Category.objects.filter(user=user, name__in=names)}
+        missing = [Category(name=name, user=user) for name in names - by_name.keys()]
+        if missing:
+            Category.objects.bulk_create(missing, ignore_conflicts=True)
+            by_name = {c.name: c for c in Category.objects.filter(user=user, name__in=names)}
+        for i, name in row_names.items():
+            if not errors[i]:
+                categories[i] = by_name[name]
+
+    return categories, errors
+
+
+class TaskBulkIdsSerializer(serializers.Serializer):
+    ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False, max_length=BULK_MAX_ITEMS)
+
+
+class TaskBulkUpdateSerializer(TaskBulkIdsSerializer):
+    changes = serializers.DictField(allow_empty=False)
+
+
+CHANGES_PAGE_SIZE = 500
+CHANGES_MAX_PAGE_SIZE = 1000
+
+# "<change_id>.<id>.<issued>": feed position plus the feed bound it was issued at
+CHANGES_CURSOR_RE = re.compile(r"(\d{1,19})\.(\d{1,19})\.(\d{1,19})", re.ASCII)
+
+
+class TaskChangesSerializer(serializers.Serializer):
+    since = serializers.CharField(required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=CHANGES_MAX_PAGE_SIZE, default=CHANGES_PAGE_SIZE)
+
+    def validate_since(self, value):
+        match = CHANGES_CURSOR_RE.fullmatch(value)
+        if match is None or any(int(part) >= 2**63 for part in match.groups()):
+            raise serializers.ValidationError("Invalid cursor.")
+        return tuple(int(part) for part in match.groups())
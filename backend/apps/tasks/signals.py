@@ -0,0 +1,76 @@
+import threading
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apps.tasks.cache import invalidate_user_lists
+from apps.tasks.models import NOTIFICATION_FIELDS, Category, Task, TaskTombstone
+from apps.tasks.notifier import deadline_events
+
+User = get_user_model()
+
+_bulk = threading.local()
+
+
+@contextmanager
+def bulk_task_deletes():
+    """
+    Tasks deleted inside this block are left to the caller: no per-row tombstone,
+    list invalidation or deadline event (see TaskViewSet.bulk_destroy).
+    """
+    previous = getattr(_bulk, "deleting", False)
+    _bulk.deleting = True
+    try:
+        yield
+    finally:
+        _bulk.deleting = previous
+
+
+def _invalidate(user_id: int) -> None:
+    invalidate_user_lists(user_id)
+    # Again after commit: a reader that cached between the first bump and
+    # the commit stored a payload without this write
+    transaction.on_commit(lambda: invalidate_user_lists(user_id))
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender, instance, update_fields=None, **kwargs):
+    if update_fields and NOTIFICATION_FIELDS.issuperset(update_fields):
+        return
+    _invalidate(instance.user_id)
+    deadline_events.publish_on_commit([instance.id])
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender, instance, origin=None, **kwargs):
+    if getattr(_bulk, "deleting", False):
+        return
+    # The user's whole feed goes away with the user, tombstones included
+    deleting_user = isinstance(origin, User) or (isinstance(origin, QuerySet) and origin.model is User)
+    if not deleting_user:
+        TaskTombstone.objects.create(task_id=instance.id, user_id=instance.user_id)
+    _invalidate(instance.user_id)
+    deadline_events.publish_on_commit([instance.id])
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, created=False, **kwargs):
+    if not created:
+        # A rename changes category_name in every task of this category
+        Task.objects.filter(category=instance).touch()
+    _invalidate(instance.user_id)
+
+
+@receiver(pre_delete, sender=Category)
+def category_deleting(sender, instance, **kwargs):
+    # Its tasks lose category_name through SET_NULL, which sends no signals
+    Task.objects.filter(category=instance).touch()
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    _invalidate(instance.user_id)
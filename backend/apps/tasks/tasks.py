@@ -3,15 +3,22 @@ from collections import defaultdict
 from datetime import timedelta
 from zoneinfo import ZoneInfo
 
-import requests
 from celery import shared_task
 from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
 
-from .models import Task
+from apps.core.snowflake import min_id_for
+
+from . import outbox
+from .models import Notification, Task, TaskTombstone
+from .outbox import deadline_text, warning_text
+from .sender import get_sender
 
 logger = logging.getLogger(__name__)
 
+WARNING_LEAD = timedelta(minutes=10)
+
 
 def get_local_time_str(dt, user):
     """
@@ -36,69 +43,62 @@ def get_local_time_str(dt, user):
 def check_deadlines():
     """
     Periodic task.
-    Searches for tasks whose deadline has passed,
-    but the notification has not yet been sent.
+    Claims tasks due for the 10-minute warning or past their deadline,
+    queues their notifications in the outbox and delivers them.
+
+    Each kind is claimed with one UPDATE ... RETURNING over the partial
+    deadline indexes: two queries per run however many tasks are due,
+    no read-modify-write of other columns, and a row claimed by a
+    concurrent run is never sent twice. Tasks of users without Telegram
+    are claimed too, so they leave the partial indexes instead of being
+    rescanned on every run, but nothing is queued for them. The outbox
+    rows are written in the same transaction, so a failed send is
+    retried (deliver_notifications) rather than lost.
     """
     now = timezone.now()
 
-    warning_limit = now + timedelta(minutes=10)
-
-    upcoming_tasks = Task.objects.filter(
-        deadline__gt=now,  # Deadline__gt = Greater Than
-        deadline__lte=warning_limit,
-        is_completed=False,
-        is_pre_notified=False,
-    ).select_related("user")
-
-    for task in upcoming_tasks:
-        user = task.user
-        if not user.telegram_id:
-            continue
-
-        minutes_left = int((task.deadline - now).total_seconds() / 60)
-
-        message_text = f"⏳ <b>Reminder!</b>\n\nTask: <b>{task.title}</b>\nDue in: <b>{minutes_left} min</b>"
+    with transaction.atomic():
+        warnings = Task.objects.due_for_warning(now, WARNING_LEAD).claim("is_pre_notified")
+        expired = Task.objects.due_for_deadline(now).claim("is_notified")
+        notifications = [
+            (task_id, Notification.Kind.WARNING, telegram_id, warning_text(title, deadline, now))
+            for task_id, title, deadline, telegram_id in warnings
+            if telegram_id is not None
+        ] + [
+            (task_id, Notification.Kind.DEADLINE, telegram_id, deadline_text(title, deadline))
+            for task_id, title, deadline, telegram_id in expired
+            if telegram_id is not None
+        ]
+        outbox.enqueue(notifications, now)
 
-        send_telegram_message(user.telegram_id, message_text)
+    sent = outbox.send(notifications, now)
 
-        task.is_pre_notified = True
-        task.save(update_fields=["is_pre_notified"])
+    return f"Checked deadlines. Notifications sent: {sent}"
 
-    expired_tasks = Task.objects.filter(
-        deadline__lte=now,  # deadline__lte = Less Than or Equal
-        is_completed=False,
-        is_notified=False,
-    ).select_related("user")
 
-    for task in expired_tasks:
-        user = task.user
-        if not user.telegram_id:
-            continue
-
-        message_text = (
-            f"🔥 <b>DEADLINE REACHED!</b>\n\nTask: <b>{task.title}</b>\nTime: {task.deadline.strftime('%H:%M')}"
-        )
-
-        send_telegram_message(user.telegram_id, message_text)
-
-        task.is_notified = True
-        task.save()
-
-    return f"Checked deadlines. Notifications sent: {len(expired_tasks)}"
+@shared_task
+def deliver_notifications():
+    """
+    Periodic task.
+    Retries outbox notifications whose earlier attempts failed, with exponential backoff.
+    """
+    return f"Delivered {outbox.deliver_due()} notifications."
 
 
 def send_telegram_message(chat_id, text):
-    """Raw request to the Telegram API"""
+    """Send one message over the pooled Bot API connection. Returns whether it was delivered."""
     if not settings.BOT_TOKEN:
         logger.warning("❌ BOT_TOKEN not found in settings")
-        return
+        return False
+    return get_sender().send(chat_id, text)
 
-    url = f"https://api.telegram.org/bot{settings.BOT_TOKEN}/sendMessage"
-    payload = {"chat_id": chat_id, "text": text, "parse_mode": "HTML"}
-    try:
-        requests.post(url, json=payload, timeout=5)
-    except Exception as e:
-        logger.error(f"❌ Failed to send notification: {e}")
+
+def send_telegram_messages(messages):
+    """Send (chat_id, text) pairs concurrently. Returns how many were delivered."""
+    if not settings.BOT_TOKEN:
+        logger.warning("❌ BOT_TOKEN not found in settings")
+        return 0
+    return get_sender().send_many(messages)
 
 
 @shared_task
@@ -123,23 +123,27 @@ def send_daily_morning_briefing():
     for task in tasks_today:
         user_tasks_map[task.user].append(task)
 
-    sent_count = 0
-
+    messages = []
     for user, tasks in user_tasks_map.items():
-        try:
-            if not user.telegram_id:
-                continue
-
-            task_list_str = "\n".join([f"• {t.title}" for t in tasks])
+        if not user.telegram_id:
+            continue
 
-            message_text = (
-                f"☀️ <b>Good Morning!</b>\n\nYou have {len(tasks)} tasks scheduled for today:\n\n{task_list_str}"
-            )
+        task_list_str = "\n".join([f"• {t.title}" for t in tasks])
 
-            send_telegram_message(user.telegram_id, message_text)
-            sent_count += 1
+        message_text = f"☀️ <b>Good Morning!</b>\n\nYou have {len(tasks)} tasks scheduled for today:\n\n{task_list_str}"
+        messages.append((user.telegram_id, message_text))
 
-        except Exception as e:
-            logger.error(f"Failed to send briefing to user {user.id}: {e}")
+    sent_count = send_telegram_messages(messages)
 
     return f"Sent morning briefing to {sent_count} users."
+
+
+@shared_task
+def purge_task_tombstones():
+    """
+    Daily cleanup of deleted-task markers older than TASK_TOMBSTONE_RETENTION_DAYS.
+    Changes feed cursors that old are answered with 410 Gone.
+    """
+    horizon = timezone.now() - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)
+    deleted, _ = TaskTombstone.objects.filter(change_id__lt=min_id_for(horizon)).delete()
+    return f"Purged {deleted} task tombstones."
@@ -1,5 +1,8 @@
+from django.conf import settings
+from django.urls import path
 from rest_framework.routers import DefaultRouter
 
+from apps.tasks.async_views import TaskDetailAsyncView, TaskListAsyncView
 from apps.tasks.views import CategoryViewSet, TaskViewSet
 
 router = DefaultRouter()
@@ -7,3 +10,22 @@ router.register(r"tasks", TaskViewSet, basename="task")
 router.register(r"categories", CategoryViewSet, basename="category")
 
 urlpatterns = router.urls
+
+if settings.ASYNC_API:
+    # Hot endpoints served natively under ASGI; everything else falls through to the router
+    urlpatterns = [
+        path(
+            "tasks/",
+            TaskListAsyncView.as_view(fallback=TaskViewSet.as_view({"get": "list", "post": "create"})),
+            name="task-list-async",
+        ),
+        path(
+            "tasks/<int:pk>/",
+            TaskDetailAsyncView.as_view(
+                fallback=TaskViewSet.as_view(
+                    {"get": "retrieve", "put": "update", "patch": "partial_update", "delete": "destroy"}
+                )
+            ),
+            name="task-detail-async",
+        ),
+    ] + urlpatterns
@@ -1,38 +1,342 @@
-from rest_framework import permissions, viewsets
+import hashlib
+import heapq
+from datetime import timedelta
+from itertools import islice
 
-from apps.tasks.models import Category, Task
-from apps.tasks.serializers import CategorySerializer, TaskSerializer
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework import permissions, serializers, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
+from apps.core.models import reserved_snowflake_ids
+from apps.core.pagination import SnowflakeCursorPagination
+from apps.core.serializers import requested_fields
+from apps.core.snowflake import max_id_for, min_id_for
+from apps.tasks.cache import cached_list, collection_state, invalidate_user_lists
+from apps.tasks.filters import TASK_FILTER_PARAMS, TIME_DEPENDENT_FILTER_PARAMS, TaskFilterBackend
+from apps.tasks.models import Category, Task, TaskTombstone
+from apps.tasks.notifier import deadline_events
+from apps.tasks.pagination import CategoryCursorPagination
+from apps.tasks.serializers import (
+    BULK_MAX_ITEMS,
+    CATEGORY_FIELDS,
+    CategorySerializer,
+    TaskBulkIdsSerializer,
+    TaskBulkUpdateSerializer,
+    TaskChangesSerializer,
+    TaskListSerializer,
+    TaskSearchSerializer,
+    TaskSerializer,
+    resolve_categories,
+)
+from apps.tasks.signals import bulk_task_deletes
 
-class CategoryViewSet(viewsets.ModelViewSet):
+
+def collection_validators(request, user_id: int) -> tuple[str, int | None] | None:
+    """
+    (ETag, Last-Modified unix time) for a GET on the user's tasks or categories.
+    Every write bumps the per-user version, so the ETag changes with any change
+    visible in any representation; the URL (fields, cursor, ...) is hashed in.
+    None when the version store is unavailable, or when a filter compares against
+    the current time (?overdue=), whose results change without any write.
+    """
+    if any(name in request.GET for name in TIME_DEPENDENT_FILTER_PARAMS):
+        return None
+    state = collection_state(user_id)
+    if state is None:
+        return None
+    version, modified = state
+    digest = hashlib.blake2b(f"{user_id}:{request.get_full_path()}".encode(), digest_size=8).hexdigest()
+    return f'"{version}-{digest}"', int(modified) if modified is not None else None
+
+
+def set_validators(response, etag: str, last_modified: int | None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ETag / Last-Modified on list and retrieve. Requests whose validators still match
+    get a 304 before any query or serialization happens.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional(request, super().retrieve, *args, **kwargs)
+
+    def conditional(self, request, handler, *args, **kwargs):
+        validators = collection_validators(request, request.user.id)
+        if validators is None:
+            return handler(request, *args, **kwargs)
+
+        etag, last_modified = validators
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return set_validators(not_modified, etag, last_modified)
+
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200:
+            set_validators(response, etag, last_modified)
+        return response
+
+
+class SparseFieldsetViewMixin:
+    def get_sparse_fields(self) -> list[str] | None:
+        """Output fields selected with `?fields=` / `?omit=`, or None for all of them."""
+        return requested_fields(self.request, self.get_serializer_class().readable_field_names())
+
+
+class CachedListMixin(SparseFieldsetViewMixin):
+    """
+    Serves the plain (unpaginated) list from the per-user list cache.
+    Paginated and filtered requests always hit the database.
+    """
+
+    cache_kind: str
+    filter_params: tuple[str, ...] = ()
+
+    def list(self, request, *args, **kwargs):
+        if self.paginator.is_requested(request) or any(name in request.query_params for name in self.filter_params):
+            return super().list(request, *args, **kwargs)
+
+        def build():
+            return list(self.get_serializer(self.get_list_queryset(), many=True).data)
+
+        kind = self.cache_kind
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kind = f"{kind}:{','.join(fields)}"
+
+        payload, hit = cached_list(request.user.id, kind, build)
+        return Response(payload, headers={"X-Cache": "HIT" if hit else "MISS"})
+
+    def get_list_queryset(self):
+        return self.filter_queryset(self.get_queryset())
+
+
+class CategoryViewSet(ConditionalGetMixin, CachedListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows users to view or edit their categories.
     """
 
     serializer_class = CategorySerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = CategoryCursorPagination
+    cache_kind = "categories"
 
     def get_queryset(self):
         """Return only categories belonging to the current user."""
-        return Category.objects.filter(user=self.request.user)
+        queryset = Category.objects.filter(user=self.request.user)
+        return CategorySerializer.only_fields(queryset, self.get_sparse_fields())
 
     def perform_create(self, serializer):
         """Associate the new category with the current user."""
         serializer.save(user=self.request.user)
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(ConditionalGetMixin, CachedListMixin, viewsets.ModelViewSet):
     """
     API endpoint that allows users to view or edit their tasks.
     """
 
     serializer_class = TaskSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = SnowflakeCursorPagination
+    filter_backends = [TaskFilterBackend]
+    filter_params = TASK_FILTER_PARAMS
+    cache_kind = "tasks"
 
     def get_queryset(self):
         """Return only tasks belonging to the current user."""
-        return Task.objects.filter(user=self.request.user)
+        queryset = Task.objects.filter(user=self.request.user)
+        if self.action == "list":
+            return TaskListSerializer.rows(queryset, self.get_sparse_fields())
+        return TaskSerializer.only_fields(queryset, self.get_sparse_fields())
+
+    def get_serializer_class(self):
+        if self.action in ("list", "changes", "search"):
+            return TaskListSerializer
+        return super().get_serializer_class()
 
     def perform_create(self, serializer):
         """Associate the new task with the current user."""
         serializer.save(user=self.request.user)
+
+    @action(detail=False, methods=["post", "patch", "delete"])
+    def bulk(self, request):
+        """
+        POST   [{task}, ...]                    -> create all (201, created tasks)
+        PATCH  {"ids": [...], "changes": {...}} -> one UPDATE  ({"updated": n})
+        DELETE {"ids": [...]}                   -> one DELETE  ({"deleted": n})
+
+        All-or-nothing and scoped to the current user; ids of other users' tasks are ignored.
+        """
+        handler = {"POST": self.bulk_create, "PATCH": self.bulk_update, "DELETE": self.bulk_destroy}
+        return handler[request.method](request)
+
+    def bulk_create(self, request):
+        rows = request.data
+        if not isinstance(rows, list) or not rows or not all(isinstance(row, dict) for row in rows):
+            raise serializers.ValidationError({"non_field_errors": ["Expected a non-empty list of tasks."]})
+        if len(rows) > BULK_MAX_ITEMS:
+            raise serializers.ValidationError(
+                {"non_field_errors": [f"Ensure this list has no more than {BULK_MAX_ITEMS} elements."]}
+            )
+
+        serializer = self.get_serializer(
+            data=[{k: v for k, v in row.items() if k not in CATEGORY_FIELDS} for row in rows], many=True
+        )
+        serializer.is_valid()
+        errors = list(serializer.errors) or [{} for _ in rows]
+
+        with transaction.atomic():
+            categories, category_errors = resolve_categories(request.user, rows)
+            errors = [{**row_errors, **extra} for row_errors, extra in zip(errors, category_errors, strict=True)]
+            if any(errors):
+                raise serializers.ValidationError(errors)
+
+            objs = [
+                Task(**{**data, "user": request.user, "category": None if category is ... else category})
+                for data, category in zip(serializer.validated_data, categories, strict=True)
+            ]
+            Task.objects.bulk_create(objs)
+
+        # bulk_create() and update() send no model signals
+        invalidate_user_lists(request.user.id)
+        deadline_events.publish_on_commit([obj.id for obj in objs])
+
+        return Response(TaskSerializer(objs, many=True).data, status=status.HTTP_201_CREATED)
+
+    def bulk_update(self, request):
+        params = TaskBulkUpdateSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        changes = params.validated_data["changes"]
+
+        serializer = self.get_serializer(
+            data={k: v for k, v in changes.items() if k not in CATEGORY_FIELDS}, partial=True
+        )
+        serializer.is_valid(raise_exception=True)
+        values = dict(serializer.validated_data)
+
+        with transaction.atomic():
+            (category,), (errors,) = resolve_categories(request.user, [changes])
+            if errors:
+                raise serializers.ValidationError(errors)
+            if category is not ...:
+                values["category"] = category
+            if not values:
+                raise serializers.ValidationError({"changes": ["No updatable fields given."]})
+
+            updated = Task.objects.filter(user=request.user, pk__in=params.validated_data["ids"]).touch(
+                **values, updated_at=timezone.now()
+            )
+
+        invalidate_user_lists(request.user.id)
+        if {"deadline", "is_completed"} & values.keys():
+            deadline_events.publish_on_commit(params.validated_data["ids"])
+
+        return Response({"updated": updated})
+
+    def bulk_destroy(self, request):
+        params = TaskBulkIdsSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+
+        # One tombstone INSERT, invalidation and event for the batch instead of the per-row signal work
+        with transaction.atomic(), bulk_task_deletes():
+            ids = list(
+                Task.objects.filter(user=request.user, pk__in=params.validated_data["ids"])
+                .select_for_update()
+                .values_list("id", flat=True)
+            )
+            if not ids:
+                return Response({"deleted": 0})
+            tombstones = [TaskTombstone(task_id=task_id, user_id=request.user.id) for task_id in ids]
+            with reserved_snowflake_ids(len(ids)):
+                TaskTombstone.objects.bulk_create(tombstones, ignore_conflicts=True)
+            _, deleted = Task.objects.filter(pk__in=ids).delete()
+
+        invalidate_user_lists(request.user.id)
+        deadline_events.publish_on_commit(ids)
+
+        # Tasks only: the total would also count cascaded rows (outbox notifications)
+        return Response({"deleted": deleted.get(Task._meta.label, 0)})
+
+    @action(detail=False, methods=["get"])
+    def search(self, request):
+        """
+        `?q=` over titles and descriptions, best match first, at most `?limit=` tasks.
+        Combines with the list filters and `?fields=` / `?omit=`. See TaskQuerySet.search().
+        """
+        params = TaskSearchSerializer(data=request.query_params.dict())
+        params.is_valid(raise_exception=True)
+
+        queryset = self.filter_queryset(Task.objects.filter(user=request.user).search(params.validated_data["q"]))
+        rows = TaskListSerializer.rows(queryset, self.get_sparse_fields())[: params.validated_data["limit"]]
+        return Response(self.get_serializer(rows, many=True).data)
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request):
+        """
+        Changes feed: tasks created or updated and ids of tasks deleted after `?since=<cursor>`,
+        in change order, at most `?limit=` entries. Without `since` the feed starts from the beginning.
+        Keep requesting with the returned cursor while `has_more` is true.
+
+        Writes younger than TASK_CHANGES_SETTLE_MS are held back, so transactions still
+        in flight when the page is read cannot be skipped. A cursor older than the
+        tombstone retention gets 410 Gone: the client must drop its replica and resync.
+        """
+        params = TaskChangesSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        change_id, pk, issued = params.validated_data.get("since", (0, 0, 0))
+        limit = params.validated_data["limit"]
+
+        now = timezone.now()
+        if issued and issued < min_id_for(now - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS)):
+            return Response(
+                {"detail": "Cursor expired, deleted tasks may be missing. Resync from scratch."},
+                status=status.HTTP_410_GONE,
+            )
+        bound = max_id_for(now - timedelta(milliseconds=settings.TASK_CHANGES_SETTLE_MS))
+
+        tasks = TaskListSerializer.rows(
+            Task.objects.filter(user=request.user, change_id__lte=bound).changed_after(change_id, pk),
+            self.get_sparse_fields(),
+        ).annotate(feed_change_id=F("change_id"))
+        tombstones = (
+            TaskTombstone.objects.filter(user=request.user, change_id__lte=bound)
+            .changed_after(change_id, pk)
+            .values_list("change_id", "task_id")
+        )
+
+        entries = heapq.merge(
+            ((row["feed_change_id"], row["id"], row) for row in tasks[: limit + 1]),
+            ((tombstone_change_id, task_id, None) for tombstone_change_id, task_id in tombstones[: limit + 1]),
+            key=lambda entry: entry[:2],
+        )
+        page = list(islice(entries, limit + 1))
+        has_more = len(page) > limit
+        page = page[:limit]
+
+        position = page[-1][:2] if page else (change_id, pk)
+        if not has_more:
+            # Everything up to the bound has been served
+            position = max(position, (bound, 0))
+
+        return Response(
+            {
+                "changes": self.get_serializer([row for _, _, row in page if row is not None], many=True).data,
+                "deleted": [task_id for _, task_id, row in page if row is None],
+                "cursor": f"{position[0]}.{position[1]}.{bound}",
+                "has_more": has_more,
+            }
+        )
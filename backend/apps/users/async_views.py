@@ -0,0 +1,33 @@
+from asgiref.sync import sync_to_async
+from rest_framework import serializers, status
+
+from apps.core.async_views import AsyncAPIView
+
+from .serializers import TelegramAuthSerializer, login_telegram_user
+
+
+class TelegramAuthAsyncView(AsyncAPIView):
+    """
+    Async Login or Register via Telegram ID.
+    """
+
+    requires_auth = False
+
+    async def post(self, request):
+        data = self.parse_body(request)
+        if data is None:
+            return await self.delegate(request)
+
+        try:
+            attrs = TelegramAuthSerializer().to_internal_value(data)
+        except serializers.ValidationError as e:
+            return self.render(e.detail, status.HTTP_400_BAD_REQUEST)
+
+        # One thread hop for the whole login (cache lookup, or the registering transaction)
+        user_id, key = await sync_to_async(login_telegram_user)(attrs)
+        return self.render(
+            {
+                "token": key,
+                "user_id": str(user_id),  # Snowflake string
+            }
+        )
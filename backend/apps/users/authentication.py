@@ -0,0 +1,187 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.authtoken.models import Token
+
+from apps.core.cache import CACHE_ERRORS
+
+logger = logging.getLogger(__name__)
+
+
+def minimal_user(user_id: int, is_active: bool):
+    """
+    A user with only `id` and `is_active` loaded, as authentication needs them.
+    Any other field is fetched on first access: views that read the profile load it
+    in one query with `load_profile()`.
+    """
+    User = get_user_model()
+    loaded = {"id": user_id, "is_active": is_active}
+    # from_db() expects the values in concrete field order
+    names = [f.attname for f in User._meta.concrete_fields if f.attname in loaded]
+    return User.from_db(None, names, [loaded[name] for name in names])
+
+
+def load_profile(user, *fields: str):
+    """Fetch the deferred `fields` of `user` (all of them by default) in one query."""
+    deferred = user.get_deferred_fields()
+    if fields:
+        deferred &= set(fields)
+    if deferred:
+        user.refresh_from_db(fields=deferred)
+    return user
+
+
+class TokenCache:
+    """
+    Two-tier cache of authenticated tokens:
+
+    - process-local LRU with a short TTL: no network round trip at all;
+    - shared Django cache (Redis) with a longer TTL, evicted explicitly by signals.
+
+    Entries hold only `(user_id, is_active)` under the token key: no password hash or
+    permission data leaves the database. Hits come back as a Token whose user has every
+    other field deferred (see `minimal_user`).
+
+    Evictions reach the shared tier and the local tier of the evicting process only,
+    so other processes may keep accepting a revoked token for at most `local_ttl` seconds.
+    """
+
+    KEY_PREFIX = "auth:token:"
+
+    def __init__(self, maxsize: int = 10_000, local_ttl: float = 10, shared_ttl: int = 300):
+        self.maxsize = maxsize
+        self.local_ttl = local_ttl
+        self.shared_ttl = shared_ttl
+        self.clock = time.monotonic
+        self._local: OrderedDict[str, tuple[float, tuple[int, bool]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _shared_key(self, key: str) -> str:
+        # Never store raw credentials as Redis key names
+        return self.KEY_PREFIX + hashlib.sha256(key.encode()).hexdigest()
+
+    @staticmethod
+    def _token(key: str, entry: tuple[int, bool]) -> Token:
+        # A new Token and user per hit, so per-request mutations never leak between requests
+        return Token(key=key, user=minimal_user(*entry))
+
+    def get_local(self, key: str) -> Token | None:
+        with self._lock:
+            item = self._local.get(key)
+            if item is None:
+                return None
+            expires_at, entry = item
+            if expires_at <= self.clock():
+                del self._local[key]
+                return None
+            self._local.move_to_end(key)
+        return self._token(key, entry)
+
+    def _set_local(self, key: str, entry: tuple[int, bool]) -> None:
+        with self._lock:
+            self._local[key] = (self.clock() + self.local_ttl, entry)
+            self._local.move_to_end(key)
+            while len(self._local) > self.maxsize:
+                self._local.popitem(last=False)
+
+    def get(self, key: str) -> Token | None:
+        token = self.get_local(key)
+        if token is not None:
+            return token
+        try:
+            entry = cache.get(self._shared_key(key))
+        except CACHE_ERRORS as e:
+            logger.warning(f"Token cache unavailable, authenticating against the database: {e}")
+            return None
+        if entry is None:
+            return None
+        self._set_local(key, entry)
+        return self._token(key, entry)
+
+    def set(self, key: str, token: Token) -> None:
+        entry = (token.user_id, token.user.is_active)
+        self._set_local(key, entry)
+        try:
+            cache.set(self._shared_key(key), entry, timeout=self.shared_ttl)
+        except CACHE_ERRORS as e:
+            logger.warning(f"Failed to cache token: {e}")
+
+    def evict(self, key: str) -> None:
+        with self._lock:
+            self._local.pop(key, None)
+        try:
+            cache.delete(self._shared_key(key))
+        except CACHE_ERRORS as e:
+            logger.warning(f"Failed to evict cached token: {e}")
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+
+token_cache = TokenCache(
+    maxsize=getattr(settings, "AUTH_TOKEN_CACHE_SIZE", 10_000),
+    local_ttl=getattr(settings, "AUTH_TOKEN_CACHE_LOCAL_TTL", 10),
+    shared_ttl=getattr(settings, "AUTH_TOKEN_CACHE_SHARED_TTL", 300),
+)
+
+
+class TelegramLoginCache:
+    """
+    telegram_id -> (user_id, token key) of users who logged in before, in the shared
+    Django cache, so a returning /start costs no query. Evicted by signals when the
+    token or the user goes away.
+    """
+
+    KEY_PREFIX = "auth:telegram:"
+
+    def __init__(self, ttl: int = 3600):
+        self.ttl = ttl
+
+    def get(self, telegram_id: int) -> tuple[int, str] | None:
+        try:
+            return cache.get(f"{self.KEY_PREFIX}{telegram_id}")
+        except CACHE_ERRORS as e:
+            logger.warning(f"Telegram login cache unavailable, logging in against the database: {e}")
+            return None
+
+    def set(self, telegram_id: int, user_id: int, key: str) -> None:
+        try:
+            cache.set(f"{self.KEY_PREFIX}{telegram_id}", (user_id, key), timeout=self.ttl)
+        except CACHE_ERRORS as e:
+            logger.warning(f"Failed to cache Telegram login: {e}")
+
+    def evict(self, telegram_id: int) -> None:
+        try:
+            cache.delete(f"{self.KEY_PREFIX}{telegram_id}")
+        except CACHE_ERRORS as e:
+            logger.warning(f"Failed to evict cached Telegram login: {e}")
+
+
+telegram_login_cache = TelegramLoginCache(ttl=getattr(settings, "AUTH_TELEGRAM_LOGIN_CACHE_TTL", 3600))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Drop-in replacement for DRF's TokenAuthentication that skips the
+    Token+User query on repeat requests (see TokenCache).
+    """
+
+    def authenticate_credentials(self, key):
+        token = token_cache.get(key)
+        if token is None:
+            user, token = super().authenticate_credentials(key)
+            token_cache.set(key, token)
+        elif not token.user.is_active:
+            # Deactivation evicts the entry; this only guards against a stale copy
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        return (token.user, token)
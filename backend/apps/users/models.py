@@ -1,8 +1,34 @@
 from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import UserManager as DjangoUserManager
 from django.db import models
+from django.dispatch import Signal
 
 from apps.core.models import SnowflakeModel
 
+# Sent with `user_ids` when is_active changes without post_save (queryset update / bulk_update)
+active_updated = Signal()
+
+
+class UserQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        if "is_active" not in kwargs:
+            return super().update(**kwargs)
+        user_ids = list(self.values_list("pk", flat=True))
+        updated = super().update(**kwargs)
+        active_updated.send(sender=self.model, user_ids=user_ids)
+        return updated
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        updated = super().bulk_update(objs, fields, *args, **kwargs)
+        if "is_active" in fields:
+            active_updated.send(sender=self.model, user_ids=[obj.pk for obj in objs])
+        return updated
+
+
+class UserManager(DjangoUserManager.from_queryset(UserQuerySet)):
+    pass
+
 
 class User(AbstractUser, SnowflakeModel):
     """Custom user with Snowflake ID"""
@@ -16,6 +42,8 @@ class User(AbstractUser, SnowflakeModel):
     language = models.CharField("Language", max_length=10, choices=LANGUAGE_CHOICES, default="en")
     timezone = models.CharField("Timezone", max_length=50, default="UTC")
 
+    objects = UserManager()
+
     class Meta:
         verbose_name = "User"
         verbose_name_plural = "Users"
@@ -1,5 +1,9 @@
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from rest_framework.authtoken.models import Token
+
+from apps.users.authentication import telegram_login_cache
 
 User = get_user_model()
 
@@ -11,27 +15,69 @@ class TelegramAuthSerializer(serializers.Serializer):
     language_code = serializers.CharField(required=False)
 
     def validate(self, attrs):
-        telegram_id = attrs.get("telegram_id")
-        incoming_lang = attrs.get("language_code", "en")
-
-        if incoming_lang in ["ru", "be", "uk", "kz"]:
-            final_lang = "ru"
-        else:
-            final_lang = "en"
-
-        user, created = User.objects.get_or_create(
-            telegram_id=telegram_id,
-            defaults={
-                "username": attrs.get("username") or f"tg_{telegram_id}",
-                "first_name": attrs.get("first_name", ""),
-                "language": final_lang,
-                "timezone": "UTC",
-            },
-        )
-        attrs["user"] = user
+        attrs["user_id"], attrs["token"] = login_telegram_user(attrs)
         return attrs
 
 
+def login_telegram_user(attrs) -> tuple[int, str]:
+    """
+    (user id, token key) for a Telegram login, registering the user on first sight.
+
+    Returning users cost one cache lookup, or one query on a miss.
+    A first login inserts the user and the token in one transaction. When concurrent
+    first logins for the same telegram_id race, the losers hit the unique constraint
+    and read the winner's rows, so every request gets the same token.
+    """
+    telegram_id = attrs["telegram_id"]
+    login = telegram_login_cache.get(telegram_id)
+    if login is not None:
+        return login
+
+    login = _existing_login(telegram_id)
+    if login is None:
+        try:
+            with transaction.atomic():
+                user = User.objects.create(telegram_id=telegram_id, **telegram_user_defaults(attrs))
+                token = Token.objects.create(user=user)
+            login = (user.id, token.key)
+        except IntegrityError:
+            login = _existing_login(telegram_id)
+            if login is None:
+                # Not a telegram_id race (e.g. the username is taken)
+                raise
+
+    telegram_login_cache.set(telegram_id, *login)
+    return login
+
+
+def _existing_login(telegram_id: int) -> tuple[int, str] | None:
+    row = User.objects.filter(telegram_id=telegram_id).values_list("id", "auth_token__key").first()
+    if row is None:
+        return None
+    user_id, key = row
+    if key is None:
+        key = Token.objects.get_or_create(user_id=user_id)[0].key
+    return user_id, key
+
+
+def telegram_user_defaults(attrs) -> dict:
+    """Field values for a user registering via Telegram."""
+    telegram_id = attrs.get("telegram_id")
+    incoming_lang = attrs.get("language_code", "en")
+
+    if incoming_lang in ["ru", "be", "uk", "kz"]:
+        final_lang = "ru"
+    else:
+        final_lang = "en"
+
+    return {
+        "username": attrs.get("username") or f"tg_{telegram_id}",
+        "first_name": attrs.get("first_name", ""),
+        "language": final_lang,
+        "timezone": "UTC",
+    }
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -0,0 +1,61 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from apps.users.authentication import telegram_login_cache, token_cache
+from apps.users.models import active_updated
+
+User = get_user_model()
+
+
+def _evict(key: str) -> None:
+    token_cache.evict(key)
+    # Again after commit, in case a request re-cached the old row in between
+    transaction.on_commit(lambda: token_cache.evict(key))
+
+
+def _evict_login(telegram_id: int | None) -> None:
+    if telegram_id is None:
+        return
+    telegram_login_cache.evict(telegram_id)
+    transaction.on_commit(lambda: telegram_login_cache.evict(telegram_id))
+
+
+@receiver(post_delete, sender=Token)
+def token_deleted(sender, instance, **kwargs):
+    _evict(instance.key)
+    _evict_login(User.objects.filter(pk=instance.user_id).values_list("telegram_id", flat=True).first())
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    _evict_login(instance.telegram_id)
+
+
+@receiver(pre_save, sender=User)
+def user_saving(sender, instance, update_fields=None, **kwargs):
+    """A telegram_id moved off this user must stop logging in as it."""
+    if instance._state.adding or (update_fields is not None and "telegram_id" not in update_fields):
+        return
+    previous = User.objects.filter(pk=instance.pk).values_list("telegram_id", flat=True).first()
+    if previous != instance.telegram_id:
+        _evict_login(previous)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, created=False, **kwargs):
+    """Profile updates and deactivation must not be masked by a cached copy of the user."""
+    if created:
+        return
+    for key in Token.objects.filter(user_id=instance.pk).values_list("key", flat=True):
+        _evict(key)
+    _evict_login(instance.telegram_id)
+
+
+@receiver(active_updated)
+def users_active_updated(sender, user_ids, **kwargs):
+    """Deactivation through a queryset sends no post_save: evict those users' cached tokens too."""
+    for key in Token.objects.filter(user_id__in=user_ids).values_list("key", flat=True):
+        _evict(key)
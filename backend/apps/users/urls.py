@@ -1,12 +1,22 @@
+from django.conf import settings
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import TelegramAuthView, UserViewSet
+from .async_views import TelegramAuthAsyncView
+from .views import BootstrapView, MeView, TaskSummaryView, TelegramAuthView, UserViewSet
 
 router = DefaultRouter()
 router.register(r"profile", UserViewSet, basename="user_profile")
 
+if settings.ASYNC_API:
+    telegram_auth_view = TelegramAuthAsyncView.as_view(fallback=TelegramAuthView.as_view())
+else:
+    telegram_auth_view = TelegramAuthView.as_view()
+
 urlpatterns = [
-    path("auth/telegram/", TelegramAuthView.as_view(), name="telegram_auth"),
+    path("auth/telegram/", telegram_auth_view, name="telegram_auth"),
+    path("me/", MeView.as_view(), name="user_me"),
+    path("me/bootstrap/", BootstrapView.as_view(), name="user_bootstrap"),
+    path("me/summary/", TaskSummaryView.as_view(), name="user_task_summary"),
     path("", include(router.urls)),
 ]
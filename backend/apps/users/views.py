@@ -1,9 +1,21 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
 from django.contrib.auth import get_user_model
-from rest_framework import permissions, viewsets
-from rest_framework.authtoken.models import Token
+from django.db.models import Count, Q
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions, generics, permissions, viewsets
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from apps.core.pagination import SnowflakeCursorPagination
+from apps.tasks.cache import cached_list
+from apps.tasks.models import Category, Task
+from apps.tasks.serializers import CategorySerializer, TaskListSerializer
+
+from .authentication import load_profile
 from .serializers import TelegramAuthSerializer, UserProfileSerializer
 
 User = get_user_model()
@@ -19,12 +31,10 @@ class TelegramAuthView(APIView):
     def post(self, request):
         serializer = TelegramAuthSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        user = serializer.validated_data["user"]
-        token, _ = Token.objects.get_or_create(user=user)
         return Response(
             {
-                "token": token.key,
-                "user_id": str(user.id),  # Snowflake string
+                "token": serializer.validated_data["token"],
+                "user_id": str(serializer.validated_data["user_id"]),  # Snowflake string
             }
         )
 
@@ -42,3 +52,95 @@ class UserViewSet(viewsets.ModelViewSet):
 
     def get_object(self):
         return super().get_object()
+
+
+class MeView(generics.RetrieveUpdateAPIView):
+    """
+    The current user's profile as a single resource (GET / PATCH).
+    """
+
+    serializer_class = UserProfileSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_object(self):
+        # request.user may come from the token cache, up to AUTH_TOKEN_CACHE_LOCAL_TTL old:
+        # saving it back would overwrite newer changes to the whole row, and the cached
+        # copy may still be active after a deactivation
+        user = User.objects.filter(pk=self.request.user.pk).first()
+        if user is None or not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        return user
+
+
+def local_day_bounds(user, now):
+    """Start and end (exclusive) of the user's current calendar day, UTC fallback for unknown zones."""
+    try:
+        tz = ZoneInfo(user.timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        tz = ZoneInfo("UTC")
+    start = datetime.combine(now.astimezone(tz).date(), time.min, tzinfo=tz)
+    return start, start + timedelta(days=1)
+
+
+def task_summary(user, now) -> dict:
+    """Counts of the user's open, overdue and due-today (in their timezone) tasks, in one query."""
+    day_start, day_end = local_day_bounds(user, now)
+    return Task.objects.filter(user=user, is_completed=False).aggregate(
+        open=Count("id"),
+        overdue=Count("id", filter=Q(deadline__lt=now)),
+        due_today=Count("id", filter=Q(deadline__gte=day_start, deadline__lt=day_end)),
+    )
+
+
+class TaskSummaryView(APIView):
+    """
+    Just the open-task counts of the bootstrap payload, for clients that
+    refresh them often (the bot's main menu).
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        return Response(task_summary(load_profile(request.user, "timezone"), timezone.now()))
+
+
+class BootstrapView(APIView):
+    """
+    Everything a client session starts with, in one response:
+    profile, categories, open-task counts and the first page of tasks
+    (continue with `tasks.next` on /tasks/).
+
+    Categories come from the per-user list cache; the counts and the page
+    are one query each.
+    """
+
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        # A cached token carries only the user's id and is_active
+        user = load_profile(request.user)
+
+        def build_categories():
+            return list(CategorySerializer(Category.objects.filter(user=user), many=True).data)
+
+        # Same cache entry as the plain /categories/ list
+        categories, _ = cached_list(user.id, "categories", build_categories)
+
+        paginator = SnowflakeCursorPagination()
+        rows = paginator.first_page(
+            TaskListSerializer.rows(Task.objects.filter(user=user)),
+            request,
+            request.build_absolute_uri(reverse("task-list")),
+        )
+
+        return Response(
+            {
+                "profile": UserProfileSerializer(user).data,
+                "categories": categories,
+                "summary": task_summary(user, timezone.now()),
+                "tasks": {
+                    "next": paginator.get_next_link(),
+                    "results": TaskListSerializer(rows, many=True).data,
+                },
+            }
+        )
@@ -0,0 +1,100 @@
+"""
+Load test of the Telegram login endpoint during a sign-up burst, against a running backend.
+
+    gunicorn --chdir backend -w 4 config.wsgi:application
+    python -m benchmarks.bench_auth_burst --users 500 --taps 3 --concurrency 100
+
+Phase "sign-up": every new telegram_id logs in `--taps` times at once (users
+hammering /start), all ids interleaved. Phase "returning": the same ids log in again.
+
+Reports requests/sec, p50/p99 latency and errors per phase, and checks that each
+telegram_id ended up with exactly one user and one token.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from collections import defaultdict
+
+import aiohttp
+
+
+async def run_phase(url: str, telegram_ids: list[int], concurrency: int) -> tuple[dict, dict[int, set]]:
+    latencies: list[float] = []
+    errors = 0
+    logins: dict[int, set] = defaultdict(set)
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for telegram_id in telegram_ids:
+        queue.put_nowait(telegram_id)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=60)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+
+        async def client():
+            nonlocal errors
+            while not queue.empty():
+                telegram_id = queue.get_nowait()
+                payload = {"telegram_id": telegram_id, "username": f"burst_{telegram_id}", "first_name": "Burst"}
+                start = time.perf_counter()
+                try:
+                    async with session.post(url, json=payload) as resp:
+                        if resp.status != 200:
+                            await resp.read()
+                            errors += 1
+                            continue
+                        data = await resp.json()
+                except (TimeoutError, aiohttp.ClientError):
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+                logins[telegram_id].add((data["user_id"], data["token"]))
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    result = {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0,
+        "errors": errors,
+    }
+    return result, logins
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000/api/v1/users/auth/telegram/")
+    parser.add_argument("--users", type=int, default=500, help="new telegram ids in the burst")
+    parser.add_argument("--taps", type=int, default=3, help="simultaneous logins per new id")
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    # Fresh ids on every run, far away from real Telegram ids
+    base = random.randrange(10**15, 10**16)
+    telegram_ids = [base + i for i in range(args.users)]
+    burst = [telegram_id for telegram_id in telegram_ids for _ in range(args.taps)]
+    random.shuffle(burst)
+
+    phases = [("sign-up", burst), ("returning", telegram_ids * args.taps)]
+    seen: dict[int, set] = defaultdict(set)
+    for name, requests in phases:
+        result, logins = await run_phase(args.url, requests, args.concurrency)
+        for telegram_id, pairs in logins.items():
+            seen[telegram_id] |= pairs
+        print(
+            f"{name:<10} {len(requests):6} requests  {result['rps']:8.1f} req/s  p50 {result['p50']:7.1f} ms  "
+            f"p99 {result['p99']:7.1f} ms  errors {result['errors']}"
+        )
+
+    split = sum(len(pairs) > 1 for pairs in seen.values())
+    print(f"telegram ids with more than one (user, token): {split} of {len(seen)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+"""
+Per-request latency of GET /api/v1/tasks/ with and without persistent DB connections.
+
+Only meaningful against PostgreSQL (sqlite test databases live in memory and are never closed).
+
+Usage (from backend/, runs against a throwaway test database):
+    python -m benchmarks.bench_connections --requests 500
+"""
+
+import argparse
+
+from benchmarks.utils import scratch_database, seed_tasks, setup_django, timed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from rest_framework.authtoken.models import Token
+    from rest_framework.test import APIClient
+
+    with scratch_database() as connection:
+        (user,) = seed_tasks(1, 20)
+        token = Token.objects.create(user=user)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        for max_age in (0, 60):
+            connection.settings_dict["CONN_MAX_AGE"] = max_age
+            connection.close()
+            median = timed(lambda: client.get("/api/v1/tasks/"), repeat=args.requests)
+            print(f"CONN_MAX_AGE={max_age:<3} median {median:.2f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
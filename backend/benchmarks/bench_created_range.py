@@ -0,0 +1,65 @@
+"""
+created_at range vs Snowflake primary-key range, and the insert cost of the created_at index.
+
+Usage (from backend/, runs against a throwaway test database):
+    python -m benchmarks.bench_created_range --tasks 200000
+"""
+
+import argparse
+import time
+from datetime import timedelta
+
+from benchmarks.utils import scratch_database, seed_tasks, setup_django, timed
+
+
+def insert_rate(user, rows: int) -> float:
+    from apps.tasks.models import Task
+
+    started = time.perf_counter()
+    Task.objects.bulk_create((Task(title="insert", user=user) for _ in range(rows)), batch_size=1000)
+    return rows / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--inserts", type=int, default=50_000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from apps.tasks.models import Task
+    from django.db import models
+    from django.utils import timezone
+
+    with scratch_database() as connection:
+        (user,) = seed_tasks(1, args.tasks)
+
+        end = timezone.now()
+        start = end - timedelta(seconds=1)
+        by_column = Task.objects.filter(created_at__range=(start, end))
+        by_pk = Task.objects.created_between(start, end)
+
+        index = models.Index(fields=["created_at"], name="bench_created_at_idx")
+        with connection.schema_editor() as editor:
+            editor.add_index(Task, index)
+
+        print("== created_at__range (with created_at index)")
+        print(by_column.explain())
+        print(f"median {timed(lambda: list(by_column)):.2f} ms")
+        with_index = insert_rate(user, args.inserts)
+
+        with connection.schema_editor() as editor:
+            editor.remove_index(Task, index)
+
+        print("\n== created_between (primary key range)")
+        print(by_pk.explain())
+        print(f"median {timed(lambda: list(by_pk)):.2f} ms")
+        without_index = insert_rate(user, args.inserts)
+
+        print(f"\ninserts/s with created_at index:    {with_index:,.0f}")
+        print(f"inserts/s without created_at index: {without_index:,.0f}")
+
+
+if __name__ == "__main__":
+    main()
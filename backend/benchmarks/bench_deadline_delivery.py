@@ -0,0 +1,102 @@
+"""
+Reminder delivery lag and database load: the 10-second check_deadlines poller vs. the
+timer-based deadline notifier, replayed over the same tasks on a virtual clock.
+
+Usage (from backend/, runs against a throwaway test database):
+    python -m benchmarks.bench_deadline_delivery --tasks 500 --minutes 60
+
+Lag is measured from the moment a message is due (deadline - 10 min for the warning,
+the deadline itself otherwise) to the virtual time it was sent. It excludes send and
+scheduling overhead, which the notifier logs at every reconciliation in production.
+"""
+
+import argparse
+import random
+import statistics
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+from benchmarks.utils import scratch_database, setup_django
+
+
+def summarize(name: str, lags: list[float], queries: int, minutes: int) -> None:
+    lags.sort()
+    p99 = lags[int(len(lags) * 0.99) - 1] if lags else 0.0
+    print(
+        f"{name:<9} sent {len(lags):5}  lag p50 {statistics.median(lags) if lags else 0:6.2f} s  "
+        f"p99 {p99:6.2f} s  max {max(lags, default=0):6.2f} s  "
+        f"queries {queries:6} ({queries * 24 * 60 / minutes:8.0f}/day at this rate)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=500)
+    parser.add_argument("--minutes", type=int, default=60)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from apps.tasks import outbox
+    from apps.tasks.models import Notification, Task
+    from apps.tasks.notifier import DeadlineNotifier
+    from apps.tasks.sender import DELIVERED
+    from apps.tasks.tasks import WARNING_LEAD, check_deadlines
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.utils import timezone
+
+    with scratch_database():
+        user = get_user_model().objects.create(username="bench", telegram_id=10_000_000)
+        start = timezone.now().replace(microsecond=0)
+        window = args.minutes * 60
+        rng = random.Random(42)
+        # Deadlines spread over the window, each warning due after the start
+        offsets = [WARNING_LEAD + timedelta(seconds=rng.uniform(0, window - 600)) for _ in range(args.tasks)]
+        Task.objects.bulk_create(
+            Task(title=f"Task {n}", user=user, deadline=start + offset) for n, offset in enumerate(offsets)
+        )
+        deadlines = dict(Task.objects.values_list("title", "deadline"))
+        end = start + timedelta(seconds=window)
+
+        clock = {"now": start}
+        lags: list[float] = []
+
+        def record(chat_id, text):
+            title = text.split("Task: <b>", 1)[1].split("</b>", 1)[0]
+            due = deadlines[title] - (WARNING_LEAD if "Reminder" in text else timedelta())
+            lags.append((clock["now"] - due).total_seconds())
+
+        def deliver_many(batch):
+            return [record(*message) or DELIVERED for message in batch]
+
+        with (
+            mock.patch("django.utils.timezone.now", lambda: clock["now"]),
+            mock.patch.object(outbox, "get_sender", lambda: SimpleNamespace(deliver_many=deliver_many)),
+            CaptureQueriesContext(connection) as ctx,
+        ):
+            while clock["now"] < end:
+                check_deadlines()
+                clock["now"] += timedelta(seconds=10)
+        summarize("poller", lags, len(ctx), args.minutes)
+
+        Task.objects.update(is_pre_notified=False, is_notified=False)
+        Notification.objects.all().delete()
+        lags.clear()
+        clock["now"] = start
+        notifier = DeadlineNotifier(deliver_many=deliver_many)
+
+        with CaptureQueriesContext(connection) as ctx:
+            notifier.reconcile(start)
+            while clock["now"] < end:
+                clock["now"] = min(notifier.next_wakeup(), end)
+                if clock["now"] >= notifier.next_reconcile:
+                    notifier.reconcile(clock["now"])
+                notifier.fire_due(clock["now"])
+        summarize("notifier", lags, len(ctx), args.minutes)
+
+
+if __name__ == "__main__":
+    main()
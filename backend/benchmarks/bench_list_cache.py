@@ -0,0 +1,44 @@
+"""
+GET /api/v1/tasks/ latency with a cold (invalidated) vs. warm per-user list cache.
+
+Uses whatever CACHES is configured (set CACHE_REDIS_URL to measure Redis).
+
+Usage (from backend/, runs against a throwaway test database):
+    python -m benchmarks.bench_list_cache --tasks 200 --requests 300
+"""
+
+import argparse
+
+from benchmarks.utils import scratch_database, seed_tasks, setup_django, timed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from apps.tasks import cache as list_cache
+    from rest_framework.test import APIClient
+
+    with scratch_database():
+        (user,) = seed_tasks(1, args.tasks)
+        client = APIClient()
+        client.force_authenticate(user=user)
+
+        def cold():
+            list_cache.invalidate_user_lists(user.id)
+            client.get("/api/v1/tasks/")
+
+        list_cache.reset_stats()
+        miss = timed(cold, repeat=args.requests)
+        hit = timed(lambda: client.get("/api/v1/tasks/"), repeat=args.requests)
+
+        print(f"{args.tasks} tasks: miss {miss:.2f} ms/request, hit {hit:.2f} ms/request")
+        print(f"cache stats: {list_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
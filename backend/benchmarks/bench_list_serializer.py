@@ -0,0 +1,54 @@
+"""
+Task list serialization throughput: TaskSerializer vs. TaskListSerializer.
+
+Times fetch + serialize for one user's list with half the tasks in a category:
+- TaskSerializer on the plain queryset (previous list path, N+1 on category)
+- TaskSerializer with select_related("category")
+- TaskListSerializer on values() rows with the category name joined in SQL
+
+Usage (from backend/, runs against a throwaway test database):
+    python -m benchmarks.bench_list_serializer --sizes 1000 10000
+"""
+
+import argparse
+
+from benchmarks.utils import scratch_database, setup_django, timed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from apps.tasks.models import Category, Task
+    from apps.tasks.serializers import TaskListSerializer, TaskSerializer
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+
+    with scratch_database():
+        for size in args.sizes:
+            user = User.objects.create(username=f"bench_{size}", telegram_id=size)
+            category = Category.objects.create(name="Work", user=user)
+            Task.objects.bulk_create(
+                (Task(title=f"Task {n}", user=user, category=category if n % 2 else None) for n in range(size)),
+                batch_size=5000,
+            )
+            queryset = Task.objects.filter(user=user)
+
+            variants = {
+                "TaskSerializer (N+1)": (TaskSerializer, queryset.all),
+                "TaskSerializer + select_related": (TaskSerializer, lambda qs=queryset: qs.select_related("category")),
+                "TaskListSerializer (values)": (TaskListSerializer, lambda qs=queryset: TaskListSerializer.rows(qs)),
+            }
+            for name, (serializer_class, rows) in variants.items():
+                median = timed(lambda s=serializer_class, r=rows: s(r(), many=True).data, repeat=args.repeat)
+                print(f"{size:>6} tasks  {name:<32} {median:9.1f} ms  {size / median * 1000:>10,.0f} rows/s")
+            print()
+
+
+if __name__ == "__main__":
+    main()
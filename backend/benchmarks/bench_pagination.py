@@ -0,0 +1,58 @@
+"""
+Deep-page latency: Snowflake cursor pagination vs LIMIT/OFFSET.
+
+Usage (from backend/, runs against a throwaway test database):
+    python -m benchmarks.bench_pagination --tasks 200000 --page-size 50
+"""
+
+import argparse
+
+from benchmarks.utils import scratch_database, seed_tasks, setup_django, timed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from apps.core.pagination import SnowflakeCursorPagination
+    from apps.tasks.models import Task
+    from rest_framework.pagination import Cursor, LimitOffsetPagination
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+
+    factory = APIRequestFactory()
+
+    with scratch_database():
+        (user,) = seed_tasks(1, args.tasks)
+        queryset = Task.objects.filter(user=user)
+        ids = list(queryset.values_list("id", flat=True))
+
+        print(f"{'depth':>10} {'offset ms':>10} {'cursor ms':>10}")
+        for depth in (0, 1_000, 10_000, 100_000, args.tasks - args.page_size):
+            if depth >= len(ids):
+                continue
+
+            offset_request = Request(factory.get("/", {"limit": args.page_size, "offset": depth}))
+
+            def offset_page(request=offset_request):
+                list(LimitOffsetPagination().paginate_queryset(queryset, request))
+
+            # A cursor pointing just after row `depth - 1`, as a client following `next` would hold
+            cursor_paginator = SnowflakeCursorPagination()
+            cursor_paginator.base_url = f"/?page_size={args.page_size}"
+            position = str(ids[depth - 1]) if depth else None
+            url = cursor_paginator.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+            cursor_request = Request(factory.get(url))
+
+            def cursor_page(request=cursor_request):
+                list(SnowflakeCursorPagination().paginate_queryset(queryset, request))
+
+            print(f"{depth:>10} {timed(offset_page):>10.2f} {timed(cursor_page):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
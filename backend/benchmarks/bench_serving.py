@@ -0,0 +1,84 @@
+"""
+HTTP throughput of a running backend at increasing client concurrency.
+
+Start the server in the mode under test, then point this at it, e.g.
+
+    # sync: gunicorn sync workers on WSGI
+    gunicorn --chdir backend -w 4 config.wsgi:application
+    # async: uvicorn workers on ASGI with the async hot endpoints
+    ASYNC_API=1 PROCESS_TYPE=asgi WEB_CONCURRENCY=4 gunicorn -c backend/config/gunicorn.conf.py \\
+        --chdir backend config.asgi:application
+
+    python -m benchmarks.bench_serving --token <key> --concurrency 100 500 1000
+
+Reports requests/sec, p50/p99 latency and errors for GET /tasks/ per concurrency level.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import aiohttp
+
+
+async def run_level(url: str, token: str, concurrency: int, total: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    queue: asyncio.Queue[None] = asyncio.Queue()
+    for _ in range(total):
+        queue.put_nowait(None)
+
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    timeout = aiohttp.ClientTimeout(total=60)
+    headers = {"Authorization": f"Token {token}"}
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+
+        async def client():
+            nonlocal errors
+            while not queue.empty():
+                queue.get_nowait()
+                start = time.perf_counter()
+                try:
+                    async with session.get(url) as resp:
+                        await resp.read()
+                        if resp.status != 200:
+                            errors += 1
+                            continue
+                except (TimeoutError, aiohttp.ClientError):
+                    errors += 1
+                    continue
+                latencies.append((time.perf_counter() - start) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "p99": latencies[int(len(latencies) * 0.99) - 1] if latencies else 0.0,
+        "errors": errors,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://127.0.0.1:8000/api/v1/tasks/")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--requests", type=int, default=5000, help="requests per concurrency level")
+    args = parser.parse_args()
+
+    for concurrency in args.concurrency:
+        result = await run_level(args.url, args.token, concurrency, max(args.requests, concurrency))
+        print(
+            f"c={concurrency:<5} {result['rps']:8.1f} req/s  p50 {result['p50']:7.1f} ms  "
+            f"p99 {result['p99']:7.1f} ms  errors {result['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,57 @@
+"""
+Snowflake throughput: next_id() per ID vs next_ids() blocks, under N threads.
+
+Usage (from backend/):
+    python -m benchmarks.bench_snowflake --threads 1 4 8 --ids 200000 --block 1000
+"""
+
+import argparse
+import threading
+import time
+
+from apps.core.snowflake import SnowflakeGenerator
+
+
+def run(threads: int, total: int, block: int | None) -> float:
+    gen = SnowflakeGenerator(machine_id=1)
+    per_thread = total // threads
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        if block is None:
+            for _ in range(per_thread):
+                gen.next_id()
+        else:
+            for _ in range(per_thread // block):
+                gen.next_ids(block)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for t in pool:
+        t.start()
+
+    barrier.wait()
+    started = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    return per_thread * threads / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--ids", type=int, default=200_000)
+    parser.add_argument("--block", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'next_id ids/s':>16} {'next_ids ids/s':>16} {'speedup':>8}")
+    for threads in args.threads:
+        single = run(threads, args.ids, None)
+        batched = run(threads, args.ids, args.block)
+        print(f"{threads:>8} {single:>16,.0f} {batched:>16,.0f} {batched / single:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Per-user task list latency with and without the (user_id, id DESC) index.
+
+Seeds `--users` users sharing `--tasks` tasks in total, then times the
+first page and the full list of one user.
+
+Usage (from backend/, runs against a throwaway test database):
+    python -m benchmarks.bench_task_list --tasks 1000000 --users 1000
+"""
+
+import argparse
+
+from benchmarks.utils import scratch_database, seed_tasks, setup_django, timed
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from apps.tasks.models import Task
+
+    with scratch_database() as connection:
+        users = seed_tasks(args.users, args.tasks // args.users)
+        user = users[len(users) // 2]
+
+        def queryset():
+            return Task.objects.filter(user=user)
+
+        index = next(i for i in Task._meta.indexes if i.name == "task_user_id_desc_idx")
+
+        def measure(label):
+            print(f"== {label}")
+            print(queryset()[: args.page_size].explain())
+            first_page = timed(lambda: list(queryset()[: args.page_size]))
+            full_list = timed(lambda: list(queryset()))
+            print(f"first page {first_page:.2f} ms, full list ({queryset().count()} rows) {full_list:.2f} ms\n")
+
+        measure("with task_user_id_desc_idx")
+
+        with connection.schema_editor() as editor:
+            editor.remove_index(Task, index)
+        measure("without task_user_id_desc_idx (user_id FK index + sort)")
+
+        with connection.schema_editor() as editor:
+            editor.add_index(Task, index)
+
+
+if __name__ == "__main__":
+    main()
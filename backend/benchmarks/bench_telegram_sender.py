@@ -0,0 +1,81 @@
+"""
+Notification throughput of apps.tasks.sender against a local fake Telegram Bot API.
+
+The fake server answers sendMessage after `--latency` ms, standing in for the round trip
+to api.telegram.org. Compares the old one-connection-per-message serial loop with the
+pooled sender at several concurrency levels.
+
+Usage (from backend/):
+    python -m benchmarks.bench_telegram_sender --messages 2000 --latency 20 --concurrency 1 8 32
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from benchmarks.utils import setup_django
+
+
+class FakeBotAPIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(self.server.latency)
+        data = json.dumps({"ok": True, "result": {}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--latency", type=float, default=20, help="simulated Bot API round trip, ms")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    args = parser.parse_args()
+
+    setup_django()
+
+    from apps.tasks.ratelimit import TelegramRateLimiter
+    from apps.tasks.sender import TelegramSender
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeBotAPIHandler)
+    server.daemon_threads = True
+    server.latency = args.latency / 1000
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    messages = [(chat_id, f"☀️ <b>Good Morning!</b> #{chat_id}") for chat_id in range(args.messages)]
+
+    # The previous implementation: requests.post() per message, a new connection each time
+    started = time.perf_counter()
+    for chat_id, text in messages:
+        requests.post(f"{base_url}/botx/sendMessage", json={"chat_id": chat_id, "text": text}, timeout=5)
+    elapsed = time.perf_counter() - started
+    print(f"serial, new connection each   {args.messages / elapsed:8.0f} msg/s")
+
+    for concurrency in args.concurrency:
+        # Raw sender throughput: flood limits lifted (in production they cap it at ~30 msg/s)
+        limiter = TelegramRateLimiter(global_rate=1e9, global_burst=1e9, chat_rate=1e9, chat_burst=1e9)
+        sender = TelegramSender("x", base_url=base_url, concurrency=concurrency, limiter=limiter)
+        started = time.perf_counter()
+        delivered = sender.send_many(messages)
+        elapsed = time.perf_counter() - started
+        sender.close()
+        print(f"pooled, concurrency {concurrency:<4}      {delivered / elapsed:8.0f} msg/s  ({delivered} delivered)")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Shared helpers for benchmarks that need Django and a database."""
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import django
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django() -> None:
+    sys.path.insert(0, str(BACKEND_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+    django.setup()
+
+
+@contextmanager
+def scratch_database():
+    """Run against a throwaway test database (test_<NAME>), never the real one."""
+    from django.db import connection
+
+    old_name = connection.settings_dict["NAME"]
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def seed_tasks(users: int, tasks_per_user: int, batch_size: int = 5000) -> list:
+    """Create `users` users with `tasks_per_user` tasks each. Returns the users."""
+    from apps.tasks.models import Task
+    from django.contrib.auth import get_user_model
+
+    User = get_user_model()
+    created_users = User.objects.bulk_create(
+        User(username=f"bench_{i}", telegram_id=10_000_000 + i) for i in range(users)
+    )
+
+    for user in created_users:
+        Task.objects.bulk_create(
+            (Task(title=f"Task {n}", user=user) for n in range(tasks_per_user)),
+            batch_size=batch_size,
+        )
+    return created_users
+
+
+def timed(func, repeat: int = 20) -> float:
+    """Median wall time of `func()` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "rest_framework.authtoken",
     "django_celery_beat",
@@ -73,6 +74,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = "config.wsgi.application"
+ASGI_APPLICATION = "config.asgi.application"
+
+# Route the hot API endpoints (auth, task list/retrieve) to async views.
+# Only worth enabling when served by an ASGI server (see config/gunicorn.conf.py).
+ASYNC_API = config("ASYNC_API", default=False, cast=bool)
 
 
 # Database
@@ -89,6 +95,34 @@ DATABASES = {
     }
 }
 
+# Persistent connections: reuse one connection per process/thread instead of a
+# TCP + auth handshake on every request or task. Broken connections are caught
+# by CONN_HEALTH_CHECKS before reuse. Lifetimes are tuned per process type.
+PROCESS_TYPE = config("PROCESS_TYPE", default="web")  # web | asgi | worker | beat
+
+DB_CONN_MAX_AGE_DEFAULTS = {
+    "web": 60,
+    # Async ORM calls hop between threads, so connections would leak past request_finished
+    "asgi": 0,
+    "worker": 600,
+    "beat": 600,
+}
+
+DATABASES["default"]["CONN_MAX_AGE"] = config(
+    "DB_CONN_MAX_AGE", default=DB_CONN_MAX_AGE_DEFAULTS.get(PROCESS_TYPE, 60), cast=int
+)
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+if "postgresql" in DATABASES["default"]["ENGINE"]:
+    DATABASES["default"]["OPTIONS"] = {
+        "connect_timeout": config("DB_CONNECT_TIMEOUT", default=5, cast=int),
+        # Detect dead peers on idle persistent connections
+        "keepalives": 1,
+        "keepalives_idle": 30,
+        "keepalives_interval": 10,
+        "keepalives_count": 3,
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -141,11 +175,71 @@ CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_SERIALIZER = "json"
 CELERY_TIMEZONE = TIME_ZONE
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers.DatabaseScheduler"
+# Celery closes DB connections around every task unless told to reuse them
+CELERY_DB_REUSE_MAX = config("CELERY_DB_REUSE_MAX", default=1000, cast=int)
+
+# Deadline notifier (manage.py run_deadline_notifier): task changes are published here and
+# reminders fire from in-memory timers. When set, the 10-second check_deadlines poller is disabled.
+DEADLINE_EVENTS_REDIS_URL = config("DEADLINE_EVENTS_REDIS_URL", default="")
+# Timers are kept for deadlines up to this far ahead (plus the warning lead)...
+DEADLINE_NOTIFIER_HORIZON = config("DEADLINE_NOTIFIER_HORIZON", default=900, cast=int)
+# ...and rebuilt from the database this often, catching anything the events missed
+DEADLINE_NOTIFIER_RECONCILE_SECONDS = config("DEADLINE_NOTIFIER_RECONCILE_SECONDS", default=300, cast=int)
+
+
+# Cache: Redis, shared by all workers. The list cache, the ETag/Last-Modified validators
+# (both keyed on a per-user version bumped by every write), the shared token cache and
+# the Telegram login cache need it: a per-process cache would keep serving other
+# workers' stale lists and 304s. Without CACHE_REDIS_URL caching is off (DummyCache):
+# lists are read from the database and no validators are sent.
+CACHE_REDIS_URL = config("CACHE_REDIS_URL", default="")
+
+if CACHE_REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_REDIS_URL,
+            "KEY_PREFIX": "todo",
+            # Fail fast so a Redis outage degrades to DB reads instead of stalling requests
+            "OPTIONS": {"socket_timeout": 0.25, "socket_connect_timeout": 0.25},
+        }
+    }
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+# Lifetime of cached per-user task/category lists (they are also invalidated on every write)
+TASK_LIST_CACHE_TTL = config("TASK_LIST_CACHE_TTL", default=300, cast=int)
+
+# Changes feed: rows younger than the settle window are held back, so a write
+# transaction has that long to commit before the feed moves past its change_id
+TASK_CHANGES_SETTLE_MS = config("TASK_CHANGES_SETTLE_MS", default=2000, cast=int)
+# Tombstones of deleted tasks are purged after this; older cursors get 410 Gone
+TASK_TOMBSTONE_RETENTION_DAYS = config("TASK_TOMBSTONE_RETENTION_DAYS", default=30, cast=int)
+
+# Authenticated tokens: per-process LRU (short TTL, bounds revocation delay in other
+# processes) in front of the shared cache (evicted on token delete / user save)
+AUTH_TOKEN_CACHE_SIZE = config("AUTH_TOKEN_CACHE_SIZE", default=10_000, cast=int)
+AUTH_TOKEN_CACHE_LOCAL_TTL = config("AUTH_TOKEN_CACHE_LOCAL_TTL", default=10, cast=int)
+AUTH_TOKEN_CACHE_SHARED_TTL = config("AUTH_TOKEN_CACHE_SHARED_TTL", default=300, cast=int)
+# Telegram login fast path: telegram_id -> (user id, token) of returning users
+AUTH_TELEGRAM_LOGIN_CACHE_TTL = config("AUTH_TELEGRAM_LOGIN_CACHE_TTL", default=3600, cast=int)
+
+
+# Snowflake IDs
+# Each process leases its own machine id from Redis (no fallback: without Redis, ID requests fail).
+# SNOWFLAKE_MACHINE_ID is used only when SNOWFLAKE_LEASE_REDIS_URL is unset (one process, or tests).
+SNOWFLAKE_MACHINE_ID = config("SNOWFLAKE_MACHINE_ID", default=1, cast=int)
+SNOWFLAKE_LEASE_REDIS_URL = config("SNOWFLAKE_LEASE_REDIS_URL", default="")
+SNOWFLAKE_LEASE_TTL = config("SNOWFLAKE_LEASE_TTL", default=30, cast=int)
+# "sleep" until the next millisecond on sequence rollover, or "spin"
+SNOWFLAKE_WAIT_STRATEGY = config("SNOWFLAKE_WAIT_STRATEGY", default="sleep")
+# Backward clock steps up to this size are ridden out instead of failing
+SNOWFLAKE_MAX_BACKWARD_MS = config("SNOWFLAKE_MAX_BACKWARD_MS", default=50, cast=int)
 
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "apps.users.authentication.CachedTokenAuthentication",
         "rest_framework.authentication.SessionAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
@@ -154,3 +248,33 @@ REST_FRAMEWORK = {
 }
 
 BOT_TOKEN = config("BOT_TOKEN")
+# Notifications go out through apps.tasks.sender: one keep-alive pool per process,
+# at most TELEGRAM_SEND_CONCURRENCY requests in flight
+TELEGRAM_API_URL = config("TELEGRAM_API_URL", default="https://api.telegram.org")
+TELEGRAM_SEND_CONCURRENCY = config("TELEGRAM_SEND_CONCURRENCY", default=16, cast=int)
+# Flood limits shared with the bot through Redis (per process when unset): messages/s per bot
+# and per chat, with a small per-chat burst
+TELEGRAM_RATE_LIMIT_REDIS_URL = config("TELEGRAM_RATE_LIMIT_REDIS_URL", default="")
+TELEGRAM_RATE_GLOBAL = config("TELEGRAM_RATE_GLOBAL", default=30, cast=float)
+TELEGRAM_RATE_PER_CHAT = config("TELEGRAM_RATE_PER_CHAT", default=1, cast=float)
+TELEGRAM_RATE_PER_CHAT_BURST = config("TELEGRAM_RATE_PER_CHAT_BURST", default=3, cast=float)
+# Deadline notifications go through the outbox (apps.tasks.outbox): a failed send is retried
+# after 30 s, 1 min, 2 min... (capped), and given up after NOTIFICATION_MAX_ATTEMPTS
+NOTIFICATION_MAX_ATTEMPTS = config("NOTIFICATION_MAX_ATTEMPTS", default=8, cast=int)
+NOTIFICATION_RETRY_BASE_SECONDS = config("NOTIFICATION_RETRY_BASE_SECONDS", default=30, cast=int)
+NOTIFICATION_RETRY_MAX_SECONDS = config("NOTIFICATION_RETRY_MAX_SECONDS", default=3600, cast=int)
+# Rows a delivery worker takes per round; they are leased for NOTIFICATION_LEASE_SECONDS,
+# after which a crashed worker's rows are picked up again
+NOTIFICATION_BATCH_SIZE = config("NOTIFICATION_BATCH_SIZE", default=100, cast=int)
+NOTIFICATION_LEASE_SECONDS = config("NOTIFICATION_LEASE_SECONDS", default=300, cast=int)
+
+# Application loggers to stdout: the periodic metrics summaries (task list cache,
+# Snowflake generator, deadline notifier) are logged at INFO
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "apps": {"handlers": ["console"], "level": config("APP_LOG_LEVEL", default="INFO"), "propagate": False},
+    },
+}
@@ -0,0 +1,63 @@
+import pytest
+from apps.users.authentication import token_cache
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from rest_framework.test import APIClient
+
+User = get_user_model()
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "postgres: needs PostgreSQL (query plans, text search); skipped elsewhere")
+
+
+def pytest_collection_modifyitems(items):
+    if connection.vendor == "postgresql":
+        return
+    skip = pytest.mark.skip(reason="needs PostgreSQL")
+    for item in items:
+        if item.get_closest_marker("postgres"):
+            item.add_marker(skip)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings):
+    # Tests run in one process, where local memory stands in for the shared Redis cache
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    yield
+    cache.clear()
+    token_cache.clear_local()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create(username="tester", telegram_id=12345)
+
+
+@pytest.fixture
+def other_user(db):
+    return User.objects.create(username="stranger", telegram_id=54321)
+
+
+@pytest.fixture
+def api_client(user):
+    client = APIClient()
+    client.force_authenticate(user=user)
+    return client
+
+
+@pytest.fixture
+def explain(db):
+    """
+    EXPLAIN output of a queryset. On PostgreSQL seq scans are switched off first:
+    tiny test tables make them cheapest, and the plan tests only check that an index is usable.
+    """
+
+    def explain(queryset) -> str:
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        return queryset.explain()
+
+    return explain
@@ -0,0 +1,173 @@
+import json
+
+import pytest
+from apps.tasks.async_views import TaskDetailAsyncView, TaskListAsyncView
+from apps.tasks.models import Category, Task
+from apps.tasks.views import TaskViewSet
+from apps.users.async_views import TelegramAuthAsyncView
+from apps.users.views import TelegramAuthView
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory
+from rest_framework.authtoken.models import Token
+
+User = get_user_model()
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+list_view = TaskListAsyncView.as_view(fallback=TaskViewSet.as_view({"get": "list", "post": "create"}))
+detail_view = TaskDetailAsyncView.as_view(fallback=TaskViewSet.as_view({"get": "retrieve", "delete": "destroy"}))
+auth_view = TelegramAuthAsyncView.as_view(fallback=TelegramAuthView.as_view())
+
+
+@pytest.fixture
+def rf():
+    return AsyncRequestFactory()
+
+
+@pytest.fixture
+def token(user):
+    return Token.objects.create(user=user).key
+
+
+def auth(token):
+    return {"headers": {"Authorization": f"Token {token}"}}
+
+
+async def call(view, request, **kwargs):
+    response = await view(request, **kwargs)
+    # Responses from the sync fallback are DRF Responses rendered lazily
+    if hasattr(response, "render"):
+        response.render()
+    return response.status_code, json.loads(response.content)
+
+
+async def test_list_returns_only_own_tasks_with_category(rf, user, other_user, token):
+    category = await Category.objects.acreate(name="Work", user=user)
+    own = await Task.objects.acreate(title="Mine", user=user, category=category)
+    await Task.objects.acreate(title="Theirs", user=other_user)
+
+    status_code, data = await call(list_view, rf.get("/api/v1/tasks/", **auth(token)))
+
+    assert status_code == 200
+    assert [row["id"] for row in data] == [own.id]
+    assert data[0]["category_name"] == "Work"
+
+
+def _sync_only(sync_view):
+    """The plain DRF view, wrapped so it can be awaited like the async one."""
+
+    async def view(request, **kwargs):
+        return await TaskListAsyncView(fallback=sync_view).delegate(request, **kwargs)
+
+    return view
+
+
+async def test_list_matches_sync_view(rf, user, token):
+    category = await Category.objects.acreate(name="Work", user=user)
+    for i in range(3):
+        await Task.objects.acreate(title=f"Task {i}", user=user, category=category if i % 2 else None)
+
+    async_result = await call(list_view, rf.get("/api/v1/tasks/", **auth(token)))
+    sync_result = await call(_sync_only(TaskViewSet.as_view({"get": "list"})), rf.get("/api/v1/tasks/", **auth(token)))
+
+    assert async_result == sync_result
+    assert len(async_result[1]) == 3
+
+
+async def test_paginated_list_is_delegated(rf, user, token):
+    await Task.objects.acreate(title="Mine", user=user)
+
+    status_code, data = await call(list_view, rf.get("/api/v1/tasks/?page_size=10", **auth(token)))
+
+    assert status_code == 200
+    assert len(data["results"]) == 1
+
+
+async def test_missing_or_invalid_token_is_delegated(rf, token):
+    assert (await call(list_view, rf.get("/api/v1/tasks/")))[0] == 401
+    assert (await call(list_view, rf.get("/api/v1/tasks/", **auth("nope"))))[0] == 401
+
+
+async def test_retrieve_own_task(rf, user, token):
+    task = await Task.objects.acreate(title="Mine", user=user)
+
+    status_code, data = await call(detail_view, rf.get(f"/api/v1/tasks/{task.id}/", **auth(token)), pk=task.id)
+
+    assert status_code == 200
+    assert data["title"] == "Mine"
+
+
+async def test_retrieve_foreign_task_is_404(rf, other_user, token):
+    task = await Task.objects.acreate(title="Theirs", user=other_user)
+
+    status_code, data = await call(detail_view, rf.get(f"/api/v1/tasks/{task.id}/", **auth(token)), pk=task.id)
+
+    assert status_code == 404
+    assert data == {"detail": "No Task matches the given query."}
+
+
+async def test_delete_is_delegated(rf, user, token):
+    task = await Task.objects.acreate(title="Mine", user=user)
+
+    status_code = (await detail_view(rf.delete(f"/api/v1/tasks/{task.id}/", **auth(token)), pk=task.id)).status_code
+
+    assert status_code == 204
+    assert not await Task.objects.filter(pk=task.id).aexists()
+
+
+async def test_create_is_served_by_the_sync_view(rf, user, token):
+    request = rf.post(
+        "/api/v1/tasks/",
+        {"title": "Buy milk", "category_name": "Home"},
+        content_type="application/json",
+        **auth(token),
+    )
+
+    status_code, data = await call(list_view, request)
+
+    task = await Task.objects.select_related("category").aget(pk=int(data["id"]))
+    assert status_code == 201
+    assert data["category_name"] == "Home"
+    assert task.user_id == user.id
+    assert task.category.user_id == user.id
+
+
+async def test_telegram_auth_registers_and_reuses_token(rf):
+    body = {"telegram_id": 777, "first_name": "Ann", "language_code": "uk"}
+
+    first = await call(auth_view, rf.post("/api/v1/users/auth/telegram/", body, content_type="application/json"))
+    second = await call(auth_view, rf.post("/api/v1/users/auth/telegram/", body, content_type="application/json"))
+
+    user = await User.objects.aget(telegram_id=777)
+    assert first[0] == second[0] == 200
+    assert first[1] == second[1] == {"token": first[1]["token"], "user_id": str(user.id)}
+    assert user.username == "tg_777"
+    assert user.language == "ru"
+
+
+async def test_telegram_auth_validation_error(rf):
+    status_code, data = await call(
+        auth_view, rf.post("/api/v1/users/auth/telegram/", {"telegram_id": "abc"}, content_type="application/json")
+    )
+
+    assert status_code == 400
+    assert "telegram_id" in data
+
+
+async def test_list_and_retrieve_answer_conditional_requests(rf, user, token):
+    task = await Task.objects.acreate(title="Mine", user=user)
+
+    list_response = await list_view(rf.get("/api/v1/tasks/", **auth(token)))
+    detail_response = await detail_view(rf.get(f"/api/v1/tasks/{task.id}/", **auth(token)), pk=task.id)
+    list_again = await list_view(
+        rf.get("/api/v1/tasks/", headers={"Authorization": f"Token {token}", "If-None-Match": list_response["ETag"]})
+    )
+    detail_again = await detail_view(
+        rf.get(
+            f"/api/v1/tasks/{task.id}/",
+            headers={"Authorization": f"Token {token}", "If-None-Match": detail_response["ETag"]},
+        ),
+        pk=task.id,
+    )
+
+    assert list_again.status_code == detail_again.status_code == 304
@@ -0,0 +1,169 @@
+import pytest
+import redis
+from apps.tasks.models import Task
+from apps.users.authentication import CachedTokenAuthentication, token_cache
+from django.core.cache import cache
+from django.db import connection
+from rest_framework.authtoken.models import Token
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def token(user):
+    return Token.objects.create(user=user)
+
+
+@pytest.fixture
+def token_client(token):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    return client
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(token_cache, "clock", lambda: now[0])
+    return now
+
+
+def test_repeat_requests_skip_the_token_query(token_client, user, django_assert_num_queries):
+    Task.objects.create(title="Mine", user=user)
+    token_client.get("/api/v1/tasks/")
+
+    # Token and the task list both come from cache
+    with django_assert_num_queries(0):
+        resp = token_client.get("/api/v1/tasks/")
+
+    assert resp.status_code == 200
+    assert [row["title"] for row in resp.data] == ["Mine"]
+
+
+def test_unknown_token_is_rejected(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION="Token nope")
+
+    assert client.get("/api/v1/tasks/").status_code == 401
+
+
+def test_token_deletion_revokes_immediately(token_client, token):
+    assert token_client.get("/api/v1/tasks/").status_code == 200
+
+    token.delete()
+
+    assert token_client.get("/api/v1/tasks/").status_code == 401
+
+
+def test_deactivation_revokes_immediately(token_client, user):
+    assert token_client.get("/api/v1/tasks/").status_code == 200
+
+    user.is_active = False
+    user.save()
+
+    assert token_client.get("/api/v1/tasks/").status_code == 401
+
+
+def test_profile_update_is_visible(token, user):
+    auth = CachedTokenAuthentication()
+    auth.authenticate_credentials(token.key)
+
+    user.language = "ru"
+    user.save()
+    cached_user, _ = auth.authenticate_credentials(token.key)
+
+    assert cached_user.language == "ru"
+
+
+def test_revocation_in_another_process_takes_effect_within_ttl(token_client, token, clock):
+    """The revoking process evicts Redis but cannot reach our local LRU, which then expires."""
+    assert token_client.get("/api/v1/tasks/").status_code == 200
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {Token._meta.db_table} WHERE key = %s", [token.key])
+    cache.delete(token_cache._shared_key(token.key))
+
+    clock[0] += token_cache.local_ttl - 1
+    assert token_client.get("/api/v1/tasks/").status_code == 200
+
+    clock[0] += 1
+    assert token_client.get("/api/v1/tasks/").status_code == 401
+
+
+def test_shared_tier_serves_other_processes(token, django_assert_num_queries):
+    auth = CachedTokenAuthentication()
+    auth.authenticate_credentials(token.key)
+    token_cache.clear_local()  # a fresh process
+
+    with django_assert_num_queries(0):
+        user, cached = auth.authenticate_credentials(token.key)
+
+    assert cached.key == token.key
+    assert user.pk == token.user_id
+
+
+def test_falls_back_to_database_when_redis_is_down(token_client, monkeypatch):
+    def down(*args, **kwargs):
+        raise redis.ConnectionError("Connection refused")
+
+    monkeypatch.setattr(cache, "get", down)
+    monkeypatch.setattr(cache, "set", down)
+
+    assert token_client.get("/api/v1/tasks/").status_code == 200
+
+
+def test_inactive_user_is_never_cached(token, user):
+    user.is_active = False
+    user.save()
+
+    with pytest.raises(AuthenticationFailed):
+        CachedTokenAuthentication().authenticate_credentials(token.key)
+
+    assert token_cache.get(token.key) is None
+
+
+def test_cached_entry_holds_no_credentials(token, user):
+    CachedTokenAuthentication().authenticate_credentials(token.key)
+
+    assert cache.get(token_cache._shared_key(token.key)) == (user.pk, True)
+
+
+def test_cached_user_is_minimal_and_per_request(token, user, django_assert_num_queries):
+    token_cache.set(token.key, token)
+
+    with django_assert_num_queries(0):
+        first, _ = CachedTokenAuthentication().authenticate_credentials(token.key)
+    assert first.get_deferred_fields() >= {"password", "language", "is_superuser"}
+
+    first.language = "ru"
+    second = token_cache.get_local(token.key)
+
+    assert second.user is not first
+    assert second.user.language == "en"
+
+
+def test_queryset_deactivation_revokes_immediately(token_client, user):
+    assert token_client.get("/api/v1/tasks/").status_code == 200
+
+    type(user).objects.filter(pk=user.pk).update(is_active=False)
+
+    assert token_client.get("/api/v1/tasks/").status_code == 401
+
+
+def test_bulk_update_deactivation_revokes_immediately(token_client, user):
+    assert token_client.get("/api/v1/tasks/").status_code == 200
+
+    user.is_active = False
+    type(user).objects.bulk_update([user], ["is_active"])
+
+    assert token_client.get("/api/v1/tasks/").status_code == 401
+
+
+def test_local_lru_is_bounded(token, monkeypatch):
+    monkeypatch.setattr(token_cache, "maxsize", 2)
+    for key in ("a", "b", "c"):
+        token_cache.set(key, token)
+
+    assert token_cache.get_local("a") is None
+    assert token_cache.get_local("c") is not None
@@ -0,0 +1,157 @@
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+import pytest
+from apps.tasks.models import Category, Task
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+URL = "/api/v1/users/me/bootstrap/"
+
+
+def test_me_is_a_single_resource(api_client, user):
+    resp = api_client.get("/api/v1/users/me/")
+
+    assert resp.status_code == 200
+    assert resp.data == {
+        "id": user.id,
+        "username": "tester",
+        "first_name": "",
+        "language": "en",
+        "timezone": "UTC",
+    }
+
+
+def test_me_update(api_client, user):
+    resp = api_client.patch("/api/v1/users/me/", {"timezone": "Europe/Berlin", "username": "hijack"}, format="json")
+
+    user.refresh_from_db()
+    assert resp.status_code == 200
+    assert user.timezone == "Europe/Berlin"
+    assert user.username == "tester"
+
+
+@pytest.fixture
+def token_client(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Token {Token.objects.create(user=user).key}")
+    assert client.get("/api/v1/users/me/").status_code == 200
+    return client
+
+
+def test_me_update_does_not_write_back_a_cached_user(token_client, user):
+    # Changed behind the token cache, e.g. by another process
+    User.objects.filter(pk=user.pk).update(language="ru")
+
+    resp = token_client.patch("/api/v1/users/me/", {"timezone": "Europe/Berlin"}, format="json")
+
+    user.refresh_from_db()
+    assert resp.status_code == 200
+    assert (user.language, user.timezone) == ("ru", "Europe/Berlin")
+
+
+def test_me_update_refused_once_deactivated_behind_the_cache(token_client, user):
+    User.objects.filter(pk=user.pk).update(is_active=False)
+
+    resp = token_client.patch("/api/v1/users/me/", {"timezone": "Europe/Berlin"}, format="json")
+
+    user.refresh_from_db()
+    assert resp.status_code == 401
+    assert user.timezone == "UTC"
+
+
+def test_me_requires_auth(client):
+    assert client.get("/api/v1/users/me/").status_code == 401
+
+
+def test_bootstrap(api_client, user, other_user):
+    now = timezone.now()
+    user.timezone = "Europe/Berlin"
+    user.save()
+    Category.objects.create(name="Work", user=user)
+    Task.objects.create(user=user, title="Overdue", deadline=now - timedelta(minutes=5))
+    Task.objects.create(user=user, title="Done", is_completed=True)
+    Task.objects.create(user=user, title="Later", deadline=now + timedelta(days=3))
+    Task.objects.create(user=other_user, title="Theirs")
+
+    resp = api_client.get(URL)
+
+    assert resp.status_code == 200
+    assert resp.data["profile"]["timezone"] == "Europe/Berlin"
+    assert [c["name"] for c in resp.data["categories"]] == ["Work"]
+    assert resp.data["summary"]["open"] == 2
+    assert resp.data["summary"]["overdue"] == 1
+    assert [t["title"] for t in resp.data["tasks"]["results"]] == ["Later", "Done", "Overdue"]
+    assert resp.data["tasks"]["next"] is None
+
+
+def test_bootstrap_counts_tasks_due_in_users_local_day(api_client, user):
+    user.timezone = "Asia/Tokyo"
+    user.save()
+    tokyo = ZoneInfo("Asia/Tokyo")
+    today = timezone.now().astimezone(tokyo).date()
+    Task.objects.create(user=user, title="Today", deadline=datetime.combine(today, time(0, 30), tzinfo=tokyo))
+    Task.objects.create(user=user, title="Tonight", deadline=datetime.combine(today, time(23, 30), tzinfo=tokyo))
+    Task.objects.create(
+        user=user, title="Tomorrow", deadline=datetime.combine(today, time(23, 30), tzinfo=tokyo) + timedelta(hours=1)
+    )
+
+    resp = api_client.get(URL)
+
+    assert resp.data["summary"]["due_today"] == 2
+    assert resp.data["summary"]["open"] == 3
+
+
+def test_summary_is_one_query(api_client, user, django_assert_num_queries):
+    now = timezone.now()
+    Task.objects.create(user=user, title="Overdue", deadline=now - timedelta(days=2))
+    Task.objects.create(user=user, title="Done", is_completed=True)
+    Task.objects.create(user=user, title="Later", deadline=now + timedelta(days=3))
+
+    with django_assert_num_queries(1):
+        resp = api_client.get("/api/v1/users/me/summary/")
+
+    assert resp.data == {"open": 2, "overdue": 1, "due_today": 0}
+
+
+def test_bootstrap_first_page_continues_on_task_list(api_client, user):
+    tasks = [Task.objects.create(user=user, title=f"Task {i}") for i in range(5)]
+
+    resp = api_client.get(URL, {"page_size": 2})
+    rest = api_client.get(resp.data["tasks"]["next"])
+
+    assert "/api/v1/tasks/?" in resp.data["tasks"]["next"]
+    assert [t["id"] for t in resp.data["tasks"]["results"]] == [tasks[4].id, tasks[3].id]
+    assert [t["id"] for t in rest.data["results"]] == [tasks[2].id, tasks[1].id]
+
+
+def test_bootstrap_query_count(api_client, user):
+    Category.objects.create(name="Work", user=user)
+    for i in range(10):
+        Task.objects.create(user=user, title=f"Task {i}")
+
+    with CaptureQueriesContext(connection) as cold:
+        api_client.get(URL)
+    with CaptureQueriesContext(connection) as warm:
+        api_client.get(URL)
+
+    # Categories (then served from the list cache), open-task counts, first page
+    assert len(cold) == 3
+    assert len(warm) == 2
+
+
+def test_bootstrap_shares_category_list_cache(api_client, user):
+    Category.objects.create(name="Work", user=user)
+
+    api_client.get(URL)
+    resp = api_client.get("/api/v1/categories/")
+
+    assert resp["X-Cache"] == "HIT"
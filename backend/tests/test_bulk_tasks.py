@@ -0,0 +1,195 @@
+from unittest.mock import patch
+
+import pytest
+from apps.core import snowflake
+from apps.tasks.models import Category, Notification, Task, TaskTombstone
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/v1/tasks/bulk/"
+
+
+def statements(ctx):
+    """Captured SQL without the SAVEPOINT/RELEASE pair of transaction.atomic()."""
+    return [q["sql"] for q in ctx.captured_queries if "SAVEPOINT" not in q["sql"]]
+
+
+@pytest.fixture
+def category(user):
+    return Category.objects.create(name="Work", user=user)
+
+
+def test_bulk_create(api_client, user, category):
+    rows = [
+        {"title": "Plain"},
+        {"title": "By id", "category_id": str(category.id)},
+        {"title": "By name", "category_name": "Home"},
+        {"title": "Existing name", "category_name": "Work"},
+    ]
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api_client.post(URL, rows, format="json")
+
+    assert resp.status_code == 201
+    assert [row.get("category_name") for row in resp.data] == [None, "Work", "Home", "Work"]
+    assert Task.objects.filter(user=user).count() == 4
+    assert Category.objects.filter(user=user).count() == 2
+    assert len({row["id"] for row in resp.data}) == 4
+    # Category id check, name lookup, missing-name insert + re-read, one task INSERT
+    assert len(statements(ctx)) == 5
+    assert sum(sql.startswith('INSERT INTO "tasks_task"') for sql in statements(ctx)) == 1
+
+
+def test_bulk_create_reserves_ids_for_tasks_and_new_categories(api_client, user):
+    gen = snowflake.SnowflakeGenerator(machine_id=3)
+    rows = [{"title": f"Task {i}", "category_name": f"Cat {i % 5}"} for i in range(50)]
+
+    with patch.object(snowflake, "generator", gen), patch.object(gen, "next_id") as single:
+        resp = api_client.post(URL, rows, format="json")
+
+    assert resp.status_code == 201
+    single.assert_not_called()
+    assert Category.objects.filter(user=user).count() == 5
+
+
+def test_bulk_create_is_all_or_nothing(api_client, user, other_user):
+    foreign = Category.objects.create(name="Theirs", user=other_user)
+    rows = [
+        {"title": "Fine", "category_name": "New"},
+        {"description": "no title"},
+        {"title": "Sneaky", "category_id": foreign.id},
+        {"title": "Ghost", "category_id": 1},
+    ]
+
+    resp = api_client.post(URL, rows, format="json")
+
+    assert resp.status_code == 400
+    assert resp.data[0] == {}
+    assert "title" in resp.data[1]
+    assert resp.data[2]["category_id"] == ["You cannot use a category that does not belong to you."]
+    assert resp.data[3]["category_id"] == ['Invalid pk "1" - object does not exist.']
+    assert not Task.objects.exists()
+    assert not Category.objects.filter(user=user).exists()
+
+
+def test_bulk_create_validates_category_names(api_client, user):
+    rows = [
+        {"title": "List", "category_name": ["x"]},
+        {"title": "Object", "category_name": {"a": 1}},
+        {"title": "Too long", "category_name": "x" * 101},
+        {"title": "Number", "category_name": 5},
+    ]
+
+    resp = api_client.post(URL, rows, format="json")
+
+    assert resp.status_code == 400
+    assert resp.data[0]["category_name"] == ["Not a valid string."]
+    assert resp.data[1]["category_name"] == ["Not a valid string."]
+    assert "category_name" in resp.data[2]
+    assert resp.data[3] == {}
+    assert not Task.objects.exists()
+    assert not Category.objects.exists()
+
+
+def test_bulk_create_rejects_non_list(api_client):
+    assert api_client.post(URL, {"title": "x"}, format="json").status_code == 400
+    assert api_client.post(URL, [], format="json").status_code == 400
+
+
+def test_bulk_update_is_one_statement_scoped_to_user(api_client, user, other_user):
+    mine = Task.objects.bulk_create(Task(title=f"Mine {i}", user=user) for i in range(5))
+    theirs = Task.objects.create(title="Theirs", user=other_user)
+    ids = [t.id for t in mine[:3]] + [theirs.id]
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api_client.patch(URL, {"ids": ids, "changes": {"is_completed": True}}, format="json")
+
+    assert resp.status_code == 200
+    assert resp.data == {"updated": 3}
+    assert len(statements(ctx)) == 1
+    assert Task.objects.filter(user=user, is_completed=True).count() == 3
+    assert not Task.objects.get(pk=theirs.id).is_completed
+
+
+def test_bulk_update_category(api_client, user, category):
+    tasks = Task.objects.bulk_create(Task(title=f"Task {i}", user=user) for i in range(2))
+
+    resp = api_client.patch(URL, {"ids": [t.id for t in tasks], "changes": {"category_id": category.id}}, format="json")
+
+    assert resp.data == {"updated": 2}
+    assert Task.objects.filter(category=category).count() == 2
+
+
+def test_bulk_update_validates_changes(api_client, user, other_user):
+    task = Task.objects.create(title="Task", user=user)
+    foreign = Category.objects.create(name="Theirs", user=other_user)
+
+    bad_field = api_client.patch(URL, {"ids": [task.id], "changes": {"deadline": "soon"}}, format="json")
+    bad_category = api_client.patch(URL, {"ids": [task.id], "changes": {"category_id": foreign.id}}, format="json")
+    nothing = api_client.patch(URL, {"ids": [task.id], "changes": {"id": 1}}, format="json")
+
+    assert bad_field.status_code == bad_category.status_code == nothing.status_code == 400
+    assert Task.objects.get(pk=task.id).category_id is None
+
+
+def test_bulk_update_validates_category_name(api_client, user):
+    task = Task.objects.create(title="Task", user=user)
+
+    resp = api_client.patch(URL, {"ids": [task.id], "changes": {"category_name": ["x"]}}, format="json")
+
+    assert resp.status_code == 400
+    assert resp.data["category_name"] == ["Not a valid string."]
+
+
+def test_bulk_delete_scoped_to_user(api_client, user, other_user):
+    mine = Task.objects.bulk_create(Task(title=f"Mine {i}", user=user) for i in range(3))
+    theirs = Task.objects.create(title="Theirs", user=other_user)
+
+    resp = api_client.delete(URL, {"ids": [mine[0].id, mine[1].id, theirs.id]}, format="json")
+
+    assert resp.data == {"deleted": 2}
+    assert list(Task.objects.filter(user=user).values_list("id", flat=True)) == [mine[2].id]
+    assert Task.objects.filter(pk=theirs.id).exists()
+
+
+def test_bulk_delete_counts_tasks_only(api_client, user):
+    task = Task.objects.create(title="Late", user=user)
+    for kind in Notification.Kind:
+        Notification.objects.create(task=task, kind=kind, chat_id=user.telegram_id, text="...")
+
+    resp = api_client.delete(URL, {"ids": [task.id]}, format="json")
+
+    assert resp.data == {"deleted": 1}
+    assert not Notification.objects.exists()
+
+
+def test_bulk_delete_is_constant_queries(api_client, user):
+    tasks = Task.objects.bulk_create(Task(title=f"Task {i}", user=user) for i in range(30))
+    ids = [task.id for task in tasks]
+
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api_client.delete(URL, {"ids": ids}, format="json")
+
+    assert resp.data == {"deleted": 30}
+    # Id lookup, one tombstone INSERT, then delete()'s collect, cascade and task DELETE
+    assert len(statements(ctx)) == 5
+    assert sorted(TaskTombstone.objects.filter(user=user).values_list("task_id", flat=True)) == sorted(ids)
+
+
+def test_bulk_delete_requires_ids(api_client):
+    assert api_client.delete(URL, {"ids": []}, format="json").status_code == 400
+
+
+def test_bulk_writes_invalidate_cached_list(api_client, user):
+    api_client.get("/api/v1/tasks/")
+
+    created = api_client.post(URL, [{"title": "A"}, {"title": "B"}], format="json").data
+    assert len(api_client.get("/api/v1/tasks/").data) == 2
+
+    api_client.patch(URL, {"ids": [created[0]["id"]], "changes": {"is_completed": True}}, format="json")
+    assert sum(row["is_completed"] for row in api_client.get("/api/v1/tasks/").data) == 1
+
+    api_client.delete(URL, {"ids": [created[0]["id"]]}, format="json")
+    assert len(api_client.get("/api/v1/tasks/").data) == 1
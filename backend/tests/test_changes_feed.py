@@ -0,0 +1,233 @@
+import random
+from datetime import timedelta
+
+import pytest
+from apps.core.snowflake import min_id_for
+from apps.tasks.models import Category, Task, TaskTombstone
+from apps.tasks.tasks import purge_task_tombstones
+from django.utils import timezone
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/v1/tasks/changes/"
+
+
+@pytest.fixture(autouse=True)
+def no_settle_window(settings):
+    settings.TASK_CHANGES_SETTLE_MS = 0
+
+
+def sync(client, replica, cursor=None, limit=500):
+    """Apply feed pages to `replica` until caught up. Returns the new cursor."""
+    while True:
+        params = {"limit": limit}
+        if cursor is not None:
+            params["since"] = cursor
+        resp = client.get(URL, params)
+        assert resp.status_code == 200
+        for row in resp.data["changes"]:
+            replica[row["id"]] = row
+        for task_id in resp.data["deleted"]:
+            replica.pop(task_id, None)
+        cursor = resp.data["cursor"]
+        if not resp.data["has_more"]:
+            return cursor
+
+
+def full_fetch(client):
+    return {row["id"]: row for row in client.get("/api/v1/tasks/").data}
+
+
+def test_feed_reports_creates_updates_and_deletes(api_client, user):
+    kept = Task.objects.create(user=user, title="Kept")
+    gone = Task.objects.create(user=user, title="Gone")
+    replica = {}
+    cursor = sync(api_client, replica)
+    assert set(replica) == {kept.id, gone.id}
+
+    api_client.patch(f"/api/v1/tasks/{kept.id}/", {"title": "Renamed"}, format="json")
+    api_client.delete(f"/api/v1/tasks/{gone.id}/")
+    resp = api_client.get(URL, {"since": cursor})
+
+    assert [row["title"] for row in resp.data["changes"]] == ["Renamed"]
+    assert resp.data["deleted"] == [gone.id]
+    assert resp.data["has_more"] is False
+
+
+def test_caught_up_cursor_returns_nothing(api_client, user):
+    Task.objects.create(user=user, title="Once")
+    cursor = sync(api_client, {})
+
+    resp = api_client.get(URL, {"since": cursor})
+
+    assert resp.data["changes"] == []
+    assert resp.data["deleted"] == []
+
+
+def test_pages_split_tied_change_ids(api_client, user):
+    tasks = [Task.objects.create(user=user, title=f"Task {i}") for i in range(5)]
+    cursor = sync(api_client, {})
+    api_client.patch(
+        "/api/v1/tasks/bulk/", {"ids": [t.id for t in tasks], "changes": {"is_completed": True}}, format="json"
+    )
+    assert Task.objects.filter(user=user).values("change_id").distinct().count() == 1
+
+    seen = []
+    while True:
+        resp = api_client.get(URL, {"since": cursor, "limit": 2})
+        seen += [row["id"] for row in resp.data["changes"]]
+        cursor = resp.data["cursor"]
+        if not resp.data["has_more"]:
+            break
+
+    assert sorted(seen) == sorted(t.id for t in tasks)
+
+
+def test_category_rename_and_delete_move_tasks_forward(api_client, user):
+    category = Category.objects.create(user=user, name="Work")
+    task = Task.objects.create(user=user, title="Report", category=category)
+    replica = {}
+    cursor = sync(api_client, replica)
+
+    api_client.patch(f"/api/v1/categories/{category.id}/", {"name": "Office"}, format="json")
+    cursor = sync(api_client, replica, cursor)
+    assert replica[task.id]["category_name"] == "Office"
+
+    api_client.delete(f"/api/v1/categories/{category.id}/")
+    sync(api_client, replica, cursor)
+    assert "category_name" not in replica[task.id]
+
+
+def test_notifier_bookkeeping_is_not_a_change(api_client, user):
+    task = Task.objects.create(user=user, title="Quiet")
+    cursor = sync(api_client, {})
+
+    task.is_pre_notified = True
+    task.save(update_fields=["is_pre_notified"])
+
+    assert api_client.get(URL, {"since": cursor}).data["changes"] == []
+
+
+def test_feed_is_scoped_to_user(api_client, user, other_user):
+    Task.objects.create(user=other_user, title="Theirs").delete()
+    Task.objects.create(user=other_user, title="Also theirs")
+
+    resp = api_client.get(URL)
+
+    assert resp.data["changes"] == []
+    assert resp.data["deleted"] == []
+
+
+def test_settle_window_holds_back_fresh_writes(api_client, user, settings):
+    cursor = sync(api_client, {})
+    settings.TASK_CHANGES_SETTLE_MS = 60_000
+    task = Task.objects.create(user=user, title="In flight")
+
+    resp = api_client.get(URL, {"since": cursor})
+    assert resp.data["changes"] == []
+
+    settings.TASK_CHANGES_SETTLE_MS = 0
+    resp = api_client.get(URL, {"since": resp.data["cursor"]})
+    assert [row["id"] for row in resp.data["changes"]] == [task.id]
+
+
+def test_feed_honours_sparse_fields(api_client, user):
+    Task.objects.create(user=user, title="Slim")
+
+    resp = api_client.get(URL, {"fields": "id,title"})
+
+    assert resp.data["changes"][0].keys() == {"id", "title"}
+
+
+@pytest.mark.parametrize("since", ["abc", "1.2", "1.2.3.4", "-1.2.3", "1.2.99999999999999999999"])
+def test_invalid_cursor(api_client, since):
+    resp = api_client.get(URL, {"since": since})
+
+    assert resp.status_code == 400
+    assert resp.data == {"since": ["Invalid cursor."]}
+
+
+def test_cursor_older_than_retention_is_gone(api_client, settings):
+    issued = min_id_for(timezone.now() - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS + 1))
+
+    resp = api_client.get(URL, {"since": f"{issued}.0.{issued}"})
+
+    assert resp.status_code == 410
+
+
+def test_purge_drops_only_expired_tombstones(user, settings):
+    old = min_id_for(timezone.now() - timedelta(days=settings.TASK_TOMBSTONE_RETENTION_DAYS + 1))
+    TaskTombstone.objects.create(task_id=1, user=user, change_id=old)
+    Task.objects.create(user=user, title="Recent").delete()
+
+    purge_task_tombstones()
+
+    assert TaskTombstone.objects.count() == 1
+    assert not TaskTombstone.objects.filter(task_id=1).exists()
+
+
+def test_deleting_user_leaves_no_tombstones(user):
+    Task.objects.create(user=user, title="Bye")
+
+    user.delete()
+
+    assert not TaskTombstone.objects.exists()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_random_mutations_replica_matches_full_fetch(api_client, user, seed):
+    rng = random.Random(seed)
+    replica = {}
+    cursor = None
+
+    def task_ids():
+        return list(Task.objects.filter(user=user).values_list("id", flat=True))
+
+    def create():
+        payload = {"title": f"Task {rng.random():.6f}"}
+        if rng.random() < 0.5:
+            payload["category_name"] = rng.choice(["Work", "Home", "Gym"])
+        api_client.post("/api/v1/tasks/", payload, format="json")
+
+    def update():
+        if ids := task_ids():
+            changes = rng.choice(
+                [{"title": f"Edited {rng.random():.6f}"}, {"is_completed": True}, {"category_id": None}]
+            )
+            api_client.patch(f"/api/v1/tasks/{rng.choice(ids)}/", changes, format="json")
+
+    def delete():
+        if ids := task_ids():
+            api_client.delete(f"/api/v1/tasks/{rng.choice(ids)}/")
+
+    def bulk_update():
+        if ids := task_ids():
+            picked = rng.sample(ids, k=min(len(ids), 3))
+            api_client.patch(
+                "/api/v1/tasks/bulk/", {"ids": picked, "changes": {"category_name": "Bulk"}}, format="json"
+            )
+
+    def bulk_delete():
+        if ids := task_ids():
+            api_client.delete("/api/v1/tasks/bulk/", {"ids": rng.sample(ids, k=min(len(ids), 2))}, format="json")
+
+    def rename_category():
+        if categories := list(Category.objects.filter(user=user)):
+            category = rng.choice(categories)
+            api_client.patch(
+                f"/api/v1/categories/{category.id}/", {"name": f"Renamed {rng.random():.6f}"}, format="json"
+            )
+
+    def delete_category():
+        if categories := list(Category.objects.filter(user=user)):
+            api_client.delete(f"/api/v1/categories/{rng.choice(categories).id}/")
+
+    mutations = [create] * 4 + [update] * 3 + [delete, bulk_update, bulk_delete, rename_category, delete_category]
+    for _ in range(60):
+        rng.choice(mutations)()
+        if rng.random() < 0.3:
+            cursor = sync(api_client, replica, cursor, limit=rng.randint(1, 4))
+
+    sync(api_client, replica, cursor, limit=3)
+
+    assert replica == full_fetch(api_client)
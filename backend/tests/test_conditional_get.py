@@ -0,0 +1,116 @@
+from datetime import timedelta
+
+import pytest
+import redis
+from apps.tasks.models import Category, Task
+from django.core.cache import cache
+from django.utils import timezone
+from freezegun import freeze_time
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def task(user):
+    return Task.objects.create(title="Report", user=user)
+
+
+def test_list_returns_validators(api_client, task):
+    resp = api_client.get("/api/v1/tasks/")
+
+    assert resp.status_code == 200
+    assert resp["ETag"].startswith('"')
+    assert "Last-Modified" in resp
+
+
+def test_matching_etag_is_304_without_queries(api_client, task, django_assert_num_queries):
+    etag = api_client.get("/api/v1/tasks/")["ETag"]
+
+    with django_assert_num_queries(0):
+        resp = api_client.get("/api/v1/tasks/", HTTP_IF_NONE_MATCH=etag)
+
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp["ETag"] == etag
+
+
+def test_write_changes_etag(api_client, task):
+    etag = api_client.get("/api/v1/tasks/")["ETag"]
+
+    api_client.patch(f"/api/v1/tasks/{task.id}/", {"title": "Renamed"}, format="json")
+    resp = api_client.get("/api/v1/tasks/", HTTP_IF_NONE_MATCH=etag)
+
+    assert resp.status_code == 200
+    assert resp["ETag"] != etag
+    assert resp.data[0]["title"] == "Renamed"
+
+
+def test_etag_depends_on_representation(api_client, task):
+    full = api_client.get("/api/v1/tasks/")["ETag"]
+    narrow = api_client.get("/api/v1/tasks/?fields=title")
+
+    assert narrow["ETag"] != full
+    assert api_client.get("/api/v1/tasks/?fields=title", HTTP_IF_NONE_MATCH=full).status_code == 200
+
+
+def test_etag_is_per_user(api_client, other_user, task):
+    from rest_framework.test import APIClient
+
+    other = APIClient()
+    other.force_authenticate(user=other_user)
+    etag = api_client.get("/api/v1/tasks/")["ETag"]
+
+    assert other.get("/api/v1/tasks/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_retrieve_304(api_client, task):
+    etag = api_client.get(f"/api/v1/tasks/{task.id}/")["ETag"]
+
+    assert api_client.get(f"/api/v1/tasks/{task.id}/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+
+def test_missing_task_has_no_validators(api_client, user):
+    resp = api_client.get("/api/v1/tasks/1/")
+
+    assert resp.status_code == 404
+    assert "ETag" not in resp
+
+
+def test_category_list_304_and_invalidation(api_client, user):
+    category = Category.objects.create(name="Work", user=user)
+    etag = api_client.get("/api/v1/categories/")["ETag"]
+
+    assert api_client.get("/api/v1/categories/", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    category.delete()
+    assert api_client.get("/api/v1/categories/", HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+def test_if_modified_since(api_client, task):
+    last_modified = api_client.get("/api/v1/tasks/")["Last-Modified"]
+
+    assert api_client.get("/api/v1/tasks/", HTTP_IF_MODIFIED_SINCE=last_modified).status_code == 304
+
+
+def test_no_validators_when_cache_is_down(api_client, task, monkeypatch):
+    def down(*args, **kwargs):
+        raise redis.ConnectionError("Connection refused")
+
+    monkeypatch.setattr(cache, "get_many", down)
+    resp = api_client.get("/api/v1/tasks/", HTTP_IF_NONE_MATCH="*")
+
+    assert resp.status_code == 200
+    assert "ETag" not in resp
+
+
+def test_overdue_filter_is_never_answered_304(api_client, user):
+    Task.objects.create(title="Soon", user=user, deadline=timezone.now() + timedelta(minutes=5))
+    resp = api_client.get("/api/v1/tasks/?overdue=true")
+    assert resp.data == []
+    assert "ETag" not in resp
+
+    with freeze_time(timezone.now() + timedelta(minutes=10)):
+        resp = api_client.get("/api/v1/tasks/?overdue=true", HTTP_IF_NONE_MATCH='"anything"')
+
+    assert resp.status_code == 200
+    assert [row["title"] for row in resp.data] == ["Soon"]
@@ -0,0 +1,201 @@
+import json
+from datetime import timedelta
+
+import pytest
+from apps.tasks import notifier as notifier_module
+from apps.tasks.models import Task
+from apps.tasks.notifier import DeadlineEvents, DeadlineNotifier
+from apps.tasks.sender import DELIVERED
+from apps.tasks.tasks import WARNING_LEAD
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = pytest.mark.django_db
+
+SECOND = timedelta(seconds=1)
+
+
+@pytest.fixture
+def now():
+    return timezone.now()
+
+
+@pytest.fixture
+def sent():
+    return []
+
+
+@pytest.fixture
+def notifier(sent):
+    return DeadlineNotifier(
+        horizon=timedelta(minutes=15),
+        reconcile_every=timedelta(minutes=5),
+        deliver_many=lambda messages: [sent.append(message) or DELIVERED for message in messages],
+    )
+
+
+class RecordingRedis:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+
+@pytest.fixture
+def events(monkeypatch):
+    client = RecordingRedis()
+    monkeypatch.setattr(notifier_module.deadline_events, "client", client)
+    return client
+
+
+def test_fires_warning_and_deadline_on_the_second(notifier, sent, user, now):
+    deadline = now + timedelta(minutes=12)
+    task = Task.objects.create(user=user, title="Ship it", deadline=deadline)
+    notifier.reconcile(now)
+
+    assert notifier.next_wakeup() == deadline - WARNING_LEAD
+    assert notifier.fire_due(deadline - WARNING_LEAD - SECOND) == 0
+    assert notifier.fire_due(deadline - WARNING_LEAD) == 1
+    assert notifier.fire_due(deadline - SECOND) == 0
+    assert notifier.fire_due(deadline) == 1
+
+    task.refresh_from_db()
+    assert task.is_pre_notified and task.is_notified
+    assert [chat_id for chat_id, _ in sent] == [12345, 12345]
+    assert "Due in: <b>10 min</b>" in sent[0][1]
+    assert "DEADLINE REACHED" in sent[1][1]
+
+
+def test_moved_deadline_moves_timers(notifier, sent, user, now):
+    task = Task.objects.create(user=user, title="Ship it", deadline=now + timedelta(minutes=12))
+    notifier.reconcile(now)
+
+    task.deadline = now + timedelta(minutes=14)
+    task.save()
+    notifier.refresh([task.id], now)
+
+    assert notifier.fire_due(now + timedelta(minutes=3)) == 0
+    assert notifier.fire_due(now + timedelta(minutes=4)) == 1
+    assert notifier.fire_due(now + timedelta(minutes=13)) == 0
+    assert notifier.fire_due(now + timedelta(minutes=14)) == 1
+
+
+@pytest.mark.parametrize("change", ["complete", "delete"])
+def test_completed_or_deleted_task_cancels_timers(notifier, sent, user, now, change):
+    task = Task.objects.create(user=user, title="Ship it", deadline=now + timedelta(minutes=12))
+    notifier.reconcile(now)
+
+    if change == "complete":
+        task.is_completed = True
+        task.save()
+    else:
+        task.delete()
+    notifier.refresh([task.id], now)
+
+    assert notifier.fire_due(now + timedelta(minutes=20)) == 0
+    assert sent == []
+
+
+def test_overdue_task_gets_only_the_deadline_message_at_once(notifier, sent, user, now):
+    Task.objects.create(user=user, title="Late", deadline=now - timedelta(minutes=1))
+    notifier.reconcile(now)
+
+    assert notifier.fire_due(now) == 1
+    assert "DEADLINE REACHED" in sent[0][1]
+
+
+def test_deadlines_beyond_horizon_wait_for_reconciliation(notifier, sent, user, now):
+    task = Task.objects.create(user=user, title="Far", deadline=now + timedelta(minutes=40))
+    notifier.reconcile(now)
+
+    assert task.id not in notifier.tasks
+    assert notifier.next_wakeup() == now + timedelta(minutes=5)
+
+    notifier.reconcile(now + timedelta(minutes=20))
+
+    assert task.id in notifier.tasks
+
+
+def test_skips_users_without_telegram(notifier, sent, now):
+    silent = get_user_model().objects.create(username="silent")
+    task = Task.objects.create(user=silent, title="Quiet", deadline=now - timedelta(minutes=1))
+    notifier.reconcile(now)
+
+    assert notifier.fire_due(now) == 0
+    # Claimed all the same, so the next reconciliation scan no longer finds it
+    task.refresh_from_db()
+    assert task.is_notified
+    assert sent == []
+
+
+def test_notification_is_claimed_once_across_notifiers(notifier, sent, user, now):
+    Task.objects.create(user=user, title="Late", deadline=now - timedelta(minutes=1))
+    other = DeadlineNotifier(deliver_many=notifier.deliver_many)
+    notifier.reconcile(now)
+    other.reconcile(now)
+
+    assert notifier.fire_due(now) + other.fire_due(now) == 1
+    assert len(sent) == 1
+
+
+def test_idle_notifier_does_not_touch_the_database(notifier, user, now):
+    Task.objects.create(user=user, title="Far", deadline=now + timedelta(hours=2))
+    notifier.reconcile(now)
+
+    with CaptureQueriesContext(connection) as ctx:
+        for second in range(300):
+            notifier.fire_due(now + second * SECOND)
+
+    assert len(ctx) == 0
+
+
+def test_writes_publish_task_ids_after_commit(api_client, user, events, now, django_capture_on_commit_callbacks):
+    task = Task.objects.create(user=user, title="Ship it")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.patch(f"/api/v1/tasks/{task.id}/", {"deadline": now.isoformat()}, format="json")
+        Task.objects.filter(pk=task.pk).first().save(update_fields=["is_notified"])
+        api_client.patch("/api/v1/tasks/bulk/", {"ids": [task.id], "changes": {"is_completed": True}}, format="json")
+        api_client.patch("/api/v1/tasks/bulk/", {"ids": [task.id], "changes": {"title": "Renamed"}}, format="json")
+        api_client.delete(f"/api/v1/tasks/{task.id}/")
+
+    assert events.published == [(DeadlineEvents.CHANNEL, [task.id])] * 3
+
+
+class VirtualPubSub:
+    """Pub/sub stand-in on a virtual clock: waiting for a message advances time by the timeout."""
+
+    def __init__(self, now, messages):
+        self.now = now
+        self.messages = messages
+
+    def clock(self):
+        return self.now
+
+    def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        if self.messages and self.messages[0][0] <= self.now + timedelta(seconds=timeout):
+            at, deliver = self.messages.pop(0)
+            self.now = max(self.now, at)
+            return {"type": "message", "data": deliver()}
+        self.now += timedelta(seconds=timeout)
+        return None
+
+
+def test_run_applies_events_and_fires_on_time(notifier, sent, user, now):
+    task = Task.objects.create(user=user, title="Ship it", deadline=now + timedelta(hours=1))
+
+    def move_into_horizon():
+        Task.objects.filter(pk=task.pk).update(deadline=now + timedelta(minutes=12))
+        return json.dumps([task.id])
+
+    pubsub = VirtualPubSub(now, [(now + timedelta(seconds=30), move_into_horizon)])
+    notifier.run(pubsub, clock=pubsub.clock, should_stop=lambda: pubsub.now >= now + timedelta(minutes=13))
+
+    assert len(sent) == 2
+    assert "Due in: <b>10 min</b>" in sent[0][1]
+    assert "DEADLINE REACHED" in sent[1][1]
+    # Lags since the last reconciliation: the deadline message, to the microsecond
+    assert notifier.lags == [0.0]
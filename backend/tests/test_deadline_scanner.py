@@ -0,0 +1,134 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from apps.tasks import outbox
+from apps.tasks.models import Notification, Task
+from apps.tasks.sender import DELIVERED
+from apps.tasks.tasks import WARNING_LEAD, check_deadlines
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def now():
+    return timezone.now()
+
+
+def test_warning_scan_uses_partial_index(now, explain):
+    plan = explain(Task.objects.due_for_warning(now, WARNING_LEAD).select_related("user"))
+
+    assert "task_warning_due_idx" in plan
+
+
+def test_deadline_scan_uses_partial_index(now, explain):
+    plan = explain(Task.objects.due_for_deadline(now).select_related("user"))
+
+    assert "task_deadline_due_idx" in plan
+
+
+def test_due_for_warning_selects_open_unwarned_tasks_in_window(user, now):
+    due = Task.objects.create(title="due", user=user, deadline=now + timedelta(minutes=5))
+    Task.objects.create(title="later", user=user, deadline=now + timedelta(minutes=30))
+    Task.objects.create(title="past", user=user, deadline=now - timedelta(minutes=1))
+    Task.objects.create(title="done", user=user, deadline=now + timedelta(minutes=5), is_completed=True)
+    Task.objects.create(title="warned", user=user, deadline=now + timedelta(minutes=5), is_pre_notified=True)
+
+    assert list(Task.objects.due_for_warning(now, WARNING_LEAD)) == [due]
+
+
+def test_due_for_deadline_selects_open_unnotified_tasks_oldest_first(user, now):
+    older = Task.objects.create(title="older", user=user, deadline=now - timedelta(hours=1))
+    newer = Task.objects.create(title="newer", user=user, deadline=now - timedelta(minutes=1))
+    Task.objects.create(title="future", user=user, deadline=now + timedelta(minutes=1))
+    Task.objects.create(title="done", user=user, deadline=now - timedelta(minutes=1), is_completed=True)
+    Task.objects.create(title="notified", user=user, deadline=now - timedelta(minutes=1), is_notified=True)
+    Task.objects.create(title="no deadline", user=user)
+
+    assert list(Task.objects.due_for_deadline(now)) == [older, newer]
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    messages = []
+
+    def deliver_many(batch):
+        messages.extend(batch)
+        return [DELIVERED] * len(batch)
+
+    monkeypatch.setattr(outbox, "get_sender", lambda: SimpleNamespace(deliver_many=deliver_many))
+    return messages
+
+
+def test_check_deadlines_sends_and_flags_once(user, now, sent):
+    warned = Task.objects.create(title="soon", user=user, deadline=now + timedelta(minutes=5))
+    expired = Task.objects.create(title="late", user=user, deadline=now - timedelta(minutes=1))
+
+    assert check_deadlines() == "Checked deadlines. Notifications sent: 2"
+    assert check_deadlines() == "Checked deadlines. Notifications sent: 0"
+
+    warned.refresh_from_db()
+    expired.refresh_from_db()
+    assert (warned.is_pre_notified, warned.is_notified) == (True, False)
+    assert (expired.is_pre_notified, expired.is_notified) == (False, True)
+    assert [chat_id for chat_id, _ in sent] == [12345, 12345]
+    assert "Task: <b>soon</b>" in sent[0][1]
+    assert "Task: <b>late</b>" in sent[1][1]
+
+
+def test_check_deadlines_leaves_other_columns_alone(user, now, sent):
+    task = Task.objects.create(title="late", user=user, deadline=now - timedelta(minutes=1))
+    before = Task.objects.values("title", "change_id", "updated_at").get(pk=task.pk)
+
+    check_deadlines()
+
+    assert Task.objects.values("title", "change_id", "updated_at").get(pk=task.pk) == before
+
+
+def test_check_deadlines_marks_tasks_of_users_without_telegram_handled(now, sent):
+    silent = get_user_model().objects.create(username="silent")
+    soon = Task.objects.create(title="soon", user=silent, deadline=now + timedelta(minutes=5))
+    late = Task.objects.create(title="late", user=silent, deadline=now - timedelta(minutes=1))
+
+    check_deadlines()
+
+    soon.refresh_from_db()
+    late.refresh_from_db()
+    assert soon.is_pre_notified
+    assert late.is_notified
+    assert sent == []
+    assert not Notification.objects.exists()
+    # Out of the partial indexes' scans from now on
+    assert not Task.objects.due_for_warning(now, WARNING_LEAD).exists()
+    assert not Task.objects.due_for_deadline(now).exists()
+
+
+def test_claim_returns_each_row_once(user, now):
+    task = Task.objects.create(title="late", user=user, deadline=now - timedelta(minutes=1))
+    due = Task.objects.due_for_deadline(now)
+
+    assert due.claim("is_notified") == [(task.id, "late", task.deadline, 12345)]
+    assert due.claim("is_notified") == []
+
+
+@pytest.mark.parametrize("due", [0, 1, 25])
+def test_check_deadlines_query_count_is_constant(user, now, sent, due):
+    for i in range(due):
+        Task.objects.create(title=f"soon {i}", user=user, deadline=now + timedelta(minutes=5))
+        Task.objects.create(title=f"late {i}", user=user, deadline=now - timedelta(minutes=i + 1))
+
+    with CaptureQueriesContext(connection) as ctx:
+        check_deadlines()
+
+    statements = [
+        q["sql"].split()[0] for q in ctx.captured_queries if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))
+    ]
+    # Two claims; with anything due, the outbox insert, the tasks re-read to render the
+    # messages and marking each kind delivered
+    expected = ["UPDATE", "UPDATE", "INSERT", "SELECT", "UPDATE", "UPDATE"]
+    assert statements == expected if due else ["UPDATE", "UPDATE"]
+    assert len(sent) == 2 * due
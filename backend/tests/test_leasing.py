@@ -0,0 +1,296 @@
+import multiprocessing
+import sqlite3
+import time
+from multiprocessing.managers import BaseManager
+
+import pytest
+import redis
+from apps.core import leasing, snowflake
+from apps.core.leasing import MachineIdLease
+
+
+class FakeRedis:
+    """In-memory stand-in for the handful of Redis commands the lease uses."""
+
+    def __init__(self):
+        self.store: dict[str, tuple[str, float]] = {}
+
+    def _alive(self, key):
+        item = self.store.get(key)
+        if item and item[1] > time.monotonic():
+            return item[0]
+        self.store.pop(key, None)
+        return None
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and self._alive(key) is not None:
+            return None
+        self.store[key] = (value, time.monotonic() + ex)
+        return True
+
+    def eval(self, script, numkeys, key, token, *args):
+        if self._alive(key) != token:
+            return 0
+        if script == leasing.RENEW_SCRIPT:
+            self.store[key] = (token, time.monotonic() + int(args[0]))
+        else:
+            del self.store[key]
+        return 1
+
+    def expire_now(self, key):
+        self.store.pop(key, None)
+
+
+class FakeRedisManager(BaseManager):
+    pass
+
+
+FakeRedisManager.register("FakeRedis", FakeRedis)
+
+
+@pytest.fixture
+def client():
+    return FakeRedis()
+
+
+def test_acquire_claims_distinct_ids(client):
+    leases = [MachineIdLease(client) for _ in range(10)]
+
+    ids = {lease.acquire() for lease in leases}
+
+    assert len(ids) == 10
+    assert None not in ids
+
+
+def test_acquire_returns_none_when_exhausted(client):
+    first = MachineIdLease(client, max_machine_id=1)
+    second = MachineIdLease(client, max_machine_id=1)
+    third = MachineIdLease(client, max_machine_id=1)
+
+    assert first.acquire() is not None
+    assert second.acquire() is not None
+    assert third.acquire() is None
+
+
+def test_release_frees_id_for_others(client):
+    lease = MachineIdLease(client, max_machine_id=0)
+    other = MachineIdLease(client, max_machine_id=0)
+
+    assert lease.acquire() == 0
+    assert other.acquire() is None
+
+    lease.release()
+
+    assert other.acquire() == 0
+
+
+def test_release_does_not_delete_foreign_lease(client):
+    lease = MachineIdLease(client, max_machine_id=0)
+    lease.acquire()
+    client.expire_now("snowflake:machine:0")
+    thief = MachineIdLease(client, max_machine_id=0)
+    thief.acquire()
+
+    lease.release()
+
+    assert client._alive("snowflake:machine:0") == thief.token
+
+
+def test_heartbeat_renews_owned_lease(client):
+    lease = MachineIdLease(client)
+    machine_id = lease.acquire()
+
+    lease.heartbeat()
+
+    assert lease.machine_id == machine_id
+    assert client._alive(f"snowflake:machine:{machine_id}") == lease.token
+
+
+def test_heartbeat_reclaims_expired_id(client):
+    changes = []
+    lease = MachineIdLease(client, on_change=changes.append)
+    machine_id = lease.acquire()
+    client.expire_now(f"snowflake:machine:{machine_id}")
+
+    lease.heartbeat()
+
+    assert lease.machine_id == machine_id
+    assert changes == []
+
+
+def test_heartbeat_switches_id_when_stolen(client):
+    changes = []
+    lease = MachineIdLease(client, max_machine_id=1, on_change=changes.append)
+    machine_id = lease.acquire()
+    client.expire_now(f"snowflake:machine:{machine_id}")
+    client.set(f"snowflake:machine:{machine_id}", "someone-else", nx=True, ex=30)
+
+    lease.heartbeat()
+
+    assert lease.machine_id == 1 - machine_id
+    assert changes == [1 - machine_id]
+
+
+def test_heartbeat_survives_redis_errors(client, monkeypatch):
+    lease = MachineIdLease(client)
+    machine_id = lease.acquire()
+    monkeypatch.setattr(lease, "renew", lambda: (_ for _ in ()).throw(redis.ConnectionError("down")))
+
+    lease.heartbeat()
+
+    assert lease.machine_id == machine_id
+
+
+def test_generator_refuses_ids_once_lease_outlives_redis_outage(client, monkeypatch):
+    now = [1000.0]
+    lease = MachineIdLease(client, ttl=30)
+    lease.clock = lambda: now[0]
+    machine_id = lease.acquire()
+    generator = snowflake.SnowflakeGenerator(machine_id=machine_id, is_valid=lease.is_valid)
+    down = redis.ConnectionError("down")
+    monkeypatch.setattr(client, "eval", lambda *args: (_ for _ in ()).throw(down))
+
+    now[0] += 29
+    lease.heartbeat()
+    assert generator.next_id()
+
+    # Past the TTL the key may have expired and been leased by another process
+    now[0] += 1
+    lease.heartbeat()
+    with pytest.raises(snowflake.MachineIdExpiredError):
+        generator.next_id()
+    with pytest.raises(snowflake.MachineIdExpiredError):
+        generator.next_ids(10)
+
+    # Redis is back: the heartbeat re-claims the id and generation resumes
+    monkeypatch.undo()
+    client.expire_now(f"snowflake:machine:{machine_id}")
+    lease.heartbeat()
+    assert lease.machine_id == machine_id
+    assert generator.next_id()
+
+
+@pytest.fixture
+def installed(monkeypatch, client):
+    """Run install_generator() against `client`, restoring the process-wide generator and lease afterwards."""
+    monkeypatch.setattr(snowflake, "generator", snowflake.generator)
+    monkeypatch.setattr(leasing, "_lease", None)
+    monkeypatch.setattr(leasing.redis.Redis, "from_url", lambda url, **kwargs: client)
+    monkeypatch.setattr(leasing.atexit, "register", lambda func: None)
+    yield
+    if leasing._lease is not None:
+        leasing._lease.release()
+
+
+def test_install_generator_uses_static_id_without_lease_url(installed, settings):
+    settings.SNOWFLAKE_LEASE_REDIS_URL = ""
+    settings.SNOWFLAKE_MACHINE_ID = 7
+
+    leasing.install_generator()
+
+    assert snowflake.generator.machine_id == 7
+
+
+def test_install_generator_leases_an_id(installed, client, settings):
+    settings.SNOWFLAKE_LEASE_REDIS_URL = "redis://redis/1"
+
+    leasing.install_generator()
+
+    assert client._alive(f"snowflake:machine:{snowflake.generator.machine_id}") == leasing._lease.token
+
+
+def test_no_static_fallback_while_redis_is_down(installed, client, settings, monkeypatch):
+    settings.SNOWFLAKE_LEASE_REDIS_URL = "redis://redis/1"
+    settings.SNOWFLAKE_MACHINE_ID = 5
+    down = [True]
+
+    def set_(*args, **kwargs):
+        if down[0]:
+            raise redis.ConnectionError("down")
+        return FakeRedis.set(client, *args, **kwargs)
+
+    monkeypatch.setattr(client, "set", set_)
+
+    leasing.install_generator()
+
+    with pytest.raises(snowflake.MachineIdUnavailableError):
+        snowflake.generator.next_id()
+
+    # Redis is back: the next request leases an id
+    down[0] = False
+    assert snowflake.generator.next_id()
+    assert snowflake.generator.machine_id == leasing._lease.machine_id
+
+
+def test_forked_child_leases_its_own_id_on_first_use(installed, client, settings, monkeypatch):
+    settings.SNOWFLAKE_LEASE_REDIS_URL = "redis://redis/1"
+    leasing.install_generator()
+    parent = leasing._lease
+    calls = []
+    monkeypatch.setattr(
+        client, "set", lambda *args, **kwargs: calls.append(args) or FakeRedis.set(client, *args, **kwargs)
+    )
+
+    leasing._release_after_fork()
+
+    # Nothing blocking in the fork hook itself
+    assert calls == []
+    assert isinstance(snowflake.generator, leasing.PendingLease)
+
+    snowflake.generator.next_id()
+
+    assert len(calls) >= 1
+    assert leasing._lease is not parent
+    assert snowflake.generator.machine_id != parent.machine_id
+    parent.release()
+
+
+def _lease_and_insert(client, db_path, count, barrier, results):
+    lease = MachineIdLease(client)
+    machine_id = lease.acquire()
+    generator = snowflake.SnowflakeGenerator(machine_id=machine_id)
+    barrier.wait()
+    ids = [generator.next_id() for _ in range(count)]
+
+    try:
+        with sqlite3.connect(db_path, timeout=60) as conn:
+            conn.executemany("INSERT INTO rows (id) VALUES (?)", [(uid,) for uid in ids])
+        results.put((machine_id, ids, None))
+    except sqlite3.IntegrityError as e:
+        results.put((machine_id, ids, str(e)))
+    finally:
+        lease.release()
+
+
+def test_concurrent_processes_never_collide(tmp_path):
+    """Several processes lease ids at once, generate in the same milliseconds and insert into one table."""
+    processes_count = 6
+    per_process = 20_000
+    ctx = multiprocessing.get_context("fork")
+    db_path = str(tmp_path / "ids.sqlite3")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE rows (id INTEGER PRIMARY KEY)")
+
+    with FakeRedisManager(ctx=ctx) as manager:
+        client = manager.FakeRedis()
+        barrier = ctx.Barrier(processes_count)
+        results = ctx.Queue()
+        processes = [
+            ctx.Process(target=_lease_and_insert, args=(client, db_path, per_process, barrier, results))
+            for _ in range(processes_count)
+        ]
+        for p in processes:
+            p.start()
+        collected = [results.get(timeout=60) for _ in processes]
+        for p in processes:
+            p.join(timeout=60)
+
+    machine_ids = [machine_id for machine_id, _, _ in collected]
+    all_ids = [uid for _, ids, _ in collected for uid in ids]
+    errors = [error for _, _, error in collected if error]
+
+    assert errors == []
+    assert len(set(machine_ids)) == processes_count
+    assert len(set(all_ids)) == processes_count * per_process
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0] == processes_count * per_process
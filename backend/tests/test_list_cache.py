@@ -0,0 +1,133 @@
+import pytest
+import redis
+from apps.tasks import cache as list_cache
+from apps.tasks.models import Category, Task
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def fresh_stats():
+    list_cache.reset_stats()
+
+
+def test_second_list_is_served_from_cache(api_client, user, django_assert_num_queries):
+    Task.objects.create(title="Cached", user=user)
+
+    first = api_client.get("/api/v1/tasks/")
+    with django_assert_num_queries(0):
+        second = api_client.get("/api/v1/tasks/")
+
+    assert first["X-Cache"] == "MISS"
+    assert second["X-Cache"] == "HIT"
+    assert second.data == first.data
+    assert list_cache.stats()["hit_rate"] == 0.5
+
+
+def test_create_invalidates_list(api_client):
+    api_client.get("/api/v1/tasks/")
+
+    api_client.post("/api/v1/tasks/", {"title": "New"}, format="json")
+    resp = api_client.get("/api/v1/tasks/")
+
+    assert resp["X-Cache"] == "MISS"
+    assert [row["title"] for row in resp.data] == ["New"]
+
+
+def test_update_and_delete_invalidate_list(api_client, user):
+    task = Task.objects.create(title="Old", user=user)
+    api_client.get("/api/v1/tasks/")
+
+    api_client.patch(f"/api/v1/tasks/{task.id}/", {"is_completed": True}, format="json")
+    assert api_client.get("/api/v1/tasks/").data[0]["is_completed"] is True
+
+    api_client.delete(f"/api/v1/tasks/{task.id}/")
+    assert api_client.get("/api/v1/tasks/").data == []
+
+
+def test_category_rename_invalidates_task_list(api_client, user):
+    category = Category.objects.create(name="Work", user=user)
+    Task.objects.create(title="Report", user=user, category=category)
+    api_client.get("/api/v1/tasks/")
+    api_client.get("/api/v1/categories/")
+
+    api_client.patch(f"/api/v1/categories/{category.id}/", {"name": "Office"}, format="json")
+
+    assert api_client.get("/api/v1/tasks/").data[0]["category_name"] == "Office"
+    assert [row["name"] for row in api_client.get("/api/v1/categories/").data] == ["Office"]
+
+
+def test_notification_flags_do_not_invalidate(api_client, user):
+    task = Task.objects.create(title="Soon", user=user)
+    api_client.get("/api/v1/tasks/")
+
+    task.is_pre_notified = True
+    task.save(update_fields=["is_pre_notified"])
+
+    assert api_client.get("/api/v1/tasks/")["X-Cache"] == "HIT"
+
+
+def test_lists_are_per_user(api_client, user, other_user):
+    Task.objects.create(title="Mine", user=user)
+    Task.objects.create(title="Theirs", user=other_user)
+    other_client = APIClient()
+    other_client.force_authenticate(user=other_user)
+
+    api_client.get("/api/v1/tasks/")
+    resp = other_client.get("/api/v1/tasks/")
+
+    assert resp["X-Cache"] == "MISS"
+    assert [row["title"] for row in resp.data] == ["Theirs"]
+
+
+def test_manual_invalidation_covers_bulk_writes(api_client, user):
+    task = Task.objects.create(title="Bulk", user=user)
+    api_client.get("/api/v1/tasks/")
+
+    Task.objects.filter(pk=task.pk).update(title="Renamed")
+    assert api_client.get("/api/v1/tasks/").data[0]["title"] == "Bulk"
+
+    list_cache.invalidate_user_lists(user.id)
+    assert api_client.get("/api/v1/tasks/").data[0]["title"] == "Renamed"
+
+
+def test_paginated_requests_bypass_cache(api_client, user):
+    Task.objects.create(title="Paged", user=user)
+
+    resp = api_client.get("/api/v1/tasks/?page_size=10")
+
+    assert "X-Cache" not in resp
+    assert list_cache.stats()["hits"] + list_cache.stats()["misses"] == 0
+
+
+def test_falls_back_to_database_when_redis_is_down(api_client, user, monkeypatch):
+    Task.objects.create(title="Still here", user=user)
+
+    def down(*args, **kwargs):
+        raise redis.ConnectionError("Connection refused")
+
+    monkeypatch.setattr(cache, "get", down)
+    monkeypatch.setattr(cache, "incr", down)
+    resp = api_client.get("/api/v1/tasks/")
+    api_client.post("/api/v1/tasks/", {"title": "Written anyway"}, format="json")
+
+    assert resp.status_code == 200
+    assert [row["title"] for row in resp.data] == ["Still here"]
+    assert list_cache.stats()["errors"] == 1
+    assert Task.objects.filter(title="Written anyway").exists()
+
+
+def test_without_a_shared_cache_lists_and_validators_are_off(api_client, user, settings):
+    settings.CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    Task.objects.create(title="First", user=user)
+
+    first = api_client.get("/api/v1/tasks/")
+    Task.objects.create(title="Second", user=user)
+    second = api_client.get("/api/v1/tasks/", HTTP_IF_NONE_MATCH="*")
+
+    assert first["X-Cache"] == second["X-Cache"] == "MISS"
+    assert second.status_code == 200
+    assert "ETag" not in first
+    assert [row["title"] for row in second.data] == ["Second", "First"]
@@ -0,0 +1,39 @@
+import pytest
+from apps.tasks.models import Category, Task
+
+pytestmark = pytest.mark.django_db
+
+
+def test_task_list_is_single_index_scan(user, explain):
+    plan = explain(Task.objects.filter(user=user))
+
+    assert "task_user_id_desc_idx" in plan
+    assert "TEMP B-TREE" not in plan
+    assert "Sort" not in plan
+
+
+def test_task_cursor_page_is_single_index_scan(user, explain):
+    plan = explain(Task.objects.filter(user=user, id__lt=10**18)[:50])
+
+    assert "task_user_id_desc_idx" in plan
+    assert "TEMP B-TREE" not in plan
+    assert "Sort" not in plan
+
+
+def test_category_list_is_single_index_scan(user, explain):
+    plan = explain(Category.objects.filter(user=user))
+
+    assert "category_user_name_idx" in plan
+    assert "TEMP B-TREE" not in plan
+    assert "Sort" not in plan
+
+
+def test_categories_are_listed_by_name(api_client, user):
+    for name in ["Work", "Home", "Sport"]:
+        Category.objects.create(name=name, user=user)
+
+    resp = api_client.get("/api/v1/categories/")
+    paged = api_client.get("/api/v1/categories/?page_size=2")
+
+    assert [c["name"] for c in resp.data] == ["Home", "Sport", "Work"]
+    assert [c["name"] for c in paged.data["results"]] == ["Home", "Sport"]
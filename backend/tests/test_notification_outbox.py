@@ -0,0 +1,175 @@
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from apps.tasks import outbox
+from apps.tasks.models import Notification, Task
+from apps.tasks.sender import DELIVERED, FAILED, REJECTED
+from apps.tasks.tasks import check_deadlines
+from django.db import transaction
+from django.utils import timezone
+
+pytestmark = pytest.mark.django_db
+
+SECOND = timedelta(seconds=1)
+
+
+class FlakyTelegram:
+    """deliver_many stand-in answering with scripted outcomes, then DELIVERED."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.sent = []
+
+    def __call__(self, messages):
+        self.sent.extend(messages)
+        return [self.outcomes.pop(0) if self.outcomes else DELIVERED for _ in messages]
+
+
+@pytest.fixture
+def now():
+    return timezone.now()
+
+
+@pytest.fixture
+def late_task(user, now):
+    return Task.objects.create(user=user, title="Late", deadline=now - timedelta(minutes=1))
+
+
+def queue(task, now, kind=Notification.Kind.DEADLINE):
+    notification = (task.id, kind, task.user.telegram_id, f"{kind} {task.title}")
+    outbox.enqueue([notification], now)
+    return [notification]
+
+
+def test_failed_send_is_retried_with_backoff(late_task, now, monkeypatch):
+    telegram = FlakyTelegram(FAILED, FAILED)
+    monkeypatch.setattr(outbox, "get_sender", lambda: SimpleNamespace(deliver_many=telegram))
+
+    assert check_deadlines() == "Checked deadlines. Notifications sent: 0"
+
+    # The flag is set and the message kept for later, not lost
+    late_task.refresh_from_db()
+    notification = Notification.objects.get()
+    assert late_task.is_notified
+    assert (notification.status, notification.attempts) == (Notification.Status.PENDING, 1)
+    retry_at = notification.next_attempt_at
+    assert 30 * SECOND <= retry_at - now < 31 * SECOND
+
+    assert outbox.deliver_due(retry_at - SECOND, deliver_many=telegram) == 0
+    assert outbox.deliver_due(retry_at, deliver_many=telegram) == 0
+    notification.refresh_from_db()
+    assert notification.next_attempt_at == retry_at + 60 * SECOND
+
+    assert outbox.deliver_due(retry_at + 60 * SECOND, deliver_many=telegram) == 1
+    notification.refresh_from_db()
+    assert (notification.status, notification.attempts) == (Notification.Status.DELIVERED, 3)
+    assert notification.delivered_at == retry_at + 60 * SECOND
+    assert len(telegram.sent) == 3
+
+
+def test_gives_up_after_max_attempts(late_task, now, settings):
+    settings.NOTIFICATION_MAX_ATTEMPTS = 2
+    telegram = FlakyTelegram(FAILED, FAILED, FAILED)
+
+    outbox.send(queue(late_task, now), now, deliver_many=telegram)
+    outbox.deliver_due(now + timedelta(hours=1), deliver_many=telegram)
+    outbox.deliver_due(now + timedelta(hours=2), deliver_many=telegram)
+
+    assert Notification.objects.get().status == Notification.Status.DEAD
+    assert len(telegram.sent) == 2
+
+
+def test_rejected_message_is_not_retried(late_task, now):
+    telegram = FlakyTelegram(REJECTED)
+
+    outbox.send(queue(late_task, now), now, deliver_many=telegram)
+    outbox.deliver_due(now + timedelta(hours=1), deliver_many=telegram)
+
+    assert (Notification.objects.get().status, len(telegram.sent)) == (Notification.Status.DEAD, 1)
+
+
+def test_enqueue_is_idempotent_per_task_and_kind(late_task, now):
+    queue(late_task, now)
+    queue(late_task, now + SECOND)
+    queue(late_task, now, kind=Notification.Kind.WARNING)
+
+    assert Notification.objects.filter(task=late_task).count() == 2
+
+
+def test_claim_and_outbox_row_commit_together(late_task, now):
+    with pytest.raises(RuntimeError), transaction.atomic():
+        Task.objects.due_for_deadline(now).claim("is_notified")
+        queue(late_task, now)
+        raise RuntimeError("worker died")
+
+    late_task.refresh_from_db()
+    assert not late_task.is_notified
+    assert not Notification.objects.exists()
+
+
+def test_queued_rows_of_a_crashed_claimer_are_sent_after_the_lease(late_task, now, settings):
+    # Committed, but the claimer died before sending
+    queue(late_task, now)
+    telegram = FlakyTelegram()
+    lease = timedelta(seconds=settings.NOTIFICATION_LEASE_SECONDS)
+
+    assert outbox.deliver_due(now + lease - SECOND, deliver_many=telegram) == 0
+    assert outbox.deliver_due(now + lease, deliver_many=telegram) == 1
+    assert Notification.objects.get().attempts == 2
+
+
+def test_retries_are_leased_to_one_worker(late_task, now):
+    outbox.send(queue(late_task, now), now, deliver_many=FlakyTelegram(FAILED))
+    retry_at = Notification.objects.get().next_attempt_at
+    other_worker = []
+
+    def deliver_many(messages):
+        # A second worker running while this batch is in flight finds nothing to send
+        other_worker.append(outbox.deliver_due(retry_at, deliver_many=FlakyTelegram()))
+        return [DELIVERED] * len(messages)
+
+    assert outbox.deliver_due(retry_at, deliver_many=deliver_many) == 1
+    assert other_worker == [0]
+
+
+def test_retries_go_in_batches_until_nothing_is_due(user, now, settings):
+    settings.NOTIFICATION_BATCH_SIZE = 4
+    for i in range(10):
+        queue(Task.objects.create(user=user, title=f"Late {i}", deadline=now), now)
+    telegram = FlakyTelegram()
+
+    later = now + timedelta(seconds=settings.NOTIFICATION_LEASE_SECONDS)
+    assert outbox.deliver_due(later, deliver_many=telegram) == 10
+    assert len(telegram.sent) == 10
+
+
+def test_retried_warning_is_rendered_at_send_time(user, now):
+    task = Task.objects.create(user=user, title="Soon", deadline=now + timedelta(minutes=9))
+    outbox.send(queue(task, now, kind=Notification.Kind.WARNING), now, deliver_many=FlakyTelegram(FAILED))
+    Task.objects.filter(pk=task.pk).update(title="Renamed")
+    telegram = FlakyTelegram()
+
+    retry_at = Notification.objects.get().next_attempt_at
+    assert outbox.deliver_due(retry_at, deliver_many=telegram) == 1
+    assert telegram.sent == [(user.telegram_id, outbox.warning_text("Renamed", task.deadline, retry_at))]
+
+
+def test_warning_past_its_deadline_is_skipped(user, now):
+    task = Task.objects.create(user=user, title="Soon", deadline=now + timedelta(minutes=1))
+    outbox.send(queue(task, now, kind=Notification.Kind.WARNING), now, deliver_many=FlakyTelegram(FAILED))
+    telegram = FlakyTelegram()
+
+    assert outbox.deliver_due(now + timedelta(minutes=5), deliver_many=telegram) == 0
+    assert telegram.sent == []
+    assert Notification.objects.get().status == Notification.Status.SKIPPED
+
+
+def test_reminder_of_a_completed_task_is_skipped(late_task, now):
+    outbox.send(queue(late_task, now), now, deliver_many=FlakyTelegram(FAILED))
+    Task.objects.filter(pk=late_task.pk).update(is_completed=True)
+    telegram = FlakyTelegram()
+
+    assert outbox.deliver_due(now + timedelta(hours=1), deliver_many=telegram) == 0
+    assert telegram.sent == []
+    assert Notification.objects.get().status == Notification.Status.SKIPPED
@@ -0,0 +1,65 @@
+import pytest
+from apps.tasks.models import Category, Task
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def tasks(user):
+    return Task.objects.bulk_create(Task(title=f"Task {i}", user=user) for i in range(25))
+
+
+def test_list_without_params_stays_unpaginated(api_client, tasks):
+    resp = api_client.get("/api/v1/tasks/")
+
+    assert resp.status_code == 200
+    assert isinstance(resp.data, list)
+    assert len(resp.data) == 25
+
+
+def test_cursor_pages_walk_all_tasks_newest_first(api_client, tasks):
+    seen = []
+    url = "/api/v1/tasks/?page_size=10"
+
+    while url:
+        resp = api_client.get(url)
+        assert resp.status_code == 200
+        seen.extend(int(row["id"]) for row in resp.data["results"])
+        url = resp.data["next"]
+
+    assert seen == sorted((t.id for t in tasks), reverse=True)
+
+
+def test_cursor_is_stable_under_inserts(api_client, user, tasks):
+    first = api_client.get("/api/v1/tasks/?page_size=10")
+    Task.objects.create(title="Brand new", user=user)
+
+    second = api_client.get(first.data["next"])
+
+    first_ids = [row["id"] for row in first.data["results"]]
+    second_ids = [row["id"] for row in second.data["results"]]
+    assert not set(first_ids) & set(second_ids)
+    assert "Brand new" not in [row["title"] for row in second.data["results"]]
+
+
+def test_page_size_is_capped(api_client, tasks):
+    resp = api_client.get("/api/v1/tasks/?page_size=100000")
+
+    assert len(resp.data["results"]) == 25
+
+
+def test_pages_are_scoped_to_user(api_client, other_user, tasks):
+    Task.objects.create(title="Foreign", user=other_user)
+
+    resp = api_client.get("/api/v1/tasks/?page_size=100")
+
+    assert len(resp.data["results"]) == 25
+
+
+def test_categories_paginate(api_client, user):
+    Category.objects.bulk_create(Category(name=f"Cat {i}", user=user) for i in range(5))
+
+    resp = api_client.get("/api/v1/categories/?page_size=2")
+
+    assert len(resp.data["results"]) == 2
+    assert resp.data["next"]
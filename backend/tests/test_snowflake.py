@@ -1,8 +1,17 @@
+import threading
 import time
+from datetime import UTC, datetime, timedelta
 
 import pytest
 
-from backend.apps.core.snowflake import SnowflakeGenerator
+from backend.apps.core import snowflake
+from backend.apps.core.snowflake import (
+    ClockMovedBackwardsError,
+    SnowflakeGenerator,
+    id_to_datetime,
+    max_id_for,
+    min_id_for,
+)
 
 
 class TestSnowflakeGenerator:
@@ -39,3 +48,193 @@ class TestSnowflakeGenerator:
             generator.next_id()
 
         assert "Clock moved backwards" in str(excinfo.value)
+
+    def test_next_ids_are_unique_and_sorted(self, generator):
+        ids = generator.next_ids(10_000)
+
+        assert len(ids) == 10_000
+        assert len(set(ids)) == 10_000
+        assert ids == sorted(ids)
+
+    def test_next_ids_continue_after_next_id(self, generator):
+        first = generator.next_id()
+        block = generator.next_ids(5)
+        last = generator.next_id()
+
+        assert first < block[0]
+        assert block[-1] < last
+
+    def test_next_ids_are_contiguous_within_millisecond(self, generator):
+        generator._current_timestamp = lambda: generator.EPOCH + 1000
+
+        ids = generator.next_ids(100)
+
+        assert ids == list(range(ids[0], ids[0] + 100))
+        assert all((uid >> 12) & 0x3FF == 1 for uid in ids)
+
+    def test_next_ids_spill_into_next_millisecond(self, generator):
+        clock = iter(range(generator.EPOCH + 1000, generator.EPOCH + 2000))
+        generator._current_timestamp = lambda: next(clock)
+
+        ids = generator.next_ids(5000)
+
+        assert len(set(ids)) == 5000
+        assert ids == sorted(ids)
+        assert ids[4095] & 0xFFF == 4095
+        assert ids[4096] & 0xFFF == 0
+        assert (ids[4096] >> 22) > (ids[4095] >> 22)
+
+    def test_next_ids_zero_and_negative(self, generator):
+        assert generator.next_ids(0) == []
+
+        with pytest.raises(ValueError):
+            generator.next_ids(-1)
+
+    def test_reserve_iterates_block(self, generator):
+        assert len(list(generator.reserve(3))) == 3
+
+    def test_next_ids_thread_safety(self, generator):
+        results: list[list[int]] = []
+
+        def worker():
+            results.append(generator.next_ids(2000))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        all_ids = [uid for block in results for uid in block]
+        assert len(set(all_ids)) == 8 * 2000
+
+
+class TestSnowflakeClockHandling:
+    def _fake_clock(self, generator, wall_values):
+        wall = iter(wall_values)
+        generator._current_timestamp = lambda: next(wall)
+        # Frozen monotonic clock: projections while regressed never depend on real elapsed time
+        generator._monotonic_ms = lambda: 0
+
+    def test_rollover_sleeps_instead_of_spinning(self):
+        generator = SnowflakeGenerator(machine_id=1)
+        calls = 0
+        real = generator._current_timestamp
+        frozen = real()
+
+        def counting_clock():
+            # Both IDs must start in the same millisecond, so hold the clock for the first reads
+            nonlocal calls
+            calls += 1
+            return frozen if calls <= 3 else real()
+
+        generator._current_timestamp = counting_clock
+        generator.next_id()
+        generator.sequence = generator.max_sequence
+
+        last = generator.last_timestamp
+        uid = generator.next_id()
+
+        assert (uid >> 22) + generator.EPOCH > last
+        assert generator.rollovers == 1
+        assert generator.waits == 1
+        assert calls < 20
+
+    def test_spin_strategy_still_supported(self):
+        generator = SnowflakeGenerator(machine_id=1, wait_strategy="spin")
+        ids = generator.next_ids(10_000)
+
+        assert len(set(ids)) == 10_000
+        assert generator.rollovers >= 2
+
+    def test_unknown_wait_strategy(self):
+        with pytest.raises(ValueError):
+            SnowflakeGenerator(machine_id=1, wait_strategy="yield")
+
+    def test_small_backward_step_is_ridden_out(self):
+        generator = SnowflakeGenerator(machine_id=1, max_backward_ms=50)
+        base = generator.EPOCH + 10_000
+        self._fake_clock(generator, [base, base - 20, base - 19])
+
+        first = generator.next_id()
+        second = generator.next_id()
+        third = generator.next_id()
+
+        assert first < second < third
+        assert (second >> 22) >= (first >> 22)
+        assert generator.clock_regressions == 1
+
+    def test_regression_is_counted_once_per_step(self):
+        generator = SnowflakeGenerator(machine_id=1, max_backward_ms=50)
+        base = generator.EPOCH + 10_000
+        self._fake_clock(generator, [base, base - 5, base - 5, base - 4, base + 1, base - 3])
+
+        for _ in range(6):
+            generator.next_id()
+
+        assert generator.clock_regressions == 2
+
+    def test_large_backward_step_raises(self):
+        generator = SnowflakeGenerator(machine_id=1, max_backward_ms=50)
+        base = generator.EPOCH + 10_000
+        self._fake_clock(generator, [base, base - 51])
+
+        generator.next_id()
+
+        with pytest.raises(ClockMovedBackwardsError):
+            generator.next_id()
+
+    def test_stats(self):
+        generator = SnowflakeGenerator(machine_id=1)
+        generator.next_ids(5000)
+
+        stats = generator.stats()
+
+        assert set(stats) == {"machine_id", "issued", "rollovers", "waits", "wait_ms", "clock_regressions"}
+        assert stats["issued"] == 5000
+        assert stats["rollovers"] >= 1
+        assert stats["waits"] == stats["rollovers"]
+
+    def test_stats_are_logged_periodically(self, monkeypatch, caplog):
+        generator = SnowflakeGenerator(machine_id=1)
+        monkeypatch.setattr(snowflake, "STATS_LOG_EVERY", 100)
+        caplog.set_level("INFO", logger=snowflake.__name__)
+
+        for _ in range(99):
+            generator.next_id()
+        assert caplog.messages == []
+
+        generator.next_id()
+        generator.next_ids(250)
+
+        assert len(caplog.messages) == 2
+        assert caplog.messages[-1].startswith("Snowflake generator: {'machine_id': 1, 'issued': 350,")
+
+
+class TestSnowflakeDecoding:
+    def test_id_to_datetime_roundtrip(self):
+        generator = SnowflakeGenerator(machine_id=1)
+        before = datetime.now(UTC).replace(microsecond=0)
+        uid = generator.next_id()
+
+        created = id_to_datetime(uid)
+
+        assert created.tzinfo is not None
+        assert abs((created - datetime.now(UTC)).total_seconds()) < 1
+        assert created >= before
+
+    def test_min_max_bounds_contain_ids_of_that_millisecond(self):
+        generator = SnowflakeGenerator(machine_id=1023)
+        uid = generator.next_id()
+        created = id_to_datetime(uid)
+
+        assert min_id_for(created) <= uid <= max_id_for(created)
+        assert max_id_for(created) + 1 == min_id_for(created + timedelta(milliseconds=1))
+
+    def test_naive_datetime_is_utc(self):
+        aware = datetime(2025, 6, 1, 12, 0, tzinfo=UTC)
+
+        assert min_id_for(aware.replace(tzinfo=None)) == min_id_for(aware)
+
+    def test_datetime_before_epoch_clamps_to_zero(self):
+        assert min_id_for(datetime(2000, 1, 1, tzinfo=UTC)) == 0
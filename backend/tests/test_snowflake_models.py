@@ -0,0 +1,117 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from apps.core import snowflake
+from apps.core.models import next_snowflake_id, reserved_snowflake_ids
+from apps.tasks.models import Category, Task
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+
+@pytest.fixture
+def user(db):
+    return User.objects.create(username="bulk_user", telegram_id=111)
+
+
+def test_reserved_block_uses_single_generator_call():
+    gen = snowflake.SnowflakeGenerator(machine_id=3)
+
+    with patch.object(snowflake, "generator", gen), patch.object(gen, "next_id") as single:
+        with reserved_snowflake_ids(50):
+            ids = [next_snowflake_id() for _ in range(50)]
+
+    single.assert_not_called()
+    assert ids == sorted(set(ids))
+
+
+def test_reserved_block_refills_when_exhausted():
+    with reserved_snowflake_ids(4):
+        ids = [next_snowflake_id() for _ in range(10)]
+
+    assert len(set(ids)) == 10
+
+
+def test_reservation_is_restored_on_exit():
+    gen = snowflake.SnowflakeGenerator(machine_id=3)
+
+    with patch.object(snowflake, "generator", gen):
+        with reserved_snowflake_ids(10):
+            next_snowflake_id()
+        with patch.object(gen, "next_id", return_value=42) as single:
+            assert next_snowflake_id() == 42
+            single.assert_called_once()
+
+
+def test_bulk_create_from_generator_preassigns_ids(user):
+    gen = snowflake.SnowflakeGenerator(machine_id=3)
+
+    with patch.object(snowflake, "generator", gen), patch.object(gen, "next_id") as single:
+        created = Task.objects.bulk_create(Task(title=f"Task {i}", user=user) for i in range(300))
+
+    single.assert_not_called()
+    assert len({t.id for t in created}) == 300
+    assert Task.objects.filter(user=user).count() == 300
+
+
+def test_bulk_create_from_list_reserves_ids_up_front(user):
+    gen = snowflake.SnowflakeGenerator(machine_id=3)
+
+    with (
+        patch.object(snowflake, "generator", gen),
+        patch.object(gen, "next_id") as single,
+        patch.object(gen, "next_ids", wraps=gen.next_ids) as block,
+    ):
+        tasks = [Task(title=f"Task {i}", user=user) for i in range(300)]
+        assert {(t.id, t.change_id) for t in tasks} == {(None, None)}
+        Task.objects.bulk_create(tasks)
+
+    single.assert_not_called()
+    # One run covering each task's id and change_id
+    block.assert_called_once_with(600)
+    ids = [t.id for t in tasks]
+    assert ids == sorted(set(ids))
+    assert Task.objects.filter(user=user).count() == 300
+
+
+def test_bulk_create_keeps_explicit_ids(user):
+    categories = [Category(id=42, name="Fixed", user=user), Category(name="Drawn", user=user)]
+
+    Category.objects.bulk_create(categories)
+
+    assert categories[0].id == 42
+    assert Category.objects.filter(user=user).count() == 2
+
+
+def test_unsaved_instances_get_ids_on_save(user):
+    category = Category(name="Later", user=user)
+    assert category.id is None
+
+    category.save()
+
+    assert Category.objects.get(pk=category.id).name == "Later"
+
+
+def test_created_between_is_primary_key_range(user):
+    old, new = snowflake.SnowflakeGenerator(1), snowflake.SnowflakeGenerator(2)
+    old_time = datetime(2025, 3, 1, tzinfo=UTC)
+    new_time = datetime(2025, 6, 1, tzinfo=UTC)
+    old._current_timestamp = lambda: int(old_time.timestamp() * 1000)
+    new._current_timestamp = lambda: int(new_time.timestamp() * 1000)
+    early = Task.objects.create(id=old.next_id(), title="early", user=user)
+    late = Task.objects.create(id=new.next_id(), title="late", user=user)
+
+    window = Task.objects.created_between(old_time - timedelta(days=1), old_time + timedelta(days=1))
+
+    assert list(window) == [early]
+    assert list(Task.objects.created_between(start=new_time)) == [late]
+    assert list(Task.objects.created_between(end=new_time)) == [late, early]
+    assert "created_at" not in str(window.query).split("WHERE")[1]
+
+
+def test_tasks_are_ordered_newest_first(user):
+    first = Task.objects.create(title="first", user=user)
+    second = Task.objects.create(title="second", user=user)
+
+    assert list(Task.objects.filter(user=user)) == [second, first]
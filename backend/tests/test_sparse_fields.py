@@ -0,0 +1,95 @@
+import pytest
+from apps.tasks.models import Category, Task
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def task(user):
+    category = Category.objects.create(name="Work", user=user)
+    return Task.objects.create(title="Report", description="x" * 10_000, category=category, user=user)
+
+
+def selected_sql(ctx):
+    return next(q["sql"] for q in ctx.captured_queries if q["sql"].startswith("SELECT"))
+
+
+def test_list_fields(api_client, task):
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api_client.get("/api/v1/tasks/?fields=id,title,deadline,is_completed")
+
+    assert resp.status_code == 200
+    assert resp.data == [{"id": task.id, "title": "Report", "deadline": None, "is_completed": False}]
+    assert "description" not in selected_sql(ctx)
+    assert "tasks_category" not in selected_sql(ctx)
+
+
+def test_list_omit(api_client, task):
+    resp = api_client.get("/api/v1/tasks/?omit=description,created_at,updated_at")
+
+    assert set(resp.data[0]) == {"id", "title", "deadline", "is_completed", "category_name"}
+
+
+def test_fields_and_omit_combine(api_client, task):
+    resp = api_client.get("/api/v1/tasks/?fields=id,title,category_name&omit=id")
+
+    assert resp.data == [{"title": "Report", "category_name": "Work"}]
+
+
+def test_unknown_field_is_rejected(api_client, task):
+    resp = api_client.get("/api/v1/tasks/?fields=title,secret")
+
+    assert resp.status_code == 400
+    assert resp.data == {"fields": ["Unknown field(s): secret."]}
+
+
+def test_write_only_field_is_not_selectable(api_client, task):
+    assert api_client.get(f"/api/v1/tasks/{task.id}/?fields=category_id").status_code == 400
+
+
+def test_retrieve_defers_unselected_columns(api_client, task):
+    with CaptureQueriesContext(connection) as ctx:
+        resp = api_client.get(f"/api/v1/tasks/{task.id}/?fields=title,category_name")
+
+    assert resp.data == {"title": "Report", "category_name": "Work"}
+    assert len(ctx.captured_queries) == 1
+    assert "description" not in selected_sql(ctx)
+
+
+def test_paginated_list_without_id(api_client, user):
+    Task.objects.bulk_create(Task(title=f"Task {i}", user=user) for i in range(5))
+
+    first = api_client.get("/api/v1/tasks/?page_size=3&fields=title")
+    second = api_client.get(first.data["next"])
+
+    assert [row["title"] for row in first.data["results"] + second.data["results"]] == [
+        f"Task {i}" for i in range(4, -1, -1)
+    ]
+    assert "fields=title" in first.data["next"]
+
+
+def test_cached_lists_are_per_fieldset(api_client, task):
+    full = api_client.get("/api/v1/tasks/")
+    narrow = api_client.get("/api/v1/tasks/?fields=title")
+    narrow_again = api_client.get("/api/v1/tasks/?fields=title")
+
+    assert "description" in full.data[0]
+    assert narrow.data == narrow_again.data == [{"title": "Report"}]
+    assert narrow_again["X-Cache"] == "HIT"
+
+
+def test_category_fields(api_client, task):
+    resp = api_client.get("/api/v1/categories/?fields=name")
+    detail = api_client.get(f"/api/v1/categories/{task.category_id}/?omit=created_at")
+
+    assert resp.data == [{"name": "Work"}]
+    assert detail.data == {"id": task.category_id, "name": "Work"}
+
+
+def test_writes_ignore_fieldsets(api_client):
+    resp = api_client.post("/api/v1/tasks/?fields=title", {"title": "New", "description": "Kept"}, format="json")
+
+    assert resp.status_code == 201
+    assert resp.data["description"] == "Kept"
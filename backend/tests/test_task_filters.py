@@ -0,0 +1,148 @@
+import itertools
+from datetime import timedelta
+
+import pytest
+from apps.tasks.filters import TaskFilterBackend
+from apps.tasks.models import Category, Task
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/v1/tasks/"
+
+
+def filtered(user, **params):
+    request = Request(APIRequestFactory().get(URL, params))
+    return TaskFilterBackend().filter_queryset(request, Task.objects.filter(user=user), view=None)
+
+
+@pytest.mark.parametrize(
+    ("params", "index"),
+    [
+        ({"category": 1}, "task_user_category_idx"),
+        ({"is_completed": "false"}, "task_user_open_idx"),
+        ({"is_completed": "true"}, "task_user_done_idx"),
+        ({"deadline_after": "2026-01-01T00:00:00Z"}, "task_user_deadline_idx"),
+        ({"deadline_before": "2026-01-01T00:00:00Z"}, "task_user_deadline_idx"),
+        ({"overdue": "true"}, "task_user_open_deadline_idx"),
+        ({"overdue": "false"}, "task_user_done_idx"),
+        ({"overdue": "false"}, "task_user_deadline_idx"),
+        ({"is_completed": "false", "deadline_after": "2026-01-01T00:00:00Z"}, "task_user_open_deadline_idx"),
+        ({"category": 1, "is_completed": "false"}, "task_user_category_idx"),
+    ],
+)
+@pytest.mark.postgres
+def test_filter_is_index_scan(user, params, index, explain):
+    plan = explain(filtered(user, **params))
+
+    assert index in plan
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"category": 1}, {"is_completed": "false"}, {"is_completed": "true"}, {"category": 1, "is_completed": "true"}],
+)
+def test_filter_keeps_list_order_without_sort(user, params, explain):
+    plan = explain(filtered(user, **params)[:50])
+
+    assert "TEMP B-TREE" not in plan
+    assert "Sort" not in plan
+
+
+def test_filters(api_client, user, other_user):
+    now = timezone.now()
+    work = Category.objects.create(name="Work", user=user)
+    overdue = Task.objects.create(user=user, title="Overdue", deadline=now - timedelta(hours=1), category=work)
+    done = Task.objects.create(user=user, title="Done", deadline=now - timedelta(hours=1), is_completed=True)
+    upcoming = Task.objects.create(user=user, title="Upcoming", deadline=now + timedelta(days=1))
+    undated = Task.objects.create(user=user, title="Undated", category=work)
+    Task.objects.create(user=other_user, title="Theirs", deadline=now - timedelta(hours=1))
+
+    def ids(**params):
+        return [row["id"] for row in api_client.get(URL, params).data]
+
+    assert ids(category=work.id) == [undated.id, overdue.id]
+    assert ids(is_completed="true") == [done.id]
+    assert ids(is_completed="false") == [undated.id, upcoming.id, overdue.id]
+    assert ids(deadline_after=now.isoformat()) == [upcoming.id]
+    assert ids(deadline_before=now.isoformat()) == [done.id, overdue.id]
+    assert ids(overdue="true") == [overdue.id]
+    assert ids(overdue="false") == [undated.id, upcoming.id, done.id]
+    assert ids(category=work.id, overdue="true") == [overdue.id]
+
+
+def test_filters_combine_with_pagination(api_client, user):
+    tasks = [Task.objects.create(user=user, title=f"Task {i}", is_completed=i % 2 == 0) for i in range(6)]
+
+    resp = api_client.get(URL, {"is_completed": "true", "page_size": 2})
+    following = api_client.get(resp.data["next"])
+
+    completed = [t.id for t in reversed(tasks) if t.is_completed]
+    assert [row["id"] for row in resp.data["results"]] == completed[:2]
+    assert [row["id"] for row in following.data["results"]] == completed[2:]
+
+
+def test_filtered_list_bypasses_list_cache(api_client, user):
+    Task.objects.create(user=user, title="Open")
+
+    api_client.get(URL)
+    resp = api_client.get(URL, {"is_completed": "true"})
+
+    assert resp.data == []
+    assert "X-Cache" not in resp
+
+
+@pytest.mark.parametrize(
+    ("params", "field"),
+    [
+        ({"category": "work"}, "category"),
+        ({"deadline_after": "tomorrow"}, "deadline_after"),
+        ({"overdue": "x"}, "overdue"),
+    ],
+)
+def test_invalid_filter_value(api_client, params, field):
+    resp = api_client.get(URL, params)
+
+    assert resp.status_code == 400
+    assert field in resp.data
+
+
+# The (user, ...) indexes for list filters, see Task.Meta.indexes
+FILTER_INDEXES = (
+    "task_user_category_idx",
+    "task_user_open_idx",
+    "task_user_done_idx",
+    "task_user_deadline_idx",
+    "task_user_open_deadline_idx",
+)
+
+COMBINATION_VALUES = {
+    "category": 1,
+    "is_completed": "false",
+    "deadline_after": "2026-01-01T00:00:00Z",
+    "deadline_before": "2027-01-01T00:00:00Z",
+    "overdue": "true",
+}
+
+
+def filter_combinations():
+    for size in range(1, len(COMBINATION_VALUES) + 1):
+        for names in itertools.combinations(COMBINATION_VALUES, size):
+            params = {name: COMBINATION_VALUES[name] for name in names}
+            yield params
+            if "overdue" in params:
+                yield {**params, "overdue": "false"}
+
+
+@pytest.mark.postgres
+@pytest.mark.parametrize(
+    "params", list(filter_combinations()), ids=lambda params: "+".join(f"{k}={v}" for k, v in params.items())
+)
+def test_every_filter_combination_is_index_scan(user, params, explain):
+    plan = explain(filtered(user, **params))
+
+    assert "Seq Scan" not in plan
+    assert "task_user_id_desc_idx" not in plan
+    assert any(index in plan for index in FILTER_INDEXES)
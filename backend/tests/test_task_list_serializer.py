@@ -0,0 +1,49 @@
+from datetime import timedelta
+
+import pytest
+from apps.tasks.models import Category, Task
+from apps.tasks.serializers import TaskListSerializer, TaskSerializer
+from django.utils import timezone
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def tasks(user):
+    work = Category.objects.create(name="Work", user=user)
+    now = timezone.now()
+    return Task.objects.bulk_create(
+        Task(
+            title=f"Task {i}",
+            description="Details" * i,
+            deadline=now + timedelta(hours=i) if i % 2 else None,
+            is_completed=i % 3 == 0,
+            category=work if i % 4 else None,
+            user=user,
+        )
+        for i in range(12)
+    )
+
+
+def test_output_matches_model_serializer(user, tasks):
+    queryset = Task.objects.filter(user=user)
+
+    fast = TaskListSerializer(TaskListSerializer.rows(queryset), many=True).data
+    full = TaskSerializer(queryset.select_related("category"), many=True).data
+
+    assert [dict(row) for row in fast] == [dict(row) for row in full]
+
+
+def test_list_endpoint_is_one_query(api_client, tasks, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        resp = api_client.get("/api/v1/tasks/")
+
+    assert len(resp.data) == 12
+    assert resp.data[1]["category_name"] == "Work"
+
+
+def test_paginated_list_uses_rows(api_client, tasks, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        resp = api_client.get("/api/v1/tasks/?page_size=5")
+
+    assert [row["title"] for row in resp.data["results"]] == [f"Task {i}" for i in range(11, 6, -1)]
@@ -0,0 +1,96 @@
+import pytest
+from apps.tasks.models import Task
+from django.contrib.auth import get_user_model
+
+pytestmark = pytest.mark.django_db
+
+URL = "/api/v1/tasks/search/"
+
+
+@pytest.fixture
+def tasks(user, other_user):
+    return {
+        "report": Task.objects.create(user=user, title="Quarterly report", description="Numbers for Q3"),
+        "milk": Task.objects.create(user=user, title="Купить молоко", description="И хлеб"),
+        "call": Task.objects.create(user=user, title="Call Anna", description="About the report draft"),
+        "theirs": Task.objects.create(user=other_user, title="Their report"),
+    }
+
+
+def ids(resp):
+    return {row["id"] for row in resp.data}
+
+
+def test_search_matches_title_and_description(api_client, tasks):
+    resp = api_client.get(URL, {"q": "report"})
+
+    assert resp.status_code == 200
+    assert ids(resp) == {tasks["report"].id, tasks["call"].id}
+
+
+def test_search_matches_cyrillic(api_client, tasks):
+    resp = api_client.get(URL, {"q": "молоко"})
+
+    assert ids(resp) == {tasks["milk"].id}
+
+
+def test_search_combines_with_filters_and_fields(api_client, tasks):
+    Task.objects.filter(pk=tasks["call"].pk).update(is_completed=True)
+
+    resp = api_client.get(URL, {"q": "report", "is_completed": "false", "fields": "id,title"})
+
+    assert resp.data == [{"id": tasks["report"].id, "title": "Quarterly report"}]
+
+
+def test_search_limit(api_client, tasks):
+    resp = api_client.get(URL, {"q": "report", "limit": 1})
+
+    assert len(resp.data) == 1
+
+
+@pytest.mark.parametrize("params", [{}, {"q": ""}, {"q": "report", "limit": 0}])
+def test_search_rejects_bad_params(api_client, params):
+    assert api_client.get(URL, params).status_code == 400
+
+
+def test_admin_search_by_text_and_id(client, tasks):
+    admin = get_user_model().objects.create_superuser(username="admin", password="x", telegram_id=1)
+    client.force_login(admin)
+
+    by_text = client.get("/admin/tasks/task/", {"q": "молоко"})
+    by_id = client.get("/admin/tasks/task/", {"q": str(tasks["call"].id)})
+
+    assert [t.pk for t in by_text.context["cl"].result_list] == [tasks["milk"].pk]
+    assert [t.pk for t in by_id.context["cl"].result_list] == [tasks["call"].pk]
+
+
+@pytest.mark.postgres
+def test_trigger_maintains_search_vector(tasks):
+    task = tasks["report"]
+    task.title = "Annual summary"
+    task.save()
+
+    assert Task.objects.search("summary").filter(pk=task.pk).exists()
+    assert not Task.objects.search("quarterly").filter(pk=task.pk).exists()
+
+
+@pytest.mark.postgres
+@pytest.mark.parametrize(
+    ("query", "key"),
+    [("reports", "report"), ("купила молока", "milk"), ("quartely", "report"), ("Quart", "report")],
+)
+def test_stemming_typos_and_prefixes(user, tasks, query, key):
+    assert tasks[key] in Task.objects.filter(user=user).search(query)
+
+
+@pytest.mark.postgres
+def test_title_match_ranks_first(user, tasks):
+    assert list(Task.objects.filter(user=user).search("report"))[:2] == [tasks["report"], tasks["call"]]
+
+
+@pytest.mark.postgres
+def test_search_uses_gin_indexes(explain):
+    plan = explain(Task.objects.search("report"))
+
+    assert "task_search_vector_idx" in plan
+    assert "task_title_trgm_idx" in plan
@@ -0,0 +1,115 @@
+import pytest
+from apps.users import serializers
+from apps.users.authentication import telegram_login_cache
+from apps.users.serializers import login_telegram_user
+from django.contrib.auth import get_user_model
+from django.db import IntegrityError, connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+pytestmark = pytest.mark.django_db
+
+User = get_user_model()
+
+URL = "/api/v1/users/auth/telegram/"
+
+
+def login(telegram_id=777, **extra):
+    return APIClient().post(URL, {"telegram_id": telegram_id, **extra}, format="json")
+
+
+def test_first_login_registers_user_and_token():
+    resp = login(username="newbie", language_code="uk")
+
+    user = User.objects.get(telegram_id=777)
+    assert resp.status_code == 200
+    assert resp.data == {"token": Token.objects.get(user=user).key, "user_id": str(user.id)}
+    assert (user.username, user.language, user.timezone) == ("newbie", "ru", "UTC")
+
+
+def test_returning_login_is_served_from_cache():
+    first = login()
+
+    with CaptureQueriesContext(connection) as ctx:
+        again = login()
+
+    assert again.data == first.data
+    assert len(ctx) == 0
+
+
+def test_returning_login_on_cold_cache_is_one_query():
+    first = login()
+    telegram_login_cache.evict(777)
+
+    with CaptureQueriesContext(connection) as ctx:
+        again = login()
+
+    assert again.data == first.data
+    assert len(ctx) == 1
+
+
+def test_existing_user_without_token_gets_one():
+    user = User.objects.create(username="legacy", telegram_id=777)
+
+    resp = login()
+
+    assert resp.data["token"] == Token.objects.get(user=user).key
+
+
+def test_concurrent_first_login_reads_the_winners_rows(monkeypatch):
+    """The other request registered this telegram_id after our lookup: our insert fails, we return its token."""
+    winner = User.objects.create(username="winner", telegram_id=777)
+    token = Token.objects.create(user=winner)
+    real = serializers._existing_login
+    calls = []
+
+    def lookup(telegram_id):
+        calls.append(telegram_id)
+        return None if len(calls) == 1 else real(telegram_id)
+
+    monkeypatch.setattr(serializers, "_existing_login", lookup)
+
+    assert login_telegram_user({"telegram_id": 777}) == (winner.id, token.key)
+    assert len(calls) == 2
+    assert User.objects.filter(telegram_id=777).count() == 1
+
+
+def test_failed_registration_leaves_no_partial_rows():
+    User.objects.create(username="taken", telegram_id=1)
+
+    with pytest.raises(IntegrityError):
+        login_telegram_user({"telegram_id": 777, "username": "taken"})
+
+    assert not User.objects.filter(telegram_id=777).exists()
+    assert Token.objects.count() == 0
+
+
+def test_token_deletion_evicts_cached_login():
+    first = login()
+    Token.objects.filter(key=first.data["token"]).delete()
+
+    again = login()
+
+    assert again.data["token"] != first.data["token"]
+    assert Token.objects.filter(key=again.data["token"]).exists()
+
+
+def test_telegram_id_change_evicts_cached_login():
+    first = login()
+    user = User.objects.get(telegram_id=777)
+    user.telegram_id = 778
+    user.save()
+
+    again = login(username="someone-else")
+
+    assert again.data["user_id"] != first.data["user_id"]
+
+
+def test_user_deletion_evicts_cached_login():
+    first = login()
+    User.objects.filter(telegram_id=777).delete()
+
+    again = login()
+
+    assert again.data["user_id"] != first.data["user_id"]
@@ -1,10 +1,16 @@
+import copy
 import logging
+from collections import OrderedDict
+from collections.abc import Sequence
 from typing import Any
 
 import aiohttp
 
 logger = logging.getLogger(__name__)
 
+# Responses kept for conditional GETs (If-None-Match), across all users
+ETAG_CACHE_SIZE = 1000
+
 
 class APIClient:
     """
@@ -16,6 +22,7 @@ class APIClient:
         self.base_url = base_url
         self.session: aiohttp.ClientSession | None = None
         self.token: str | None = None
+        self._etag_cache: OrderedDict[tuple, tuple[str, Any]] = OrderedDict()
 
     async def create_session(self) -> None:
         if self.session is None:
@@ -32,6 +39,33 @@ class APIClient:
             raise PermissionError("Unauthorized: Token is missing. Login first.")
         return {"Authorization": f"Token {self.token}"}
 
+    async def _get_json(self, url: str, params: dict | None = None) -> Any:
+        """
+        GET with If-None-Match from the last response to the same URL (per token).
+        A 304 returns a copy of the remembered payload.
+        """
+        headers = self._get_headers()
+        key = (self.token, url, tuple(sorted(params.items())) if params else ())
+        cached = self._etag_cache.get(key)
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        async with self.session.get(url, params=params, headers=headers) as resp:
+            if resp.status == 304 and cached:
+                self._etag_cache.move_to_end(key)
+                # Callers decorate the payload in place, so never hand out the stored one
+                return copy.deepcopy(cached[1])
+            resp.raise_for_status()
+            data = await resp.json()
+
+        etag = resp.headers.get("ETag")
+        if etag:
+            self._etag_cache[key] = (etag, copy.deepcopy(data))
+            self._etag_cache.move_to_end(key)
+            while len(self._etag_cache) > ETAG_CACHE_SIZE:
+                self._etag_cache.popitem(last=False)
+        return data
+
     async def login(
         self, telegram_id: int, username: str, first_name: str, language_code: str = "en"
     ) -> dict[str, Any]:
@@ -65,27 +99,11 @@ class APIClient:
         if not self.token:
             raise PermissionError("Unauthorized")
 
-        url = f"{self.base_url}/users/profile/"
-        headers = {"Authorization": f"Token {self.token}"}
-
-        async with self.session.get(url, headers=headers) as resp:
-            resp.raise_for_status()
-            data = await resp.json()
-            if isinstance(data, list) and data:
-                return data[0]
-            if isinstance(data, dict) and "results" in data:
-                return data["results"][0]
-            return data
+        return await self._get_json(f"{self.base_url}/users/me/")
 
     async def update_profile(self, language: str = None, timezone: str = None) -> dict:
         """Update user profile settings."""
-        profile = await self.get_profile()
-        user_id = profile.get("id")
-
-        if not user_id:
-            raise ValueError("Could not fetch profile id")
-
-        url = f"{self.base_url}/users/profile/{user_id}/"
+        url = f"{self.base_url}/users/me/"
 
         payload = {}
         if language:
@@ -97,17 +115,33 @@ class APIClient:
             resp.raise_for_status()
             return await resp.json()
 
+    async def bootstrap(self) -> dict:
+        """
+        Session start data in one request:
+        {"profile", "categories", "summary": {"open", "overdue", "due_today"}, "tasks": {"next", "results"}}
+        """
+        if not self.token:
+            raise PermissionError("Unauthorized")
+
+        return await self._get_json(f"{self.base_url}/users/me/bootstrap/")
+
+    async def summary(self) -> dict:
+        """Open-task counts only: {"open", "overdue", "due_today"}."""
+        if not self.token:
+            raise PermissionError("Unauthorized")
+
+        return await self._get_json(f"{self.base_url}/users/me/summary/")
+
     # Tasks
-    async def get_tasks(self) -> list[dict]:
-        """Fetch tasks for the authenticated user."""
+    async def get_tasks(self, fields: Sequence[str] | None = None) -> list[dict]:
+        """Fetch tasks for the authenticated user, optionally only the given `fields`."""
         if not self.token:
             raise PermissionError("Client is not authenticated.")
 
         url = f"{self.base_url}/tasks/"
+        params = {"fields": ",".join(fields)} if fields else None
 
-        async with self.session.get(url, headers=self._get_headers()) as resp:
-            resp.raise_for_status()
-            return await resp.json()
+        return await self._get_json(url, params=params)
 
     async def create_task(self, title: str, deadline: str | None = None, category_id: str | None = None) -> dict:
         """Create a new task with optional deadline."""
@@ -144,9 +178,7 @@ class APIClient:
 
     async def get_task(self, task_id: str):
         """Get one task (for details window)"""
-        async with self.session.get(f"{self.base_url}/tasks/{task_id}/", headers=self._get_headers()) as resp:
-            resp.raise_for_status()
-            return await resp.json()
+        return await self._get_json(f"{self.base_url}/tasks/{task_id}/")
 
     # Categories
     async def get_categories(self) -> list[dict]:
@@ -157,10 +189,7 @@ class APIClient:
         url = f"{self.base_url}/categories/"
 
         try:
-            async with self.session.get(url, headers=self._get_headers()) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                return []
+            return await self._get_json(url)
         except Exception as e:
             logging.error(f"Error getting categories: {e}")
             return []
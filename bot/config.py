@@ -5,3 +5,9 @@ BOT_TOKEN = config("BOT_TOKEN")
 API_BASE_URL = config("API_BASE_URL", default="http://127.0.0.1:8000/api/v1")
 
 GEMINI_API_KEY = config("GEMINI_API_KEY")
+
+# Flood limits shared with the backend's notification senders (per process when unset)
+TELEGRAM_RATE_LIMIT_REDIS_URL = config("TELEGRAM_RATE_LIMIT_REDIS_URL", default="")
+TELEGRAM_RATE_GLOBAL = config("TELEGRAM_RATE_GLOBAL", default=30, cast=float)
+TELEGRAM_RATE_PER_CHAT = config("TELEGRAM_RATE_PER_CHAT", default=1, cast=float)
+TELEGRAM_RATE_PER_CHAT_BURST = config("TELEGRAM_RATE_PER_CHAT_BURST", default=3, cast=float)
@@ -7,7 +7,7 @@ from aiogram_dialog.widgets.text import Const, Format
 from magic_filter import F
 from timezonefinder import TimezoneFinder
 
-from bot.getters import get_categories, get_category_data, get_my_tasks, get_task_data
+from bot.getters import get_categories, get_category_data, get_main_menu, get_my_tasks, get_task_data
 from bot.states.state import CategorySG, MainSG, SetupSG
 from bot.utils.parser import parse_task_text
 from bot.utils.transcriber import transcribe_voice
@@ -236,7 +236,10 @@ async def on_cat_mgmt_selected(callback: CallbackQuery, widget, manager, item_id
 # WINDOWS
 
 main_menu_window = Window(
-    Format("👋 Hello, <b>{username}</b>!\n\nYour personal Task Tracker is ready."),
+    Format(
+        "👋 Hello, <b>{username}</b>!\n\nYour personal Task Tracker is ready.\n\n"
+        "📌 Open: <b>{open}</b>  ⏰ Overdue: <b>{overdue}</b>  📅 Due today: <b>{due_today}</b>"
+    ),
     MessageInput(func=generic_voice_handler, content_types=[ContentType.VOICE]),
     Row(
         Button(Const("📋 My Tasks"), id="btn_my_tasks", on_click=lambda c, b, m: m.switch_to(MainSG.task_list)),
@@ -247,7 +250,7 @@ main_menu_window = Window(
         Button(Const("⚙️ Settings"), id="btn_settings", on_click=lambda c, b, m: m.switch_to(MainSG.settings)),
     ),
     state=MainSG.menu,
-    getter=get_my_tasks,  # Needed to fetch the username
+    getter=get_main_menu,
 )
 
 
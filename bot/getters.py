@@ -11,6 +11,9 @@ logger = logging.getLogger(__name__)
 
 DEFAULT_TZ = pytz.timezone("UTC")
 
+# All the task list screen renders; skips descriptions and the category join server-side
+TASK_LIST_FIELDS = ("id", "title", "deadline", "is_completed", "created_at")
+
 
 def format_user_time(iso_date_str: str, user_timezone_str: str) -> str:
     """
@@ -39,6 +42,25 @@ def format_user_time(iso_date_str: str, user_timezone_str: str) -> str:
         return iso_date_str
 
 
+async def get_main_menu(dialog_manager: DialogManager, **kwargs) -> dict:
+    """
+    Greeting and open-task counts for the main menu.
+    Uses the bootstrap payload passed by /start once; later renders fetch only the counts.
+    """
+    client: APIClient = dialog_manager.middleware_data.get("api_client")
+    user = dialog_manager.event.from_user
+    data = {"username": user.first_name or user.username, "open": 0, "overdue": 0, "due_today": 0}
+
+    start_data = dialog_manager.start_data
+    session = start_data.pop("bootstrap", None) if isinstance(start_data, dict) else None
+    try:
+        data.update(session["summary"] if session else await client.summary())
+    except Exception as e:
+        logger.warning(f"Could not fetch task summary: {e}")
+
+    return data
+
+
 async def get_my_tasks(dialog_manager: DialogManager, **kwargs) -> dict:
     """
     Loads the user's task list.
@@ -55,7 +77,7 @@ async def get_my_tasks(dialog_manager: DialogManager, **kwargs) -> dict:
         logger.warning(f"Could not fetch profile for timezone: {e}")
 
     try:
-        tasks_raw = await client.get_tasks()
+        tasks_raw = await client.get_tasks(fields=TASK_LIST_FIELDS)
 
         formatted_tasks = []
         for task in tasks_raw:
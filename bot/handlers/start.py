@@ -23,13 +23,14 @@ async def cmd_start(message: Message, dialog_manager: DialogManager, api_client:
             telegram_id=user.id, username=user.username, first_name=user.first_name, language_code=user.language_code
         )
 
-        profile = await api_client.get_profile()
-        timezone = profile.get("timezone", "UTC")
+        # Profile, counts and first task page in one request; the menu renders from it
+        session = await api_client.bootstrap()
+        timezone = session["profile"].get("timezone", "UTC")
 
         if timezone == "UTC":
             await dialog_manager.start(state=SetupSG.timezone, mode=StartMode.RESET_STACK)
         else:
-            await dialog_manager.start(state=MainSG.menu, mode=StartMode.RESET_STACK)
+            await dialog_manager.start(state=MainSG.menu, mode=StartMode.RESET_STACK, data={"bootstrap": session})
 
     except Exception as e:
         await message.answer(f"❌ <b>Connection Error:</b>\n<code>{html.escape(str(e))}</code>")
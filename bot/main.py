@@ -6,11 +6,21 @@ from aiogram.client.default import DefaultBotProperties
 from aiogram.enums import ParseMode
 from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram_dialog import setup_dialogs
+from apps.tasks.ratelimit import AsyncTelegramRateLimiter
+from redis.asyncio import Redis
 
 from bot.client import APIClient
-from bot.config import API_BASE_URL, BOT_TOKEN
+from bot.config import (
+    API_BASE_URL,
+    BOT_TOKEN,
+    TELEGRAM_RATE_GLOBAL,
+    TELEGRAM_RATE_LIMIT_REDIS_URL,
+    TELEGRAM_RATE_PER_CHAT,
+    TELEGRAM_RATE_PER_CHAT_BURST,
+)
 from bot.dialogs import category_dialog, main_dialog, setup_dialog
 from bot.handlers.start import router as start_router
+from bot.utils.ratelimit import RateLimitMiddleware
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +34,14 @@ async def main():
     logger.info("Bot is starting...")
 
     bot = Bot(token=BOT_TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+    limiter = AsyncTelegramRateLimiter(
+        Redis.from_url(TELEGRAM_RATE_LIMIT_REDIS_URL) if TELEGRAM_RATE_LIMIT_REDIS_URL else None,
+        global_rate=TELEGRAM_RATE_GLOBAL,
+        global_burst=TELEGRAM_RATE_GLOBAL,
+        chat_rate=TELEGRAM_RATE_PER_CHAT,
+        chat_burst=TELEGRAM_RATE_PER_CHAT_BURST,
+    )
+    bot.session.middleware(RateLimitMiddleware(limiter))
     dp = Dispatcher(storage=MemoryStorage())
 
     client = APIClient(base_url=API_BASE_URL)
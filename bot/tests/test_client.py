@@ -3,6 +3,7 @@ import logging
 import pytest
 from aiohttp import ClientError
 from aioresponses import aioresponses
+from yarl import URL
 
 from bot.client import APIClient
 
@@ -59,27 +60,17 @@ async def test_get_headers_fail_no_token(api_client):
     assert "Login first" in str(exc.value)
 
 
-async def test_get_profile_list_response(api_client, mock_aioresponse, base_url):
+async def test_get_profile(api_client, mock_aioresponse, base_url):
     api_client.token = "token"
-    url = f"{base_url}/users/profile/"
+    url = f"{base_url}/users/me/"
 
-    mock_aioresponse.get(url, payload=[{"id": 1, "language": "ru"}])
+    mock_aioresponse.get(url, payload={"id": 1, "language": "ru"})
 
     profile = await api_client.get_profile()
     assert profile["id"] == 1
     assert profile["language"] == "ru"
 
 
-async def test_get_profile_dict_results_response(api_client, mock_aioresponse, base_url):
-    api_client.token = "token"
-    url = f"{base_url}/users/profile/"
-
-    mock_aioresponse.get(url, payload={"results": [{"id": 2, "language": "en"}]})
-
-    profile = await api_client.get_profile()
-    assert profile["id"] == 2
-
-
 async def test_get_profile_fail_no_token(api_client):
     api_client.token = None
     with pytest.raises(PermissionError):
@@ -89,20 +80,34 @@ async def test_get_profile_fail_no_token(api_client):
 async def test_update_profile_success(api_client, mock_aioresponse, base_url):
     api_client.token = "token"
 
-    mock_aioresponse.get(f"{base_url}/users/profile/", payload=[{"id": 99}])
-
-    mock_aioresponse.patch(f"{base_url}/users/profile/99/", payload={"status": "ok"})
+    mock_aioresponse.patch(f"{base_url}/users/me/", payload={"status": "ok"})
 
     resp = await api_client.update_profile(language="ru", timezone="UTC")
     assert resp["status"] == "ok"
+    # No profile lookup first
+    assert len(mock_aioresponse.requests) == 1
 
 
-async def test_update_profile_no_id(api_client, mock_aioresponse, base_url):
+async def test_bootstrap(api_client, mock_aioresponse, base_url):
     api_client.token = "token"
-    mock_aioresponse.get(f"{base_url}/users/profile/", payload=[{}])
+    payload = {"profile": {"timezone": "UTC"}, "categories": [], "summary": {"open": 0}, "tasks": {"results": []}}
+    mock_aioresponse.get(f"{base_url}/users/me/bootstrap/", payload=payload)
+
+    assert await api_client.bootstrap() == payload
 
-    with pytest.raises(ValueError, match="Could not fetch profile id"):
-        await api_client.update_profile(language="ru")
+
+async def test_summary(api_client, mock_aioresponse, base_url):
+    api_client.token = "token"
+    payload = {"open": 2, "overdue": 1, "due_today": 0}
+    mock_aioresponse.get(f"{base_url}/users/me/summary/", payload=payload)
+
+    assert await api_client.summary() == payload
+
+
+async def test_bootstrap_no_auth(api_client):
+    api_client.token = None
+    with pytest.raises(PermissionError):
+        await api_client.bootstrap()
 
 
 # Tasks
@@ -115,6 +120,14 @@ async def test_get_tasks(api_client, mock_aioresponse, base_url):
     assert tasks[0]["title"] == "Test"
 
 
+async def test_get_tasks_with_fields(api_client, mock_aioresponse, base_url):
+    api_client.token = "token"
+    mock_aioresponse.get(f"{base_url}/tasks/?fields=id,title", payload=[{"id": 1, "title": "Test"}])
+
+    tasks = await api_client.get_tasks(fields=["id", "title"])
+    assert tasks == [{"id": 1, "title": "Test"}]
+
+
 async def test_get_tasks_no_auth(api_client):
     api_client.token = None
     with pytest.raises(PermissionError):
@@ -225,3 +238,34 @@ async def test_get_category_fail(api_client, mock_aioresponse, base_url, caplog)
             await api_client.get_category("1")
 
         assert "Request failed: Fail" in caplog.text
+
+
+async def test_conditional_get_reuses_payload_on_304(api_client, mock_aioresponse, base_url):
+    api_client.token = "token"
+    url = f"{base_url}/tasks/"
+    mock_aioresponse.get(url, payload=[{"id": 1, "title": "Test"}], headers={"ETag": '"7-abc"'})
+    mock_aioresponse.get(url, status=304)
+
+    first = await api_client.get_tasks()
+    first[0]["title"] = "mutated by caller"
+    second = await api_client.get_tasks()
+
+    assert second == [{"id": 1, "title": "Test"}]
+    calls = mock_aioresponse.requests[("GET", URL(url))]
+    assert "If-None-Match" not in calls[0].kwargs["headers"]
+    assert calls[1].kwargs["headers"]["If-None-Match"] == '"7-abc"'
+
+
+async def test_conditional_get_is_per_token(api_client, mock_aioresponse, base_url):
+    url = f"{base_url}/categories/"
+    mock_aioresponse.get(url, payload=[{"name": "Mine"}], headers={"ETag": '"1-a"'})
+    mock_aioresponse.get(url, payload=[{"name": "Theirs"}])
+
+    api_client.token = "first"
+    await api_client.get_categories()
+    api_client.token = "second"
+    cats = await api_client.get_categories()
+
+    assert cats == [{"name": "Theirs"}]
+    calls = mock_aioresponse.requests[("GET", URL(url))]
+    assert "If-None-Match" not in calls[1].kwargs["headers"]
@@ -153,6 +153,37 @@ async def test_get_my_tasks_api_fail(mock_manager, mock_client):
     assert "API Error" in data["error"]
 
 
+@pytest.mark.asyncio
+async def test_get_main_menu_uses_bootstrap_from_start(mock_manager, mock_client):
+    """The payload /start passed in is used once, without another request."""
+    summary = {"open": 3, "overdue": 1, "due_today": 2}
+    mock_manager.start_data = {"bootstrap": {"summary": summary}}
+    mock_client.bootstrap = AsyncMock()
+    mock_client.summary = AsyncMock(return_value={"open": 5, "overdue": 0, "due_today": 0})
+
+    first = await getters.get_main_menu(mock_manager)
+    second = await getters.get_main_menu(mock_manager)
+
+    assert first == {"username": "Tester", **summary}
+    assert second["open"] == 5
+    # Later renders fetch the counts alone, not the whole bootstrap payload
+    mock_client.bootstrap.assert_not_awaited()
+    mock_client.summary.assert_awaited_once()
+    mock_client.get_profile.assert_not_awaited()
+    mock_client.get_tasks.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_get_main_menu_api_fail(mock_manager, mock_client):
+    """The menu still renders with zero counts."""
+    mock_manager.start_data = None
+    mock_client.summary = AsyncMock(side_effect=Exception("API Error"))
+
+    data = await getters.get_main_menu(mock_manager)
+
+    assert data == {"username": "Tester", "open": 0, "overdue": 0, "due_today": 0}
+
+
 @pytest.mark.asyncio
 async def test_get_task_data_success(mock_manager, mock_client):
     """Test successful task detail fetching."""
@@ -0,0 +1,85 @@
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import AnswerCallbackQuery, SendMessage
+from apps.tasks.ratelimit import AsyncTelegramRateLimiter
+
+from bot.utils.ratelimit import RateLimitMiddleware
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    limiter = AsyncTelegramRateLimiter(global_rate=10, global_burst=2, chat_rate=1, chat_burst=1)
+    limiter.clock = clock
+    limiter.sleep = clock.sleep
+    return limiter
+
+
+async def test_global_and_chat_buckets(limiter, clock):
+    assert await limiter.try_acquire(1) == 0
+    assert await limiter.try_acquire(1) == pytest.approx(1.0)
+    assert await limiter.try_acquire(2) == 0
+    assert await limiter.try_acquire(3) == pytest.approx(0.1)
+
+    clock.now += 0.1
+
+    assert await limiter.try_acquire(3) == 0
+
+
+async def test_pause_holds_chat_back(limiter, clock):
+    await limiter.pause(1, 5)
+
+    await limiter.acquire(1)
+
+    assert clock.now == pytest.approx(5.0)
+
+
+async def test_middleware_honours_retry_after(limiter, clock):
+    method = SendMessage(chat_id=1, text="hi")
+    calls = []
+
+    async def make_request(bot, method):
+        calls.append(clock.now)
+        if len(calls) == 1:
+            raise TelegramRetryAfter(method=method, message="Too Many Requests", retry_after=3)
+        return "sent"
+
+    assert await RateLimitMiddleware(limiter)(make_request, None, method) == "sent"
+    assert calls == [0.0, pytest.approx(3.0)]
+
+
+async def test_middleware_gives_up_after_attempts(limiter):
+    method = SendMessage(chat_id=1, text="hi")
+
+    async def make_request(bot, method):
+        raise TelegramRetryAfter(method=method, message="Too Many Requests", retry_after=1)
+
+    with pytest.raises(TelegramRetryAfter):
+        await RateLimitMiddleware(limiter, attempts=2)(make_request, None, method)
+
+
+async def test_middleware_only_limits_messages_to_chats(limiter, clock):
+    async def make_request(bot, method):
+        return "ok"
+
+    for _ in range(5):
+        await RateLimitMiddleware(limiter)(make_request, None, AnswerCallbackQuery(callback_query_id="1"))
+
+    assert clock.slept == []
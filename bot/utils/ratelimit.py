@@ -0,0 +1,37 @@
+import logging
+
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware
+from aiogram.exceptions import TelegramRetryAfter
+from apps.tasks.ratelimit import AsyncTelegramRateLimiter
+
+logger = logging.getLogger(__name__)
+
+# Bot API methods that post into a chat and count against Telegram's flood limits
+LIMITED_METHOD_PREFIXES = ("Send", "Edit", "Copy", "Forward")
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """
+    Session middleware: outgoing messages wait for a token from the limiter shared with
+    the backend senders, and a 429 (TelegramRetryAfter) pauses the chat for every sender
+    before the request is retried.
+    """
+
+    def __init__(self, limiter: AsyncTelegramRateLimiter, attempts: int = 3):
+        self.limiter = limiter
+        self.attempts = attempts
+
+    async def __call__(self, make_request, bot, method):
+        chat_id = getattr(method, "chat_id", None)
+        if chat_id is None or not type(method).__name__.startswith(LIMITED_METHOD_PREFIXES):
+            return await make_request(bot, method)
+
+        for attempt in range(1, self.attempts + 1):
+            await self.limiter.acquire(chat_id)
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt == self.attempts:
+                    raise
+                logger.warning(f"Telegram flood control on chat {chat_id}: retrying in {e.retry_after} s")
+                await self.limiter.pause(chat_id, e.retry_after)